@@ -0,0 +1,22 @@
+#!/usr/bin/python
+
+#
+# Controller side counterpart of the enforce_jenkins_build_retention module
+#
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from jenkins_groovy_script import JenkinsGroovyScriptAction  # NOQA
+
+
+class ActionModule(JenkinsGroovyScriptAction):
+
+    script = 'enforce_jenkins_build_retention.groovy'
+    defaults = dict(policy={}, folders=[], override_job_discarder=False,
+                    report_disk_usage=False)
+    long_running = True
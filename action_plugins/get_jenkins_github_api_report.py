@@ -0,0 +1,22 @@
+#!/usr/bin/python
+
+#
+# Controller side counterpart of the get_jenkins_github_api_report module
+#
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from jenkins_groovy_script import JenkinsGroovyScriptAction  # NOQA
+
+
+class ActionModule(JenkinsGroovyScriptAction):
+
+    script = 'get_jenkins_github_api_report.groovy'
+
+    def script_args(self, params):
+        return []
@@ -0,0 +1,29 @@
+#!/usr/bin/python
+
+#
+# Controller side counterpart of the get_jenkins_metrics module
+#
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from jenkins_groovy_script import JenkinsGroovyScriptAction  # NOQA
+
+
+class ActionModule(JenkinsGroovyScriptAction):
+
+    script = 'get_jenkins_metrics.groovy'
+    defaults = dict(format='json')
+
+    def get_settings(self, task_vars):
+        settings = super(ActionModule, self).get_settings(task_vars)
+
+        # Textfile is written on Jenkins host, only the module can do it
+        if self._task.args.get('textfile_path'):
+            settings['enabled'] = False
+
+        return settings
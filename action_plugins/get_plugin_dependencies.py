@@ -0,0 +1,27 @@
+#!/usr/bin/python
+
+#
+# Controller side counterpart of the get_plugin_dependencies module
+#
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from jenkins_groovy_script import JenkinsGroovyScriptAction  # NOQA
+
+
+class ActionModule(JenkinsGroovyScriptAction):
+
+    script = 'get_plugin_dependencies.groovy'
+
+    def script_args(self, params):
+        return [params['name']]
+
+    def build_result(self, stdout):
+        json_stdout = json.loads(stdout)
+        return dict(changed=bool(json_stdout), output=json_stdout)
@@ -0,0 +1,31 @@
+#!/usr/bin/python
+
+#
+# Controller side counterpart of the install_jenkins_plugin module
+#
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from jenkins_groovy_script import JenkinsGroovyScriptAction  # NOQA
+
+
+class ActionModule(JenkinsGroovyScriptAction):
+
+    script = 'install_jenkins_plugin.groovy'
+    defaults = dict(state='present', dynamic_load=True)
+    long_running = True
+
+    def script_args(self, params):
+        return [params['name'], params['state'],
+                str(params['dynamic_load'])]
+
+    def build_result(self, stdout):
+        json_stdout = json.loads(stdout)
+        return dict(changed=bool(json_stdout['installed']),
+                    output=json_stdout)
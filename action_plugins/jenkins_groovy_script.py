@@ -0,0 +1,467 @@
+#!/usr/bin/python
+
+#
+# Controller side execution of the role Groovy scripts
+#
+# Each role module ships a Groovy script to the Jenkins host and runs it with
+# the Jenkins CLI. When "jenkins_controller_transport" is enabled, the action
+# plugins defined here run the same scripts from the Ansible controller,
+# through the Jenkins "scriptText" endpoint, and keep HTTP connections open
+# to reuse them for next calls done by the same Ansible worker.
+#
+# Remote module execution is used when the transport is disabled, or as a
+# fallback when Jenkins can not be reached from the controller.
+#
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import base64
+import errno
+import json
+import re
+import socket
+import ssl
+
+from ansible.errors import AnsibleError
+from ansible.module_utils.six.moves import http_client
+from ansible.module_utils.six.moves.urllib.parse import urlencode, urlsplit
+from ansible.plugins.action import ActionBase
+
+
+ERROR_MARKER = '__ANSIBLE_JENKINS_SCRIPT_ERROR__'
+
+# Shared Groovy code inclusion, rendered by the template module when scripts
+# are deployed on the Jenkins host
+INCLUDE_PATTERN = re.compile(r"^\{% include '([^']+)' %\}\n", re.MULTILINE)
+
+# Wrapper used to run role scripts with their arguments on scriptText endpoint
+SCRIPT_WRAPPER = '''
+import jenkins.model.Jenkins
+import groovy.json.JsonSlurper
+
+def ansible_decode(String value) {
+    return new String(value.decodeBase64(), 'UTF-8')
+}
+
+def ansible_args = new JsonSlurper().parseText(ansible_decode('%(args)s'))
+def ansible_binding = new Binding([args: ansible_args as String[], out: out])
+def ansible_shell = new GroovyShell(
+    Jenkins.getInstance().getPluginManager().uberClassLoader, ansible_binding)
+
+try {
+    ansible_shell.evaluate(ansible_decode('%(script)s'))
+}
+catch (Throwable e) {
+    out.println('%(marker)s' + e.getMessage())
+}
+'''
+
+# HTTP connections and crumbs, shared by all tasks run by this process
+_CONNECTIONS = {}
+_CRUMBS = {}
+
+
+def to_bool(value):
+    """
+        Convert a variable value to boolean
+        :param value: Value to convert
+        :type value: bool or str
+        :return: Boolean value
+        :rtype: bool
+    """
+
+    if isinstance(value, bool):
+        return value
+
+    return str(value).lower() in ('1', 'on', 'true', 'yes')
+
+
+class JenkinsConnectionError(Exception):
+    """ Jenkins can not be reached from the controller """
+    pass
+
+
+class JenkinsScriptError(Exception):
+    """ Jenkins has been reached, but script execution failed """
+    pass
+
+
+def get_connection(scheme, netloc, timeout, validate_certs):
+    """
+        Get a pooled connection to a Jenkins instance
+        :param scheme: URL scheme, http or https
+        :type scheme: str
+        :param netloc: Jenkins host and port
+        :type netloc: str
+        :param timeout: Connection timeout, in seconds
+        :type timeout: int
+        :param validate_certs: Validate https certificates
+        :type validate_certs: bool
+        :return: Connection object
+        :rtype: HTTPConnection
+    """
+
+    key = (scheme, netloc)
+
+    if key not in _CONNECTIONS:
+        if scheme == 'https':
+            context = ssl.create_default_context()
+            if not validate_certs:
+                context.check_hostname = False
+                context.verify_mode = ssl.CERT_NONE
+            _CONNECTIONS[key] = http_client.HTTPSConnection(
+                netloc, timeout=timeout, context=context)
+        else:
+            _CONNECTIONS[key] = http_client.HTTPConnection(
+                netloc, timeout=timeout)
+
+    return _CONNECTIONS[key]
+
+
+def drop_connection(scheme, netloc):
+    """
+        Close and forget a pooled connection
+        :param scheme: URL scheme, http or https
+        :type scheme: str
+        :param netloc: Jenkins host and port
+        :type netloc: str
+    """
+
+    connection = _CONNECTIONS.pop((scheme, netloc), None)
+    if connection is not None:
+        connection.close()
+
+
+def set_timeout(connection, timeout):
+    """
+        Set timeout of a pooled connection, and of its socket if connected
+        :param connection: Connection object
+        :type connection: HTTPConnection
+        :param timeout: Timeout, in seconds
+        :type timeout: int
+    """
+
+    connection.timeout = timeout
+    if connection.sock is not None:
+        connection.sock.settimeout(timeout)
+
+
+def is_stale_connection_error(error):
+    """
+        Check if an error comes from a pooled connection closed by Jenkins
+        before it received the request
+        :param error: Request error
+        :type error: Exception
+        :return: True if request can be sent again on a new connection
+        :rtype: bool
+    """
+
+    if isinstance(error, http_client.BadStatusLine):
+        return True
+
+    return getattr(error, 'errno', None) in (errno.ECONNRESET, errno.EPIPE)
+
+
+def http_request(settings, method, path, body=None, headers=None):
+    """
+        Do an HTTP request on Jenkins, reusing pooled connection
+        :param settings: Controller transport settings
+        :type settings: dict
+        :param method: HTTP method
+        :type method: str
+        :param path: Path, relative to Jenkins base url
+        :type path: str
+        :param body: Request body
+        :type body: str
+        :param headers: Additional request headers
+        :type headers: dict
+        :return: Response status, headers and body
+        :rtype: tuple
+    """
+
+    url = urlsplit(settings['url'])
+    full_path = '%s/%s' % (url.path.rstrip('/'), path.lstrip('/'))
+
+    request_headers = {
+        'Authorization': settings['authorization'],
+        'Connection': 'keep-alive',
+    }
+    request_headers.update(headers or {})
+
+    # A pooled connection can be closed by Jenkins while it was idle, so
+    # retry once with a new connection, only if the request was not received
+    for attempt in range(2):
+        reused = (url.scheme, url.netloc) in _CONNECTIONS
+        connection = get_connection(url.scheme, url.netloc,
+                                    settings['timeout'],
+                                    settings['validate_certs'])
+        set_timeout(connection, settings['timeout'])
+        sent = False
+        try:
+            connection.request(method, full_path, body, request_headers)
+            sent = True
+            response = connection.getresponse()
+            content = response.read().decode('utf-8')
+            return response.status, response, content
+        except socket.timeout as e:
+            # Script may still be running, it must not be run again
+            drop_connection(url.scheme, url.netloc)
+            raise JenkinsScriptError(
+                'Jenkins did not answer within %d seconds at %s, script '
+                'may still be running: %s' % (
+                    settings['timeout'], settings['url'], e))
+        except (http_client.HTTPException, socket.error) as e:
+            drop_connection(url.scheme, url.netloc)
+            if reused and attempt == 0 and is_stale_connection_error(e):
+                continue
+            # Request may have been received, so remote execution is not
+            # tried either
+            if sent:
+                raise JenkinsScriptError(
+                    'Jenkins connection lost at %s, script may have run: %s'
+                    % (settings['url'], e))
+            raise JenkinsConnectionError(
+                'Jenkins unreachable at %s: %s' % (settings['url'], e))
+
+
+def get_crumb_headers(settings):
+    """
+        Get crumb headers needed to post data, if Jenkins uses a crumb issuer
+        :param settings: Controller transport settings
+        :type settings: dict
+        :return: Headers to add on POST requests
+        :rtype: dict
+    """
+
+    key = (settings['url'], settings['authorization'])
+
+    if key not in _CRUMBS:
+        status, response, content = http_request(
+            settings, 'GET', 'crumbIssuer/api/json')
+
+        headers = {}
+        if status == 200:
+            crumb = json.loads(content)
+            headers[crumb['crumbRequestField']] = crumb['crumb']
+
+            # Recent Jenkins versions link crumbs to the web session
+            cookie = response.getheader('Set-Cookie')
+            if cookie:
+                headers['Cookie'] = cookie.split(';')[0]
+        _CRUMBS[key] = headers
+
+    return _CRUMBS[key]
+
+
+def run_script(settings, script, script_args):
+    """
+        Run a Groovy script on Jenkins, using scriptText endpoint
+        :param settings: Controller transport settings
+        :type settings: dict
+        :param script: Groovy script content
+        :type script: str
+        :param script_args: Script arguments
+        :type script_args: list
+        :return: Script output
+        :rtype: str
+    """
+
+    wrapper = SCRIPT_WRAPPER % {
+        'args': base64.b64encode(
+            json.dumps(script_args).encode('utf-8')).decode('ascii'),
+        'script': base64.b64encode(script.encode('utf-8')).decode('ascii'),
+        'marker': ERROR_MARKER,
+    }
+
+    headers = {'Content-Type': 'application/x-www-form-urlencoded'}
+    headers.update(get_crumb_headers(settings))
+
+    status, response, content = http_request(
+        settings, 'POST', 'scriptText', urlencode({'script': wrapper}),
+        headers)
+
+    if status != 200:
+        raise JenkinsScriptError(
+            'Jenkins script endpoint returns HTTP %d: %s' % (status, content))
+
+    if ERROR_MARKER in content:
+        raise JenkinsScriptError(content.split(ERROR_MARKER, 1)[1].strip())
+
+    return content
+
+
+class JenkinsGroovyScriptAction(ActionBase):
+    """
+        Base action, run a role Groovy script from the controller if enabled,
+        else execute the module on the remote host
+    """
+
+    TRANSFERS_FILES = False
+
+    # Groovy script name, from role "files/groovy_scripts" folder
+    script = None
+
+    # Module parameters default values, used to build the script payload
+    defaults = {}
+
+    # Scripts downloading or walking many files use the script timeout
+    long_running = False
+
+    def script_args(self, params):
+        """
+            Build script arguments, same as the module does
+            :param params: Module parameters
+            :type params: dict
+            :return: Script arguments
+            :rtype: list
+        """
+
+        return [json.dumps(params)]
+
+    def load_script(self, name):
+        """
+            Load a role Groovy script, with its shared code included as when
+            scripts are deployed
+            :param name: Script path, from role "files/groovy_scripts" folder
+            :type name: str
+            :return: Script content
+            :rtype: str
+        """
+
+        script_path = self._find_needle('files', 'groovy_scripts/%s' % name)
+        with open(script_path, 'rb') as script_file:
+            script = script_file.read().decode('utf-8')
+
+        return INCLUDE_PATTERN.sub(
+            lambda match: self.load_script(match.group(1)), script)
+
+    def build_result(self, stdout):
+        """
+            Build task result from script output, same as the module does
+            :param stdout: Script output
+            :type stdout: str
+            :return: Task result
+            :rtype: dict
+        """
+
+        json_stdout = json.loads(stdout)
+        return dict(changed=bool(json_stdout['changed']),
+                    output=json_stdout['output'],
+                    saved=json_stdout.get('saved', []))
+
+    def get_settings(self, task_vars):
+        """
+            Get controller transport settings from role variables
+            :param task_vars: Task variables
+            :type task_vars: dict
+            :return: Controller transport settings
+            :rtype: dict
+        """
+
+        def get_var(name, default=None):
+            return self._templar.template(task_vars.get(name, default))
+
+        username = get_var('jenkins_controller_username', '')
+        password = get_var('jenkins_controller_password', '')
+        credentials = ('%s:%s' % (username, password)).encode('utf-8')
+
+        return dict(
+            enabled=to_bool(self._task.args.get(
+                'controller_transport',
+                get_var('jenkins_controller_transport', False))),
+            url=get_var('jenkins_controller_base_url',
+                        self._task.args.get('url', 'http://localhost:8080')),
+            authorization='Basic %s' % (
+                base64.b64encode(credentials).decode('ascii')),
+            timeout=int(get_var('jenkins_controller_script_timeout', 600)
+                        if self.long_running
+                        else get_var('jenkins_controller_timeout', 30)),
+            validate_certs=to_bool(
+                get_var('jenkins_controller_validate_certs', True)),
+            fallback=to_bool(get_var('jenkins_controller_fallback', True)),
+        )
+
+    def run_remote(self, task_vars):
+        """
+            Execute the module on the remote host
+            :param task_vars: Task variables
+            :type task_vars: dict
+            :return: Module result
+            :rtype: dict
+        """
+
+        module_args = dict(self._task.args)
+        module_args.pop('controller_transport', None)
+
+        return self._execute_module(module_args=module_args,
+                                    task_vars=task_vars)
+
+    def run(self, tmp=None, task_vars=None):
+
+        if task_vars is None:
+            task_vars = dict()
+
+        result = super(JenkinsGroovyScriptAction, self).run(tmp, task_vars)
+        settings = self.get_settings(task_vars)
+
+        if not settings['enabled']:
+            result.update(self.run_remote(task_vars))
+            return result
+
+        params = dict(self.defaults)
+        params.update(self._task.args)
+        params.pop('controller_transport', None)
+
+        try:
+            script = self.load_script(self.script)
+            stdout = run_script(settings, script, self.script_args(params))
+            result.update(self.build_result(stdout))
+
+        except JenkinsConnectionError as e:
+            if not settings['fallback']:
+                result.update(failed=True, msg=str(e))
+                return result
+
+            self._display.warning(
+                '%s, using remote module execution' % str(e))
+            result.update(self.run_remote(task_vars))
+
+        except (JenkinsScriptError, AnsibleError, ValueError) as e:
+            result.update(failed=True, msg=str(e))
+
+        return result
+
+
+class ActionModule(JenkinsGroovyScriptAction):
+    """
+        Run any role Groovy script from the controller
+
+        Options:
+          script: Groovy script name, in role "files/groovy_scripts" folder
+          args: List of script arguments
+    """
+
+    def script_args(self, params):
+        return [str(arg) for arg in params.get('args', [])]
+
+    def build_result(self, stdout):
+        try:
+            return dict(changed=False, output=json.loads(stdout))
+        except ValueError:
+            return dict(changed=False, output=stdout)
+
+    def run(self, tmp=None, task_vars=None):
+
+        if task_vars is None:
+            task_vars = dict()
+
+        self.script = self._task.args.get('script')
+        settings = self.get_settings(task_vars)
+
+        if not settings['enabled']:
+            return dict(failed=True,
+                        msg='jenkins_groovy_script needs the controller '
+                            'transport, see "jenkins_controller_transport"')
+
+        return super(ActionModule, self).run(tmp, task_vars)
@@ -0,0 +1,25 @@
+#!/usr/bin/python
+
+#
+# Controller side counterpart of the manage_jenkins_plugin_git module
+#
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from jenkins_groovy_script import JenkinsGroovyScriptAction  # NOQA
+
+
+class ActionModule(JenkinsGroovyScriptAction):
+
+    script = 'manage_jenkins_plugin_git.groovy'
+    defaults = dict(polling_threads=-1)
+
+    def script_args(self, params):
+        return [params['full_name'], params['email'],
+                str(params['create_accounts']),
+                str(params['polling_threads'])]
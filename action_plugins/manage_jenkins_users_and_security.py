@@ -0,0 +1,21 @@
+#!/usr/bin/python
+
+#
+# Controller side counterpart of the manage_jenkins_users_and_security module
+#
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from jenkins_groovy_script import JenkinsGroovyScriptAction  # NOQA
+
+
+class ActionModule(JenkinsGroovyScriptAction):
+
+    script = 'manage_jenkins_users_and_security.groovy'
+    defaults = dict(crumb_issuer='', crumb_exclude_client_ip=False,
+                    use_private_key=True)
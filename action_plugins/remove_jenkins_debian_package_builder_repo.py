@@ -0,0 +1,19 @@
+#!/usr/bin/python
+
+#
+# Controller side counterpart of the remove_jenkins_debian_package_builder_repo module
+#
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from jenkins_groovy_script import JenkinsGroovyScriptAction  # NOQA
+
+
+class ActionModule(JenkinsGroovyScriptAction):
+
+    script = 'remove_jenkins_debian_package_builder_repo.groovy'
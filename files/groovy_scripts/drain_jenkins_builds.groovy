@@ -0,0 +1,221 @@
+#!/usr/bin/env groovy
+
+import jenkins.model.*
+import hudson.model.AbstractBuild
+import hudson.model.Computer
+import hudson.model.Executor
+import hudson.model.Queue
+import groovy.json.*
+
+
+/**
+    Convert Json string to Groovy Object
+
+    @param String arg Json string to parse
+    @return Map Groovy object used to get data
+*/
+def Map parse_data(String arg) {
+
+    try {
+        def JsonSlurper jsonSlurper = new JsonSlurper()
+        return jsonSlurper.parseText(arg)
+    }
+    catch(Exception e) {
+        throw new Exception("Parse data error, incoming data : ${arg}, "
+                            + "error message : ${e.getMessage()}")
+    }
+}
+
+
+/**
+    Get Json payload, read on standard input when argument is "-"
+
+    @param String[] Script arguments
+    @return String Json payload
+*/
+def String get_payload(String[] script_args) {
+
+    if (script_args[0] == '-') {
+        return stdin.getText('UTF-8')
+    }
+
+    return script_args[0]
+}
+
+
+/**
+    Get builds running on executors, pipelines resume after a restart so they
+    are only waited for if asked
+
+    @param Jenkins Jenkins instance
+    @param Boolean True to wait for pipelines too
+    @return Set<String> Running builds names
+*/
+def Set<String> get_running_builds(Jenkins jenkins_instance,
+                                   Boolean wait_pipelines) {
+
+    def Set<String> builds = [] as Set
+
+    jenkins_instance.getComputers().each { Computer computer ->
+        def List<Executor> executors = computer.getExecutors()
+        executors += computer.getOneOffExecutors()
+
+        executors.findAll { it.isBusy() }.each { Executor executor ->
+            def Queue.Executable executable = executor.getCurrentExecutable()
+
+            if (executable == null) {
+                return
+            }
+            if (wait_pipelines || (executable instanceof AbstractBuild)) {
+                builds.add(executable.toString())
+            }
+        }
+    }
+
+    return builds
+}
+
+
+/**
+    Check if any executor is busy, pipelines included, as Jenkins safe restart
+    waits for all of them
+
+    @param Jenkins Jenkins instance
+    @return Boolean True if an executor is busy
+*/
+def Boolean is_any_executor_busy(Jenkins jenkins_instance) {
+
+    return jenkins_instance.getComputers().any { Computer computer ->
+        def List<Executor> executors = computer.getExecutors()
+        executors += computer.getOneOffExecutors()
+
+        return executors.any { it.isBusy() }
+    }
+}
+
+
+/**
+    Get queued items expected to be short, blocked items are not counted as
+    they can not start
+
+    @param Jenkins Jenkins instance
+    @param Integer Maximum estimated duration, in seconds
+    @return List<Long> Queued items ids
+*/
+def List<Long> get_short_queued_items(Jenkins jenkins_instance,
+                                      Integer max_duration) {
+
+    return jenkins_instance.getQueue().getItems().findAll { Queue.Item item ->
+        def Long estimated = item.task.getEstimatedDuration()
+
+        return !(item instanceof Queue.BlockedItem)
+            && (estimated >= 0)
+            && (estimated <= max_duration * 1000L)
+    }.collect { it.getId() }
+}
+
+
+/**
+    Wait until a condition is false, or until deadline
+
+    @param Long Deadline, in milliseconds since epoch
+    @param Integer Poll interval, in seconds
+    @param Closure Condition, true while waiting is needed
+    @return Boolean True if deadline reached before the condition is false
+*/
+def Boolean wait_while(Long deadline, Integer poll_interval, Closure condition) {
+
+    while (condition()) {
+        if (System.currentTimeMillis() >= deadline) {
+            return true
+        }
+        sleep(Math.min(poll_interval * 1000L,
+                       Math.max(deadline - System.currentTimeMillis(), 0L)))
+    }
+
+    return false
+}
+
+
+/* SCRIPT */
+
+def Map drain = [
+    waited: 0,
+    let_through: 0,
+    drained: 0,
+    drained_builds: [],
+    remaining: [],
+    timed_out: false,
+    aborted: false,
+    restart: '',
+]
+
+try {
+    def Jenkins jenkins_instance = Jenkins.getInstance()
+    def Map data = parse_data(get_payload(args))
+    def Long start = System.currentTimeMillis()
+    def Long deadline = start + (data['timeout'] * 1000L)
+    def Boolean was_quieting_down = jenkins_instance.isQuietingDown()
+    def Set<String> seen_builds = [] as Set
+
+    // Short queued items can start before quiet down, and are drained next
+    if ((data['queued_max_duration'] > 0) && !was_quieting_down) {
+        def List<Long> queued = get_short_queued_items(
+            jenkins_instance, data['queued_max_duration'])
+
+        wait_while(deadline, data['poll_interval']) {
+            seen_builds.addAll(get_running_builds(
+                jenkins_instance, data['wait_pipelines']))
+            return get_short_queued_items(
+                jenkins_instance, data['queued_max_duration']).any {
+                    queued.contains(it)
+                }
+        }
+
+        def List<Long> still_queued = get_short_queued_items(
+            jenkins_instance, data['queued_max_duration'])
+        drain['let_through'] = queued.count { !still_queued.contains(it) }
+    }
+
+    jenkins_instance.doQuietDown()
+
+    def Set<String> running = [] as Set
+    drain['timed_out'] = wait_while(deadline, data['poll_interval']) {
+        running = get_running_builds(jenkins_instance, data['wait_pipelines'])
+        seen_builds.addAll(running)
+        return running.size() > 0
+    }
+
+    drain['waited'] = (System.currentTimeMillis() - start).intdiv(1000)
+    drain['remaining'] = running.sort()
+    drain['drained_builds'] = (seen_builds - running).sort()
+    drain['drained'] = drain['drained_builds'].size()
+
+    if (drain['timed_out'] && (data['on_timeout'] == 'abort')) {
+        if (!was_quieting_down) {
+            jenkins_instance.doCancelQuietDown()
+        }
+        drain['aborted'] = true
+    }
+    else if ((data['restart'] == 'safe')
+             && !drain['timed_out']
+             && !is_any_executor_busy(jenkins_instance)) {
+        // Builds are drained, Jenkins restarts as soon as this script ends,
+        // otherwise the service is restarted
+        jenkins_instance.safeRestart()
+        drain['restart'] = 'safe'
+    }
+}
+catch(Exception e) {
+    throw new RuntimeException(
+        "Drain builds error, error message : ${e.getMessage()}")
+}
+
+// Build json result
+result = new JsonBuilder()
+result {
+    changed !drain['aborted']
+    output drain
+}
+
+println result
@@ -65,7 +65,6 @@ try {
     changes['enabled'] = enable_plugin(jenkins_pm,
                                        jenkins_pm.getPlugin(plugin_name),
                                        plugin_name)
-    jenkins_instance.save()
 }
 catch (e) {
     throw new RuntimeException(e.getMessage())
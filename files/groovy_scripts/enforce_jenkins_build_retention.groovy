@@ -0,0 +1,208 @@
+#!/usr/bin/env groovy
+
+import jenkins.model.*
+import hudson.model.Job
+import hudson.model.Run
+import hudson.tasks.LogRotator
+import groovy.io.FileType
+import groovy.json.*
+import java.nio.file.Files
+
+
+/**
+    Convert Json string to Groovy Object
+
+    @param String arg Json string to parse
+    @return Map Groovy object used to get data
+*/
+def Map parse_data(String arg) {
+
+    try {
+        def JsonSlurper jsonSlurper = new JsonSlurper()
+        return jsonSlurper.parseText(arg)
+    }
+    catch(Exception e) {
+        throw new Exception("Parse data error, incoming data : ${arg}, "
+                            + "error message : ${e.getMessage()}")
+    }
+}
+
+
+/**
+    Get Json payload, read on standard input when argument is "-"
+
+    @param String[] Script arguments
+    @return String Json payload
+*/
+def String get_payload(String[] script_args) {
+
+    if (script_args[0] == '-') {
+        return stdin.getText('UTF-8')
+    }
+
+    return script_args[0]
+}
+
+
+/**
+    Build a log rotator from a build discarder policy
+
+    @param Map Build discarder policy, days and number of builds and artifacts
+    @return LogRotator Log rotator, -1 for values not set
+*/
+def LogRotator get_log_rotator(Map policy) {
+
+    def Closure get_value = { String key ->
+        (policy[key] != null) ? (policy[key] as Integer) : -1
+    }
+
+    return new LogRotator(get_value('days_to_keep'),
+                          get_value('num_to_keep'),
+                          get_value('artifact_days_to_keep'),
+                          get_value('artifact_num_to_keep'))
+}
+
+
+/**
+    Get policy to apply on a job, from the most specific folder override
+
+    @param Job Jenkins job
+    @param Map Global build discarder policy
+    @param List Folders overrides, with "folder" full name and policy values
+    @return Map Build discarder policy, empty if no policy
+*/
+def Map get_job_policy(Job job, Map policy, List folders) {
+
+    def Map override = folders.findAll {
+        job.getFullName().startsWith(it['folder'] + '/')
+    }.max { it['folder'].length() }
+
+    return override ?: policy
+}
+
+
+/**
+    Get disk usage of a folder
+
+    @param File Folder
+    @return Long Size in bytes
+*/
+def Long get_disk_usage(File folder) {
+
+    def Long size = 0
+
+    if (folder.isDirectory()) {
+        folder.eachFileRecurse(FileType.FILES) { size += it.length() }
+    }
+
+    return size
+}
+
+
+/**
+    Get build folders of a job, builds are not loaded
+
+    @param Job Jenkins job
+    @return Map Build folders, by build number
+*/
+def Map get_build_folders(Job job) {
+
+    def Map folders = [:]
+    def File build_dir = job.getBuildDir()
+
+    // Build numbers can also be symlinks to build folders
+    if (build_dir.isDirectory()) {
+        build_dir.eachDir { File folder ->
+            if (folder.getName().isInteger()
+                    && !Files.isSymbolicLink(folder.toPath())) {
+                folders[folder.getName()] = folder
+            }
+        }
+    }
+
+    return folders
+}
+
+
+/**
+    Apply build discarder on a job, and report what has been reclaimed
+
+    @param Job Jenkins job
+    @param LogRotator Log rotator to apply
+    @param Boolean Measure disk space of deleted builds
+    @return Map Deleted builds and reclaimed bytes
+*/
+def Map enforce_job(Job job, LogRotator rotator, Boolean report_disk_usage) {
+
+    try {
+        def Map folders_before = get_build_folders(job)
+
+        // Walking build folders is expensive, only done when asked
+        def Map sizes = [:]
+        if (report_disk_usage) {
+            sizes = folders_before.collectEntries { number, folder ->
+                [number, get_disk_usage(folder)]
+            }
+        }
+
+        rotator.perform(job)
+
+        def Set deleted = folders_before.keySet() - get_build_folders(job).keySet()
+
+        return [
+            name: job.getFullName(),
+            builds_deleted: deleted.size(),
+            bytes_reclaimed: deleted.sum(0L) { sizes.get(it, 0L) },
+        ]
+    }
+    catch(Exception e) {
+        throw new Exception(
+            "Build retention error on ${job.getFullName()}, "
+            + "error message : ${e.getMessage()}")
+    }
+}
+
+
+/* SCRIPT */
+
+def List reclaimed = []
+
+try {
+    def Map data = parse_data(get_payload(args))
+
+    Jenkins.getInstance().getAllItems(Job.class).each { Job job ->
+
+        // Jobs with their own build discarder keep it, unless asked
+        def Boolean has_own = (job.getBuildDiscarder() != null)
+        if (has_own && !data['override_job_discarder']) {
+            return
+        }
+
+        def Map policy = get_job_policy(job, data['policy'], data['folders'])
+        if (!policy) {
+            return
+        }
+
+        def Map job_result = enforce_job(job, get_log_rotator(policy),
+                                         data['report_disk_usage'])
+        if (job_result['builds_deleted']) {
+            reclaimed.add(job_result)
+        }
+    }
+}
+catch(Exception e) {
+    throw new RuntimeException(e.getMessage())
+}
+
+// Build json result
+result = new JsonBuilder()
+result {
+    changed (reclaimed.size() > 0)
+    output {
+        jobs reclaimed
+        builds_deleted reclaimed.sum(0) { it['builds_deleted'] }
+        bytes_reclaimed reclaimed.sum(0) { it['bytes_reclaimed'] }
+    }
+}
+
+println result
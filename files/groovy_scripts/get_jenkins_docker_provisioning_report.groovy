@@ -0,0 +1,184 @@
+#!/usr/bin/env groovy
+
+import jenkins.model.*
+import com.nirima.jenkins.plugins.docker.DockerCloud
+import groovy.json.*
+import org.jenkinsci.plugins.cloudstats.CloudStatistics
+import org.jenkinsci.plugins.cloudstats.PhaseExecution
+import org.jenkinsci.plugins.cloudstats.ProvisioningActivity
+
+
+/**
+    Convert Json string to Groovy Object
+
+    @param String arg Json string to parse
+    @return Map Groovy object used to get data
+*/
+def Map parse_data(String arg) {
+
+    try {
+        def JsonSlurper jsonSlurper = new JsonSlurper()
+        return jsonSlurper.parseText(arg)
+    }
+    catch(Exception e) {
+        throw new Exception("Parse data error, incoming data : ${arg}, "
+                            + "error message : ${e.getMessage()}")
+    }
+}
+
+
+/**
+    Get Json payload, read on standard input when argument is "-"
+
+    @param String[] Script arguments
+    @return String Json payload
+*/
+def String get_payload(String[] script_args) {
+
+    if (script_args[0] == '-') {
+        return stdin.getText('UTF-8')
+    }
+
+    return script_args[0]
+}
+
+
+/**
+    Get duration between start of two phases of a provisioning activity
+
+    @param ProvisioningActivity Provisioning activity
+    @param ProvisioningActivity.Phase First phase
+    @param ProvisioningActivity.Phase Second phase
+    @return Long Duration in milliseconds, null if a phase has not started
+*/
+def Long get_phases_duration(ProvisioningActivity activity,
+                             ProvisioningActivity.Phase phase_a,
+                             ProvisioningActivity.Phase phase_b) {
+
+    def PhaseExecution execution_a = activity.getPhaseExecution(phase_a)
+    def PhaseExecution execution_b = activity.getPhaseExecution(phase_b)
+
+    if ((execution_a == null) || (execution_b == null)) {
+        return null
+    }
+
+    return execution_b.getStartedTimestamp() - execution_a.getStartedTimestamp()
+}
+
+
+/**
+    Get a percentile of sorted values, nearest rank method
+
+    @param List Sorted values
+    @param Integer Percentile, between 1 and 100
+    @return Long Percentile value, null if no value
+*/
+def Long get_percentile(List values, Integer percentile) {
+
+    if (!values) {
+        return null
+    }
+
+    def Integer rank = Math.ceil(percentile / 100 * values.size()) as Integer
+
+    return values[Math.max(rank, 1) - 1]
+}
+
+
+/**
+    Summarize durations
+
+    @param List Durations, in milliseconds
+    @return Map Durations statistics, in seconds
+*/
+def Map get_statistics(List durations) {
+
+    def List sorted = durations.sort(false)
+    def Closure to_seconds = { it != null ? it / 1000 : null }
+
+    return [
+        p50: to_seconds(get_percentile(sorted, 50)),
+        p95: to_seconds(get_percentile(sorted, 95)),
+        max: to_seconds(sorted ? sorted.last() : null),
+    ]
+}
+
+
+/**
+    Build latency report of a template, from its provisioning activities
+
+    @param String Cloud name
+    @param String Template name
+    @param List Template provisioning activities
+    @return Map Template report
+*/
+def Map get_template_report(String cloud, String template, List activities) {
+
+    def List to_launch = []
+    def List to_online = []
+
+    activities.each { ProvisioningActivity activity ->
+        def Long provisioning = get_phases_duration(
+            activity, ProvisioningActivity.Phase.PROVISIONING,
+            ProvisioningActivity.Phase.LAUNCHING)
+        def Long launching = get_phases_duration(
+            activity, ProvisioningActivity.Phase.PROVISIONING,
+            ProvisioningActivity.Phase.OPERATING)
+
+        if (provisioning != null) {
+            to_launch.add(provisioning)
+        }
+        if (launching != null) {
+            to_online.add(launching)
+        }
+    }
+
+    return [
+        cloud: cloud,
+        template: template,
+        activities: activities.size(),
+        failures: activities.count {
+            it.getStatus() == ProvisioningActivity.Status.FAIL
+        },
+        container_seconds: get_statistics(to_launch),
+        online_seconds: get_statistics(to_online),
+    ]
+}
+
+
+/* SCRIPT */
+
+def List template_reports = []
+
+try {
+    def Jenkins jenkins_instance = Jenkins.getInstance()
+    def Map data = parse_data(get_payload(args))
+
+    // Requested clouds, or all docker clouds
+    def List cloud_names = data['clouds'] ?: jenkins_instance.clouds.findAll {
+        it instanceof DockerCloud
+    }.collect { it.name }
+
+    // Activities history is kept by cloud statistics plugin
+    CloudStatistics.get().getActivities().findAll {
+        it.getId().getCloudName() in cloud_names
+    }.groupBy {
+        [it.getId().getCloudName(), it.getId().getTemplateName()]
+    }.each { key, activities ->
+        template_reports.add(get_template_report(key[0], key[1], activities))
+    }
+}
+catch(Exception e) {
+    throw new RuntimeException(e.getMessage())
+}
+
+// Build json result
+result = new JsonBuilder()
+result {
+    changed false
+    output {
+        templates template_reports.sort { -(it['online_seconds']['p95'] ?: 0) }
+    }
+}
+
+println result
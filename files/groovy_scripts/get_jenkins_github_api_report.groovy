@@ -0,0 +1,93 @@
+#!/usr/bin/env groovy
+
+import jenkins.model.*
+import groovy.io.FileType
+import groovy.json.*
+import org.jenkinsci.plugins.github.GitHubPlugin
+import org.jenkinsci.plugins.github.config.GitHubServerConfig
+import org.jenkinsci.plugins.github.internal.GitHubClientCacheOps
+import org.kohsuke.github.GHRateLimit
+import org.kohsuke.github.GitHub
+
+
+/**
+    Get disk usage of a folder
+
+    @param File Folder
+    @return Long Size in bytes
+*/
+def Long get_disk_usage(File folder) {
+
+    def Long size = 0
+
+    if (folder.isDirectory()) {
+        folder.eachFileRecurse(FileType.FILES) { size += it.length() }
+    }
+
+    return size
+}
+
+
+/**
+    Get API quota and client cache usage of a GitHub server configuration
+
+    @param GitHubServerConfig GitHub server configuration
+    @return Map Server report
+*/
+def Map get_server_report(GitHubServerConfig config) {
+
+    def File cache_dir = GitHubClientCacheOps.toCacheDir().apply(config)
+    def Map report = [
+        api_url: config.getApiUrl(),
+        credentials_id: config.getCredentialsId(),
+        cache_path: cache_dir.getAbsolutePath(),
+        cache_size_mb: config.getClientCacheSize(),
+        cache_used_bytes: get_disk_usage(cache_dir),
+        error: null,
+    ]
+
+    try {
+        def GitHub github = GitHubServerConfig.loginToGithub().apply(config)
+        if (github == null) {
+            report['error'] = 'Unable to login, check credentials'
+            return report
+        }
+
+        // Rate limit endpoint is not counted in the quota
+        def GHRateLimit rate = github.getRateLimit()
+        report['limit'] = rate.limit
+        report['remaining'] = rate.remaining
+        report['reset'] = rate.getResetDate().getTime().intdiv(1000)
+    }
+    catch(Exception e) {
+        report['error'] = e.getMessage()
+    }
+
+    return report
+}
+
+
+/* SCRIPT */
+
+def List server_reports = []
+
+try {
+    server_reports = GitHubPlugin.configuration().getConfigs().collect {
+        get_server_report(it)
+    }
+}
+catch(Exception e) {
+    throw new RuntimeException(e.getMessage())
+}
+
+// Build json result
+result = new JsonBuilder()
+result {
+    changed false
+    output {
+        cache_path GitHubClientCacheOps.getBaseCacheDir().toString()
+        servers server_reports
+    }
+}
+
+println result
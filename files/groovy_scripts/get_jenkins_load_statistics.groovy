@@ -0,0 +1,121 @@
+#!/usr/bin/env groovy
+
+import jenkins.model.*
+import hudson.model.Label
+import hudson.model.LoadStatistics
+import hudson.model.MultiStageTimeSeries
+import hudson.model.MultiStageTimeSeries.TimeScale
+import groovy.json.*
+
+
+/**
+    Convert Json string to Groovy Object
+
+    @param String arg Json string to parse
+    @return Map Groovy object used to get data
+*/
+def Map parse_data(String arg) {
+
+    try {
+        def JsonSlurper jsonSlurper = new JsonSlurper()
+        return jsonSlurper.parseText(arg)
+    }
+    catch(Exception e) {
+        throw new Exception("Parse data error, incoming data : ${arg}, "
+                            + "error message : ${e.getMessage()}")
+    }
+}
+
+
+/**
+    Get Json payload, read on standard input when argument is "-"
+
+    @param String[] Script arguments
+    @return String Json payload
+*/
+def String get_payload(String[] script_args) {
+
+    if (script_args[0] == '-') {
+        return stdin.getText('UTF-8')
+    }
+
+    return script_args[0]
+}
+
+
+/**
+    Get a load statistics series history, oldest value first
+
+    @param MultiStageTimeSeries Load statistics series
+    @param TimeScale Series time scale
+    @return List Series values
+*/
+def List get_history(MultiStageTimeSeries series, TimeScale time_scale) {
+
+    return series.pick(time_scale).getHistory().toList().reverse()
+}
+
+
+/**
+    Get executors load history
+
+    @param LoadStatistics Load statistics, overall or for a label
+    @param TimeScale Series time scale
+    @return Map Busy executors, total executors and queue length histories
+*/
+def Map get_load(LoadStatistics load, TimeScale time_scale) {
+
+    try {
+        return [
+            busy: get_history(load.busyExecutors, time_scale),
+            total: get_history(load.totalExecutors, time_scale),
+            queue: get_history(load.queueLength, time_scale),
+        ]
+    }
+    catch(Exception e) {
+        throw new Exception(
+            'Get load statistics error, error message : ' + e.getMessage())
+    }
+}
+
+
+/* SCRIPT */
+
+def Map statistics = [:]
+
+try {
+    def Jenkins jenkins_instance = Jenkins.getInstance()
+    def Map data = parse_data(get_payload(args))
+    def TimeScale time_scale = TimeScale.valueOf(
+                                    data['time_scale'].toUpperCase())
+
+    statistics['overall'] = get_load(jenkins_instance.overallLoad, time_scale)
+    statistics['controller'] = get_load(
+        jenkins_instance.getSelfLabel().loadStatistics, time_scale)
+    statistics['controller']['executors'] = jenkins_instance.getNumExecutors()
+    statistics['controller']['heap_max_bytes'] = Runtime.getRuntime()
+                                                        .maxMemory()
+
+    statistics['labels'] = [:]
+    jenkins_instance.getLabels().each { Label label ->
+        if (label.isSelfLabel() || label.getNodes().isEmpty()) {
+            return
+        }
+        statistics['labels'][label.getName()] = get_load(
+            label.loadStatistics, time_scale)
+        statistics['labels'][label.getName()]['nodes'] = label.getNodes()
+                                                              .size()
+    }
+}
+catch(Exception e) {
+    throw new RuntimeException(e.getMessage())
+}
+
+// Build json result
+result = new JsonBuilder()
+result {
+    changed false
+    output statistics
+}
+
+println result
@@ -0,0 +1,187 @@
+#!/usr/bin/env groovy
+
+import jenkins.model.*
+import hudson.model.LoadStatistics
+import hudson.model.MultiStageTimeSeries
+import hudson.model.Queue
+import java.lang.management.ManagementFactory
+import java.lang.management.MemoryUsage
+import java.lang.management.ThreadMXBean
+import groovy.json.*
+
+
+// Written by the role after each restart, in Jenkins home folder
+RESTART_DURATION_FILE = 'ansible_restart_duration'
+
+
+/**
+    Convert Json string to Groovy Object
+
+    @param String arg Json string to parse
+    @return Map Groovy object used to get data
+*/
+def Map parse_data(String arg) {
+
+    try {
+        def JsonSlurper jsonSlurper = new JsonSlurper()
+        return jsonSlurper.parseText(arg)
+    }
+    catch(Exception e) {
+        throw new Exception("Parse data error, incoming data : ${arg}, "
+                            + "error message : ${e.getMessage()}")
+    }
+}
+
+
+/**
+    Get Json payload, read on standard input when argument is "-"
+
+    @param String[] Script arguments
+    @return String Json payload
+*/
+def String get_payload(String[] script_args) {
+
+    if (script_args[0] == '-') {
+        return stdin.getText('UTF-8')
+    }
+
+    return script_args[0]
+}
+
+
+/**
+    Get last restart duration recorded by the role
+
+    @param Jenkins Jenkins instance
+    @return Double Restart duration in seconds, null if never recorded
+*/
+def Double get_restart_duration(Jenkins jenkins_instance) {
+
+    def File duration_file = new File(jenkins_instance.getRootDir(),
+                                      RESTART_DURATION_FILE)
+
+    if (!duration_file.isFile()) {
+        return null
+    }
+
+    try {
+        return duration_file.getText('UTF-8').trim().toDouble()
+    }
+    catch(NumberFormatException e) {
+        return null
+    }
+}
+
+
+/**
+    Collect controller metrics, only from data already computed by Jenkins
+    or by the JVM, to keep collection cheap
+
+    @param Jenkins Jenkins instance
+    @return Map Metrics values, by metric name
+*/
+def Map get_metrics(Jenkins jenkins_instance) {
+
+    try {
+        def Queue queue = jenkins_instance.getQueue()
+        def LoadStatistics load = jenkins_instance.overallLoad
+        def MemoryUsage heap = ManagementFactory.getMemoryMXBean()
+                                                .getHeapMemoryUsage()
+        def MemoryUsage non_heap = ManagementFactory.getMemoryMXBean()
+                                                    .getNonHeapMemoryUsage()
+        def ThreadMXBean threads = ManagementFactory.getThreadMXBean()
+
+        // Queue snapshots are lock free, unlike Queue.getItems()
+        def Integer buildable = queue.countBuildableItems()
+        def Integer blocked = queue.getBlockedItems().size()
+        def Integer queue_length = queue.getApproximateItemsQuickly().size()
+
+        def Integer total_executors = load.computeTotalExecutors()
+        def Integer busy_executors = total_executors
+                                     - load.computeIdleExecutors()
+
+        return [
+            queue_length: queue_length,
+            queue_buildable: buildable,
+            queue_blocked: blocked,
+            executors_total: total_executors,
+            executors_busy: busy_executors,
+            executors_utilization: (total_executors > 0) ?
+                (busy_executors / total_executors).toDouble() : 0.0,
+            executors_busy_average: load.busyExecutors.getLatest(
+                MultiStageTimeSeries.TimeScale.MIN),
+            heap_used_bytes: heap.getUsed(),
+            heap_committed_bytes: heap.getCommitted(),
+            heap_max_bytes: heap.getMax(),
+            non_heap_used_bytes: non_heap.getUsed(),
+            non_heap_committed_bytes: non_heap.getCommitted(),
+            threads: threads.getThreadCount(),
+            threads_daemon: threads.getDaemonThreadCount(),
+            threads_peak: threads.getPeakThreadCount(),
+            plugins: jenkins_instance.getPluginManager().getPlugins().size(),
+            plugins_failed: jenkins_instance.getPluginManager()
+                                            .getFailedPlugins().size(),
+            uptime_seconds: ManagementFactory.getRuntimeMXBean()
+                                             .getUptime() / 1000,
+            last_restart_duration_seconds: get_restart_duration(
+                jenkins_instance),
+        ]
+    }
+    catch(Exception e) {
+        throw new Exception(
+            'Get metrics error, error message : ' + e.getMessage())
+    }
+}
+
+
+/**
+    Render metrics in Prometheus text format
+
+    @param Map Metrics values, by metric name
+    @return String Prometheus text format metrics
+*/
+def String to_prometheus(Map metrics) {
+
+    def StringBuilder text = new StringBuilder()
+
+    metrics.each { name, value ->
+        if (value == null) {
+            return
+        }
+        text.append("# TYPE jenkins_${name} gauge\n")
+        text.append("jenkins_${name} ${value}\n")
+    }
+
+    return text.toString()
+}
+
+
+/* SCRIPT */
+
+def Map jenkins_metrics = [:]
+def Map data = [format: 'prometheus']
+
+try {
+    // Script runs without arguments from scriptText endpoint
+    if (binding.hasVariable('args') && args.length > 0) {
+        data = parse_data(get_payload(args))
+    }
+    jenkins_metrics = get_metrics(Jenkins.getInstance())
+}
+catch(Exception e) {
+    throw new RuntimeException(e.getMessage())
+}
+
+if (data['format'] == 'prometheus') {
+    print to_prometheus(jenkins_metrics)
+    return
+}
+
+// Build json result
+result = new JsonBuilder()
+result {
+    changed false
+    output jenkins_metrics
+}
+
+println result
@@ -0,0 +1,258 @@
+#!/usr/bin/env groovy
+
+import jenkins.model.*
+import hudson.PluginManager
+import hudson.PluginWrapper
+import hudson.model.UpdateCenter
+import hudson.model.UpdateSite
+import hudson.util.VersionNumber
+import groovy.json.*
+
+
+/**
+    Convert Json string to Groovy Object
+
+    @param String arg Json string to parse
+    @return Map Groovy object used to get data
+*/
+def Map parse_data(String arg) {
+
+    try {
+        def JsonSlurper jsonSlurper = new JsonSlurper()
+        return jsonSlurper.parseText(arg)
+    }
+    catch(Exception e) {
+        throw new Exception("Parse data error, incoming data : ${arg}, "
+                            + "error message : ${e.getMessage()}")
+    }
+}
+
+
+/**
+    Get Json payload, read on standard input when argument is "-"
+
+    @param String[] Script arguments
+    @return String Json payload
+*/
+def String get_payload(String[] script_args) {
+
+    if (script_args[0] == '-') {
+        return stdin.getText('UTF-8')
+    }
+
+    return script_args[0]
+}
+
+
+/**
+    Check if an update site plugin version needs a newer core
+
+    @param UpdateSite.Plugin Update site plugin
+    @param VersionNumber Installed core version
+    @return Boolean True if installed core is too old
+*/
+def Boolean needs_newer_core(UpdateSite.Plugin update,
+                             VersionNumber core_version) {
+
+    if ((update.requiredCore == null) || (core_version == null)) {
+        return false
+    }
+
+    return core_version.isOlderThan(new VersionNumber(update.requiredCore))
+}
+
+
+/**
+    Add a plugin and its needed dependencies to the upgrade set
+
+    @param PluginManager Jenkins plugin manager
+    @param UpdateCenter Jenkins update center
+    @param String Plugin name
+    @param Map Upgrade set, by plugin name
+    @return Map Plugin entry in upgrade set, null if no action needed
+*/
+def Map add_to_upgrade_set(PluginManager jenkins_pm,
+                           UpdateCenter jenkins_uc,
+                           String name,
+                           Map upgrade_set) {
+
+    if (upgrade_set.containsKey(name)) {
+        return upgrade_set[name]
+    }
+
+    def PluginWrapper installed = jenkins_pm.getPlugin(name)
+    def UpdateSite.Plugin update = jenkins_uc.getPlugin(name)
+
+    if (update == null) {
+        throw new Exception("Plugin not found in Update Center : ${name}")
+    }
+
+    if ((installed != null)
+            && !installed.getVersionNumber().isOlderThan(
+                new VersionNumber(update.version))) {
+        return null
+    }
+
+    def Map entry = [
+        name: name,
+        action: (installed == null) ? 'install' : 'upgrade',
+        from_version: installed?.getVersion(),
+        to_version: update.version,
+        required_core: update.requiredCore,
+        url: update.url,
+        sha1: update.getSha1(),
+        sha256: update.metaClass.respondsTo(update, 'getSha256') ?
+                    update.getSha256() : null,
+        dependencies: []
+    ]
+    upgrade_set[name] = entry
+
+    // Only dependencies installed with an older version are upgraded
+    update.dependencies.each { dep_name, dep_version ->
+        def PluginWrapper dep_installed = jenkins_pm.getPlugin(dep_name)
+        def Boolean dep_too_old = (dep_installed == null)
+            || dep_installed.getVersionNumber().isOlderThan(
+                new VersionNumber(dep_version))
+
+        if (dep_too_old) {
+            add_to_upgrade_set(jenkins_pm, jenkins_uc, dep_name, upgrade_set)
+        }
+
+        if (upgrade_set.containsKey(dep_name)) {
+            entry['dependencies'].add(dep_name)
+        }
+    }
+
+    return entry
+}
+
+
+/**
+    Block plugins needing a newer core, and plugins depending on them
+
+    @param Map Upgrade set, by plugin name
+    @param VersionNumber Installed core version
+    @param UpdateCenter Jenkins update center
+    @return Map Blocked plugins, with reason, by plugin name
+*/
+def Map get_blocked_plugins(Map upgrade_set,
+                            VersionNumber core_version,
+                            UpdateCenter jenkins_uc) {
+
+    def Map blocked = [:]
+
+    upgrade_set.each { name, entry ->
+        if (needs_newer_core(jenkins_uc.getPlugin(name), core_version)) {
+            blocked[name] = "needs Jenkins ${entry['required_core']}"
+        }
+    }
+
+    // Propagate until stable, a plugin is blocked if a dependency is
+    def Boolean propagate = true
+    while (propagate) {
+        propagate = false
+        upgrade_set.each { name, entry ->
+            if (blocked.containsKey(name)) {
+                return
+            }
+            def String blocked_dep = entry['dependencies'].find {
+                blocked.containsKey(it)
+            }
+            if (blocked_dep != null) {
+                blocked[name] = "depends on blocked plugin ${blocked_dep}"
+                propagate = true
+            }
+        }
+    }
+
+    return blocked
+}
+
+
+/**
+    Sort upgrade set, dependencies first
+
+    @param Map Upgrade set, by plugin name
+    @param Map Blocked plugins, by plugin name
+    @return List Ordered upgrade plan
+*/
+def List sort_upgrade_set(Map upgrade_set, Map blocked) {
+
+    def List plan = []
+    def Set visited = [] as Set
+    def Set visiting = [] as Set
+
+    def visit
+    visit = { String name ->
+        if (visited.contains(name)) {
+            return
+        }
+        if (visiting.contains(name)) {
+            throw new Exception("Plugin dependency cycle found on : ${name}")
+        }
+
+        visiting.add(name)
+        upgrade_set[name]['dependencies'].each { visit(it) }
+        visiting.remove(name)
+        visited.add(name)
+
+        if (!blocked.containsKey(name)) {
+            plan.add(upgrade_set[name])
+        }
+    }
+
+    upgrade_set.keySet().sort().each { visit(it) }
+
+    return plan
+}
+
+
+/* SCRIPT */
+
+def List upgrade_plan = []
+def Map blocked_plugins = [:]
+def String installed_core = ''
+
+try {
+    def Jenkins jenkins_instance = Jenkins.getInstance()
+    def PluginManager jenkins_pm = jenkins_instance.getPluginManager()
+    def UpdateCenter jenkins_uc = jenkins_instance.getUpdateCenter()
+    def Map data = parse_data(get_payload(args))
+
+    if (data['update_sites']) {
+        jenkins_uc.updateAllSites()
+    }
+
+    // Requested plugins, or all installed plugins with an available update
+    def List names = data['names'] ?: jenkins_pm.getPlugins().findAll {
+        it.hasUpdate()
+    }.collect { it.getShortName() }
+
+    def Map upgrade_set = [:]
+    names.each {
+        add_to_upgrade_set(jenkins_pm, jenkins_uc, it, upgrade_set)
+    }
+
+    // Installed WAR version is given, Jenkins may restart on another version
+    def VersionNumber core_version = data['core_version'] ?
+        new VersionNumber(data['core_version']) : Jenkins.getVersion()
+    installed_core = core_version.toString()
+    blocked_plugins = get_blocked_plugins(upgrade_set, core_version, jenkins_uc)
+    upgrade_plan = sort_upgrade_set(upgrade_set, blocked_plugins)
+}
+catch(Exception e) {
+    throw new RuntimeException(e.getMessage())
+}
+
+// Build json result
+result = new JsonBuilder()
+result {
+    changed false
+    output {
+        core_version installed_core
+        plan upgrade_plan
+        blocked blocked_plugins
+    }
+}
+
+println result
@@ -0,0 +1,162 @@
+#!/usr/bin/env groovy
+
+import jenkins.model.*
+import jenkins.model.ParameterizedJobMixIn
+import hudson.model.Job
+import hudson.scheduler.CronTabList
+import hudson.scheduler.Hash
+import hudson.triggers.SCMTrigger
+import hudson.triggers.Trigger
+import groovy.json.*
+
+
+// Triggers started by SCM hooks, a job having one does not need to poll
+HOOK_TRIGGERS = [
+    'com.cloudbees.jenkins.GitHubPushTrigger',
+    'com.dabsquared.gitlabjenkins.GitLabPushTrigger',
+]
+
+
+/**
+    Convert Json string to Groovy Object
+
+    @param String arg Json string to parse
+    @return Map Groovy object used to get data
+*/
+def Map parse_data(String arg) {
+
+    try {
+        def JsonSlurper jsonSlurper = new JsonSlurper()
+        return jsonSlurper.parseText(arg)
+    }
+    catch(Exception e) {
+        throw new Exception("Parse data error, incoming data : ${arg}, "
+                            + "error message : ${e.getMessage()}")
+    }
+}
+
+
+/**
+    Get Json payload, read on standard input when argument is "-"
+
+    @param String[] Script arguments
+    @return String Json payload
+*/
+def String get_payload(String[] script_args) {
+
+    if (script_args[0] == '-') {
+        return stdin.getText('UTF-8')
+    }
+
+    return script_args[0]
+}
+
+
+/**
+    Estimate polls per hour of a schedule, counting matching minutes
+
+    @param Job Jenkins job, used to resolve "H" in schedule
+    @param String Cron schedule
+    @param Integer Window to check, in hours
+    @return Double Polls per hour
+*/
+def Double get_polls_per_hour(Job job, String spec, Integer window_hours) {
+
+    try {
+        def CronTabList cron = CronTabList.create(
+            spec, Hash.from(job.getFullName()))
+        def Calendar minute = Calendar.getInstance()
+        def Integer polls = 0
+
+        minute.set(Calendar.SECOND, 0)
+        minute.set(Calendar.MILLISECOND, 0)
+
+        (window_hours * 60).times {
+            if (cron.check(minute)) {
+                polls++
+            }
+            minute.add(Calendar.MINUTE, 1)
+        }
+
+        return polls / window_hours
+    }
+    catch(Exception e) {
+        throw new Exception(
+            "Polling schedule error on ${job.getFullName()}, "
+            + "error message : ${e.getMessage()}")
+    }
+}
+
+
+/**
+    Get triggers of a job, empty if job can not have any
+
+    @param Job Jenkins job
+    @return Map Triggers by descriptor
+*/
+def Map get_triggers(Job job) {
+
+    if (!(job instanceof ParameterizedJobMixIn.ParameterizedJob)) {
+        return [:]
+    }
+
+    return job.getTriggers()
+}
+
+
+/* SCRIPT */
+
+def List polling_jobs = []
+def Integer threads = 0
+
+try {
+    def Jenkins jenkins_instance = Jenkins.getInstance()
+    def Map data = parse_data(get_payload(args))
+
+    threads = jenkins_instance.getDescriptorByType(
+        SCMTrigger.DescriptorImpl.class).getPollingThreadCount()
+
+    jenkins_instance.getAllItems(Job.class).each { Job job ->
+
+        def Collection<Trigger> triggers = get_triggers(job).values()
+        def SCMTrigger scm_trigger = triggers.find { it instanceof SCMTrigger }
+
+        if ((scm_trigger == null) || !scm_trigger.getSpec()?.trim()) {
+            return
+        }
+
+        def Double polls = get_polls_per_hour(
+            job, scm_trigger.getSpec(), data['window_hours'])
+        if (polls < data['min_polls_per_hour']) {
+            return
+        }
+
+        polling_jobs.add([
+            name: job.getFullName(),
+            spec: scm_trigger.getSpec(),
+            polls_per_hour: polls,
+            hook_trigger: triggers.any {
+                it.getClass().getName() in HOOK_TRIGGERS
+            },
+            ignore_post_commit_hooks: scm_trigger.isIgnorePostCommitHooks(),
+            disabled: job.metaClass.respondsTo(job, 'isDisabled')
+                      && job.isDisabled(),
+        ])
+    }
+}
+catch(Exception e) {
+    throw new RuntimeException(e.getMessage())
+}
+
+// Build json result
+result = new JsonBuilder()
+result {
+    changed false
+    output {
+        polling_threads threads
+        polls_per_hour polling_jobs.sum(0) { it['polls_per_hour'] }
+        jobs polling_jobs.sort { -it['polls_per_hour'] }
+    }
+}
+
+println result
@@ -1,6 +1,7 @@
 #!/usr/bin/env groovy
 
 import jenkins.model.*
+import hudson.model.UpdateCenter
 import groovy.json.*
 
 
@@ -28,43 +29,63 @@ def get_plugin(jenkins_uc, plugin_name) {
     return plugin
 }
 
-// Install plugins if needed
-def install_plugin(plugin_state, plugin) {
+// Install plugins if needed, new plugins are loaded without restart if allowed
+def install_plugin(plugin_state, plugin, dynamic_load) {
+
+    def result = [
+        installed: false,
+        restart_required: false
+    ]
 
     // Check plugin state
-    plugin_installed = plugin.getInstalled()
-    plugin_need_update = plugin_installed \
+    def plugin_installed = plugin.getInstalled()
+    def plugin_need_update = plugin_installed \
                             && (plugin_state == 'latest') \
                             && plugin_installed.hasUpdate()
 
-    // Install plugin if needed
-    if ((plugin.getInstalled() == null) || plugin_need_update) {
-        plugin.deploy()
-        return true
+    if ((plugin_installed != null) && !plugin_need_update) {
+        return result
+    }
+
+    // An upgraded plugin is already loaded, so it always needs a restart
+    def load_now = dynamic_load && (plugin_installed == null)
+
+    // Wait the end of installation to know if dynamic loading succeeded
+    def job = plugin.deploy(load_now).get()
+    def status = job.status
+
+    if (status instanceof UpdateCenter.DownloadJob.Failure) {
+        throw new Exception(
+            "Plugin installation failed : ${plugin.name} - ${status.problem}")
     }
-    return false
+
+    result['installed'] = true
+    result['restart_required'] = !load_now \
+        || (status instanceof UpdateCenter.DownloadJob.SuccessButRequiresRestart)
+
+    return result
 }
 
 
 /* SCRIPT */
 
-def installed = false
+def result = [:]
 
 try {
     def jenkins_instance = Jenkins.getInstance()
     def jenkins_uc = jenkins_instance.getUpdateCenter()
     def plugin_name = args[0]
     def plugin_state = args[1]
+    def dynamic_load = (args.length > 2) ? args[2].toBoolean() : false
 
     check_args(plugin_name)
     def jenkins_plugin = get_plugin(jenkins_uc, plugin_name)
 
-    installed = install_plugin(plugin_state, jenkins_plugin)
-    jenkins_instance.save()
+    result = install_plugin(plugin_state, jenkins_plugin, dynamic_load)
 }
 catch (e) {
     throw new RuntimeException(e.getMessage())
 }
 
-println JsonOutput.toJson(installed)
+println JsonOutput.toJson(result)
 
@@ -0,0 +1,56 @@
+// Change tracker, included in configuration scripts when they are deployed.
+// Changed Jenkins objects are marked, then saved once at the end of the script
+
+CHANGED_ITEMS = []
+
+
+/**
+    Get configuration file of a saveable object
+
+    @param hudson.model.Saveable Jenkins object saved to disk
+    @return String File path relative to Jenkins home, class name if unknown
+*/
+def String get_config_path(hudson.model.Saveable item) {
+
+    def String home = jenkins.model.Jenkins.getInstance().getRootDir().getAbsolutePath()
+
+    try {
+        return item.getConfigFile().getFile().getAbsolutePath() - "${home}/"
+    }
+    catch(Exception e) {
+        return item.getClass().getName()
+    }
+}
+
+
+/**
+    Mark an object as changed, to save it once at the end of the script
+
+    @param hudson.model.Saveable Changed Jenkins object
+*/
+def void mark_changed(hudson.model.Saveable item) {
+
+    if (!CHANGED_ITEMS.any { it.is(item) }) {
+        CHANGED_ITEMS.add(item)
+    }
+}
+
+
+/**
+    Save objects marked as changed, nothing is written if none changed
+
+    @return List<String> Saved files, relative to Jenkins home
+*/
+def List<String> save_changed() {
+
+    try {
+        return CHANGED_ITEMS.collect { hudson.model.Saveable item ->
+            item.save()
+            get_config_path(item)
+        }
+    }
+    catch(Exception e) {
+        throw new Exception(
+            "Configuration save error, error message : ${e.getMessage()}")
+    }
+}
@@ -11,6 +11,7 @@ import com.cloudbees.jenkins.plugins.sshcredentials.impl.*
 import com.dabsquared.gitlabjenkins.connection.GitLabApiTokenImpl
 import hudson.plugins.sshslaves.*
 import hudson.util.Secret
+import hudson.model.Saveable
 import groovy.json.*
 import org.jenkinsci.plugins.plaincredentials.impl.StringCredentialsImpl
 
@@ -34,6 +35,22 @@ def Object parse_data(String arg) {
 }
 
 
+/**
+    Get Json payload, read on standard input when argument is "-"
+
+    @param String[] Script arguments
+    @return String Json payload
+*/
+def String get_payload(String[] script_args) {
+
+    if (script_args[0] == '-') {
+        return stdin.getText('UTF-8')
+    }
+
+    return script_args[0]
+}
+
+
 /**
     Get current credentials store
 
@@ -532,22 +549,44 @@ def Boolean manage_credentials(CredentialsStore store,
 }
 
 
+/**
+    Get configuration file of a saveable object
+
+    @param Saveable Jenkins object saved to disk
+    @return String File path relative to Jenkins home, class name if unknown
+*/
+def String get_config_path(Saveable item) {
+
+    def String home = Jenkins.getInstance().getRootDir().getAbsolutePath()
+
+    try {
+        return item.getConfigFile().getFile().getAbsolutePath() - "${home}/"
+    }
+    catch(Exception e) {
+        return item.getClass().getName()
+    }
+}
+
+
 /* SCRIPT */
 
 def Boolean has_changed = false
+def List<String> saved_files = []
 
 try {
     def Jenkins jenkins_instance = Jenkins.getInstance()
     def credentials_store = get_credential_store(jenkins_instance)
 
     // Get user data
-    data = parse_data(args[0])
+    data = parse_data(get_payload(args))
 
     //manage credentials
     has_changed = manage_credentials(credentials_store, data)
 
-    // Save new configuration to disk
-    jenkins_instance.save()
+    // Credentials store saves itself on changes, report its file
+    if (has_changed) {
+        saved_files.add(get_config_path(SystemCredentialsProvider.getInstance()))
+    }
 }
 catch(Exception e) {
     throw new RuntimeException(e.getMessage())
@@ -560,6 +599,7 @@ result {
     output {
         changed has_changed
     }
+    saved saved_files
 }
 
 println result
@@ -8,6 +8,9 @@ import hudson.model.*
 import groovy.json.*
 
 
+{% include 'lib/change_tracker.groovy' %}
+
+
 /**
     Set the Jenkins administrator email address
 
@@ -66,6 +69,7 @@ def Boolean set_url(JenkinsLocationConfiguration location, String new_value) {
 /* SCRIPT */
 
 def List <Boolean> has_changed = []
+def List<String> saved_files = []
 def String new_address = ""
 def String new_url = ""
 
@@ -84,8 +88,10 @@ try {
     has_changed.push(set_administrator_email(location, new_address))
     has_changed.push(set_url(location, url))
 
-    // Save new configuration to disk
-    location.save()
+    // Setters already save the configuration, only report it
+    if (has_changed.any()) {
+        saved_files.add(get_config_path(location))
+    }
 }
 catch(Exception e) {
     throw new RuntimeException(e.getMessage())
@@ -100,6 +106,7 @@ result {
         address new_address
         url new_url
     }
+    saved saved_files
 }
 
 println result
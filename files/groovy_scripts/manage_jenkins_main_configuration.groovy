@@ -4,9 +4,13 @@ import jenkins.model.*
 import jenkins.model.ProjectNamingStrategy
 import jenkins.model.ProjectNamingStrategy.PatternProjectNamingStrategy
 import hudson.model.*
+import hudson.tasks.LogRotator
 import groovy.json.*
 
 
+{% include 'lib/change_tracker.groovy' %}
+
+
 /**
     Convert Json string to Groovy Object
 
@@ -26,6 +30,22 @@ def Object parse_data(String arg) {
 }
 
 
+/**
+    Get Json payload, read on standard input when argument is "-"
+
+    @param String[] Script arguments
+    @return String Json payload
+*/
+def String get_payload(String[] script_args) {
+
+    if (script_args[0] == '-') {
+        return stdin.getText('UTF-8')
+    }
+
+    return script_args[0]
+}
+
+
 /**
     Set the Jenkins disable remember me option
 
@@ -44,6 +64,7 @@ def Boolean set_disable_remember_me(Jenkins jenkins_instance,
 
     try {
         jenkins_instance.setDisableRememberMe(new_value)
+        mark_changed(jenkins_instance)
     }
     catch(Exception e) {
         throw new Exception(
@@ -72,6 +93,7 @@ def Boolean set_label(Jenkins jenkins_instance, String label) {
 
     try {
         jenkins_instance.setLabelString(label)
+        mark_changed(jenkins_instance)
     }
     catch(Exception e) {
         throw new Exception(
@@ -100,6 +122,7 @@ def Boolean set_number_of_executors(Jenkins jenkins_instance,
 
     try {
         jenkins_instance.setNumExecutors(executors_number)
+        mark_changed(jenkins_instance)
     }
     catch(Exception e) {
         throw new Exception(
@@ -129,6 +152,7 @@ def Boolean set_mode(Jenkins jenkins_instance, String mode) {
     try {
         def Node.Mode new_mode = Node.Mode.valueOf(mode)
         jenkins_instance.setMode(new_mode)
+        mark_changed(jenkins_instance)
     }
     catch(Exception e) {
         throw new Exception(
@@ -169,6 +193,8 @@ def Boolean set_project_naming_strategy(Jenkins jenkins_instance,
         }
 
         jenkins_instance.setProjectNamingStrategy(new_value)
+
+        mark_changed(jenkins_instance)
     }
     catch(Exception e) {
         throw new Exception(
@@ -197,6 +223,7 @@ def Boolean set_quiet_period(Jenkins jenkins_instance, Integer quiet_period) {
 
     try {
         jenkins_instance.setQuietPeriod(quiet_period)
+        mark_changed(jenkins_instance)
     }
     catch(Exception e) {
         throw new Exception(
@@ -225,6 +252,7 @@ def Boolean set_scm_checkout_retry_count(Jenkins jenkins_instance,
 
     try {
         jenkins_instance.setScmCheckoutRetryCount(new_count)
+        mark_changed(jenkins_instance)
     }
     catch(Exception e) {
         throw new Exception(
@@ -253,6 +281,7 @@ def Boolean set_slave_agent_port(Jenkins jenkins_instance, Integer port) {
 
     try {
         jenkins_instance.setSlaveAgentPort(port)
+        mark_changed(jenkins_instance)
     }
     catch(Exception e) {
         throw new Exception(
@@ -264,11 +293,94 @@ def Boolean set_slave_agent_port(Jenkins jenkins_instance, Integer port) {
 }
 
 
+/**
+    Build a log rotator from a build discarder policy
+
+    @param Map Build discarder policy, days and number of builds and artifacts
+    @return LogRotator Log rotator, -1 for values not set
+*/
+def LogRotator get_log_rotator(Map policy) {
+
+    def Closure get_value = { String key ->
+        (policy[key] != null) ? (policy[key] as Integer) : -1
+    }
+
+    return new LogRotator(get_value('days_to_keep'),
+                          get_value('num_to_keep'),
+                          get_value('artifact_days_to_keep'),
+                          get_value('artifact_num_to_keep'))
+}
+
+
+/**
+    Set the Jenkins global build discarder, used for jobs without their own
+
+    @param Jenkins Jenkins singleton
+    @param Map Build discarder policy, days and number of builds and artifacts
+    @return Boolean True if changed, else false
+*/
+def Boolean set_global_build_discarder(Jenkins jenkins_instance, Map policy) {
+
+    // Policy not managed by the role
+    if (!policy) {
+        return false
+    }
+
+    try {
+        def LogRotator new_value = get_log_rotator(policy)
+
+        // Needs Jenkins 2.221 or newer, loaded by name to keep the script
+        // usable with older versions when policy is not managed
+        def ClassLoader loader = jenkins_instance.getPluginManager()
+                                                 .uberClassLoader
+        def Class config_class = loader.loadClass(
+            'jenkins.model.GlobalBuildDiscarderConfiguration')
+        def Class strategy_class = loader.loadClass(
+            'jenkins.model.SimpleGlobalBuildDiscarderStrategy')
+        def config = config_class.get()
+        def strategies = config.getConfiguredBuildDiscarders()
+
+        // Get current value, used to check if changed
+        def cur_value = strategies.find {
+            strategy_class.isInstance(it)
+        }?.getDiscarder()
+
+        if (cur_value instanceof LogRotator
+          && cur_value.getDaysToKeep() == new_value.getDaysToKeep()
+          && cur_value.getNumToKeep() == new_value.getNumToKeep()
+          && cur_value.getArtifactDaysToKeep()
+                == new_value.getArtifactDaysToKeep()
+          && cur_value.getArtifactNumToKeep()
+                == new_value.getArtifactNumToKeep()) {
+            return false
+        }
+
+        strategies.removeAll(strategies.findAll {
+            strategy_class.isInstance(it)
+        })
+        strategies.add(strategy_class.newInstance(new_value))
+        mark_changed(config)
+    }
+    catch(ClassNotFoundException e) {
+        throw new Exception(
+            'Global build discarder needs Jenkins 2.221 or newer')
+    }
+    catch(Exception e) {
+        throw new Exception(
+            'An error occurs during global build discarder change: '
+            + e.getMessage())
+    }
+
+    return true
+}
+
+
 /* SCRIPT */
 def List<Boolean> has_changed = []
+def List<String> saved_files = []
 try {
     def Jenkins jenkins_instance = Jenkins.getInstance()
-    data = parse_data(args[0])
+    data = parse_data(get_payload(args))
 
     // Manage configuration with user data
     has_changed.push(set_disable_remember_me(
@@ -295,9 +407,12 @@ try {
     has_changed.push(set_slave_agent_port(
                         jenkins_instance,
                         data['slave_agent_port']))
+    has_changed.push(set_global_build_discarder(
+                        jenkins_instance,
+                        data['build_discarder']))
 
-    // Save new configuration to disk
-    jenkins_instance.save()
+    // Save changed configurations to disk
+    saved_files = save_changed()
 }
 catch(Exception e) {
     throw new RuntimeException(e.getMessage())
@@ -308,6 +423,7 @@ result = new JsonBuilder()
 result {
     changed has_changed.any()
     output has_changed
+    saved saved_files
 }
 
 println result
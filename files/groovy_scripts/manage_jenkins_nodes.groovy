@@ -0,0 +1,316 @@
+#!/usr/bin/env groovy
+
+import jenkins.model.*
+import groovy.json.*
+import hudson.model.Node
+import hudson.model.Queue
+import hudson.plugins.sshslaves.SSHLauncher
+import hudson.plugins.sshslaves.verifiers.KnownHostsFileKeyVerificationStrategy
+import hudson.plugins.sshslaves.verifiers.NonVerifyingKeyVerificationStrategy
+import hudson.plugins.sshslaves.verifiers.SshHostKeyVerificationStrategy
+import hudson.slaves.ComputerLauncher
+import hudson.slaves.DumbSlave
+import hudson.slaves.JNLPLauncher
+import hudson.slaves.RetentionStrategy
+
+
+/**
+    Convert Json string to Groovy Object
+
+    @param String arg Json string to parse
+    @return Map Groovy object used to get data
+*/
+def Map parse_data(String arg) {
+
+    try {
+        def JsonSlurper jsonSlurper = new JsonSlurper()
+        return jsonSlurper.parseText(arg)
+    }
+    catch(Exception e) {
+        throw new Exception("Parse data error, incoming data : ${arg}, "
+                            + "error message : ${e.getMessage()}")
+    }
+}
+
+
+/**
+    Get Json payload, read on standard input when argument is "-"
+
+    @param String[] Script arguments
+    @return String Json payload
+*/
+def String get_payload(String[] script_args) {
+
+    if (script_args[0] == '-') {
+        return stdin.getText('UTF-8')
+    }
+
+    return script_args[0]
+}
+
+
+/**
+    Create SSH host key verification strategy
+
+    @param String Strategy name, "non_verifying" or "known_hosts"
+    @return SshHostKeyVerificationStrategy New verification strategy
+*/
+def SshHostKeyVerificationStrategy create_verification_strategy(String name) {
+
+    switch (name) {
+
+        case 'non_verifying':
+            return new NonVerifyingKeyVerificationStrategy()
+        case 'known_hosts':
+            return new KnownHostsFileKeyVerificationStrategy()
+        default:
+            throw new Exception(
+                "SSH host key verification strategy not managed : ${name}")
+    }
+}
+
+
+/**
+    Create agent launcher
+
+    @param Map Launcher configuration
+    @return ComputerLauncher New launcher
+*/
+def ComputerLauncher create_launcher(Map data) {
+
+    try {
+
+        def ComputerLauncher launcher
+
+        switch (data['class']) {
+
+            case 'ssh':
+                launcher = new SSHLauncher(data['host'],
+                                           (data['port'] ?: 22) as Integer,
+                                           data['credentials_id'])
+                launcher.setJavaPath(data['java_path'] ?: '')
+                launcher.setJvmOptions((data['jvm_options'] ?: []).join(' '))
+                launcher.setLaunchTimeoutSeconds(
+                    (data['launch_timeout'] ?: 60) as Integer)
+                launcher.setSshHostKeyVerificationStrategy(
+                    create_verification_strategy(
+                        data['host_key_verification'] ?: 'known_hosts'))
+                break
+            case 'jnlp':
+                launcher = new JNLPLauncher()
+                break
+            default:
+                throw new Exception('Launcher type not managed')
+        }
+
+        return launcher
+    }
+    catch(Exception e) {
+        throw new Exception(
+            'Agent launcher create error, error message : ' + e.getMessage())
+    }
+}
+
+
+/**
+    Create agent retention strategy
+
+    @param Map Retention strategy configuration
+    @return RetentionStrategy New retention strategy
+*/
+def RetentionStrategy create_ret_strategy(Map data) {
+
+    try {
+
+        switch (data['class']) {
+
+            case 'always':
+                return new RetentionStrategy.Always()
+            case 'demand':
+                return new RetentionStrategy.Demand(
+                    (data['in_demand_delay'] ?: 0) as Long,
+                    (data['idle_delay'] ?: 10) as Long)
+            default:
+                throw new Exception('Retention strategy type not managed')
+        }
+    }
+    catch(Exception e) {
+        throw new Exception(
+            'Agent retention strategy create error, error message : '
+            + e.getMessage())
+    }
+}
+
+
+/**
+    Create agent node
+
+    @param Map Agent configuration
+    @return DumbSlave New agent
+*/
+def DumbSlave create_node(Map data) {
+
+    try {
+
+        def DumbSlave node = new DumbSlave(data['name'],
+                                           data['remote_fs'],
+                                           create_launcher(data['launcher']))
+
+        node.setNodeDescription(data['description'] ?: '')
+        node.setNumExecutors((data['executors'] ?: 1) as Integer)
+        node.setLabelString((data['labels'] ?: []).join(' '))
+        node.setMode(Node.Mode.valueOf(data['mode'] ?: 'NORMAL'))
+        node.setRetentionStrategy(create_ret_strategy(
+            data['retention_strategy'] ?: [class: 'always']))
+
+        return node
+    }
+    catch(Exception e) {
+        throw new Exception(
+            "Agent ${data['name']} create error, error message : "
+            + e.getMessage())
+    }
+}
+
+
+/**
+    Check if two agents have same configuration, using their serialized form
+
+    @param Node Current agent
+    @param Node New agent
+    @return Boolean True if agents have same configuration
+*/
+def Boolean is_same_node(Node node_a, Node node_b) {
+
+    try {
+        return Jenkins.XSTREAM2.toXML(node_a) == Jenkins.XSTREAM2.toXML(node_b)
+    }
+    catch(Exception e) {
+        throw new Exception(
+            'Check if two agents have same properties error, '
+            + 'error message : ' + e.getMessage())
+    }
+}
+
+
+/**
+    Build the new agents list, from current agents and wanted ones
+
+    @param List<Node> Current agents
+    @param List Wanted agents configuration
+    @param Boolean Remove agents not in wanted agents
+    @return Map New agents list, with added, updated and removed agents names
+*/
+def Map build_nodes(List<Node> current_nodes,
+                    List nodes_data,
+                    Boolean remove_unmanaged) {
+
+    def Map wanted = nodes_data.collectEntries { [(it['name']): it] }
+    def Map changes = [nodes: [], added: [], updated: [], removed: []]
+
+    for (Node node : current_nodes) {
+        def Map data = wanted.remove(node.getNodeName())
+
+        if (data == null) {
+            if (remove_unmanaged) {
+                changes['removed'].add(node.getNodeName())
+            }
+            else {
+                changes['nodes'].add(node)
+            }
+            continue
+        }
+
+        if (data['state'] == 'absent') {
+            changes['removed'].add(node.getNodeName())
+            continue
+        }
+
+        // Properties added outside of the role are kept
+        def Node new_node = create_node(data)
+        new_node.getNodeProperties().replaceBy(node.getNodeProperties())
+
+        // Unchanged agents are kept as is, their computer is not disturbed
+        if (is_same_node(node, new_node)) {
+            changes['nodes'].add(node)
+        }
+        else {
+            changes['nodes'].add(new_node)
+            changes['updated'].add(node.getNodeName())
+        }
+    }
+
+    wanted.each { name, data ->
+        if (data['state'] != 'absent') {
+            changes['nodes'].add(create_node(data))
+            changes['added'].add(name)
+        }
+    }
+
+    return changes
+}
+
+
+/**
+    Get agents not managed by this script, cloud agents by example
+
+    @param Jenkins Jenkins instance
+    @return List<Node> Agents which are not permanent agents
+*/
+def List<Node> get_other_nodes(Jenkins jenkins_instance) {
+
+    return jenkins_instance.getNodes().findAll { !(it instanceof DumbSlave) }
+}
+
+
+/* SCRIPT */
+
+def Map changes = [added: [], updated: [], removed: []]
+
+try {
+    def Jenkins jenkins_instance = Jenkins.getInstance()
+
+    // Get arguments data
+    def Map data = parse_data(get_payload(args))
+
+    // Queue lock prevents clouds from adding or removing agents meanwhile
+    Queue.withLock({
+        def List<String> other_names = get_other_nodes(jenkins_instance)
+            .collect { it.getNodeName() }
+        def String conflict = data['nodes']*.name.find {
+            other_names.contains(it)
+        }
+
+        if (conflict != null) {
+            throw new Exception("Agent ${conflict} is not a permanent agent")
+        }
+
+        // Only permanent agents are compared, and removed if unmanaged
+        changes = build_nodes(
+            jenkins_instance.getNodes().findAll { it instanceof DumbSlave },
+            data['nodes'],
+            data['remove_unmanaged'])
+
+        // One call for all agents, instead of one save by added agent
+        if (changes['added'] || changes['updated'] || changes['removed']) {
+            jenkins_instance.setNodes(
+                changes['nodes'] + get_other_nodes(jenkins_instance))
+        }
+    } as Runnable)
+}
+catch(Exception e) {
+    throw new RuntimeException(e.getMessage())
+}
+
+// Build json result
+result = new JsonBuilder()
+result {
+    changed (changes['added'] || changes['updated'] || changes['removed'])
+    output {
+        added changes['added']
+        updated changes['updated']
+        removed changes['removed']
+    }
+}
+
+println result
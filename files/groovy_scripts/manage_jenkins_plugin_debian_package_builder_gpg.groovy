@@ -5,6 +5,9 @@ import hudson.model.*
 import jenkins.model.*
 
 
+{% include 'lib/change_tracker.groovy' %}
+
+
 /**
     Convert Json string to Groovy Object
 
@@ -24,6 +27,22 @@ def Map parse_data(String arg) {
 }
 
 
+/**
+    Get Json payload, read on standard input when argument is "-"
+
+    @param String[] Script arguments
+    @return String Json payload
+*/
+def String get_payload(String[] script_args) {
+
+    if (script_args[0] == '-') {
+        return stdin.getText('UTF-8')
+    }
+
+    return script_args[0]
+}
+
+
 /**
     Manage debian package builder gpg account name configuration
 
@@ -177,6 +196,7 @@ def Boolean manage_gpg_passphrase(Descriptor desc, Map data) {
 /* SCRIPT */
 
 def List<Boolean> has_changed = []
+def List<String> saved_files = []
 
 try {
     def Jenkins jenkins_instance = Jenkins.getInstance()
@@ -184,7 +204,7 @@ try {
         'ru.yandex.jenkins.plugins.debuilder.DebianPackageBuilder')
 
     // Get arguments data
-    def Map data = parse_data(args[0])
+    def Map data = parse_data(get_payload(args))
 
     // Manage new configuration
     has_changed.push(manage_gpg_account_name(desc, data))
@@ -193,9 +213,11 @@ try {
     has_changed.push(manage_gpg_private_key(desc, data))
     has_changed.push(manage_gpg_passphrase(desc, data))
 
-    // Save new configuration to disk
-    desc.save()
-    jenkins_instance.save()
+    // Save new configuration to disk, only if changed
+    if (has_changed.any()) {
+        mark_changed(desc)
+    }
+    saved_files = save_changed()
 }
 catch(Exception e) {
     throw new RuntimeException(e.getMessage())
@@ -208,6 +230,7 @@ result {
     output {
         changed has_changed
     }
+    saved saved_files
 }
 
 println result
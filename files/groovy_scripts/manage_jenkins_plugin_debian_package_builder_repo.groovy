@@ -6,6 +6,9 @@ import jenkins.model.*
 import ru.yandex.jenkins.plugins.debuilder.DebianPackageRepo
 
 
+{% include 'lib/change_tracker.groovy' %}
+
+
 /**
     Convert Json string to Groovy Object
 
@@ -25,6 +28,22 @@ def Map parse_data(String arg) {
 }
 
 
+/**
+    Get Json payload, read on standard input when argument is "-"
+
+    @param String[] Script arguments
+    @return String Json payload
+*/
+def String get_payload(String[] script_args) {
+
+    if (script_args[0] == '-') {
+        return stdin.getText('UTF-8')
+    }
+
+    return script_args[0]
+}
+
+
 /**
     Manage debian package builder repo method configuration
 
@@ -324,6 +343,7 @@ def Boolean manage_repository(Descriptor desc, Map data) {
 /* SCRIPT */
 
 def Boolean has_changed = false
+def List<String> saved_files = []
 
 try {
     def Jenkins jenkins_instance = Jenkins.getInstance()
@@ -331,14 +351,16 @@ try {
         'ru.yandex.jenkins.plugins.debuilder.DebianPackagePublisher')
 
     // Get arguments data
-    def Map data = parse_data(args[0])
+    def Map data = parse_data(get_payload(args))
 
     // Manage new configuration
     has_changed = manage_repository(desc, data)
 
-    // Save new configuration to disk
-    desc.save()
-    jenkins_instance.save()
+    // Save new configuration to disk, only if changed
+    if (has_changed) {
+        mark_changed(desc)
+    }
+    saved_files = save_changed()
 }
 catch(Exception e) {
     throw new RuntimeException(e.getMessage())
@@ -351,6 +373,7 @@ result {
     output {
         changed has_changed
     }
+    saved saved_files
 }
 
 println result
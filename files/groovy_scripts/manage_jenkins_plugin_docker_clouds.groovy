@@ -22,6 +22,9 @@ import jenkins.model.*
 import org.jenkinsci.plugins.docker.commons.credentials.DockerServerEndpoint
 
 
+{% include 'lib/change_tracker.groovy' %}
+
+
 /**
     Convert Json string to Groovy Object
 
@@ -41,6 +44,22 @@ def Map parse_data(String arg) {
 }
 
 
+/**
+    Get Json payload, read on standard input when argument is "-"
+
+    @param String[] Script arguments
+    @return String Json payload
+*/
+def String get_payload(String[] script_args) {
+
+    if (script_args[0] == '-') {
+        return stdin.getText('UTF-8')
+    }
+
+    return script_args[0]
+}
+
+
 /**
     Create new template base
 
@@ -73,6 +92,15 @@ def DockerTemplateBase create_template_base(Map data) {
                                 data['mac_address'],
                                 data['extra_hosts'].join(' '))
 
+        // CPU quota is only available with recent plugin versions
+        if (data['cpu_period'] || data['cpu_quota']) {
+            if (!template_base.metaClass.respondsTo(template_base, 'setCpuQuota')) {
+                throw new Exception('CPU quota needs a newer docker plugin')
+            }
+            template_base.setCpuPeriod(data['cpu_period'] as Long)
+            template_base.setCpuQuota(data['cpu_quota'] as Long)
+        }
+
         return template_base
     }
     catch(Exception e) {
@@ -84,17 +112,25 @@ def DockerTemplateBase create_template_base(Map data) {
 
 
 /**
-    Get docker pull strategy constant
+    Get docker pull strategy constant, from its name or an alias
 
-    @param String Needed configuration
-    @return DockerComputerLauncher New docker computer launcher
+    @param String Strategy name, or alias as never, if_missing or always
+    @return DockerImagePullStrategy Docker pull strategy
 */
 def DockerImagePullStrategy get_pull_strategy(String strategy_name) {
 
+    // "if_missing" also pulls images tagged "latest", pin tags to avoid it
+    def Map aliases = [
+        never: 'PULL_NEVER',
+        if_missing: 'PULL_LATEST',
+        always: 'PULL_ALWAYS',
+    ]
+
     try {
 
         def DockerImagePullStrategy pull_strategy
-        pull_strategy = Enum.valueOf(DockerImagePullStrategy, strategy_name)
+        pull_strategy = Enum.valueOf(DockerImagePullStrategy,
+                                     aliases.get(strategy_name, strategy_name))
 
         return pull_strategy
     }
@@ -241,6 +277,11 @@ def RetentionStrategy create_ret_strategy(Map data) {
                 ret_strategy = new DockerOnceRetentionStrategy(
                                                         data['idle_minutes'])
                 break
+            case 'cloud':
+                // Agents are kept, and reused, until idle for idle_minutes
+                ret_strategy = new CloudRetentionStrategy(
+                                                        data['idle_minutes'])
+                break
             default:
                 throw new Exception('Retention strategy type not managed')
         }
@@ -414,6 +455,10 @@ def Boolean are_same_template_bases(DockerTemplateBase base_a, DockerTemplateBas
         has_changed.push(base_a.getMemoryLimit() != base_b.getMemoryLimit())
         has_changed.push(base_a.getMemorySwap() != base_b.getMemorySwap())
         has_changed.push(base_a.getCpuShares() != base_b.getCpuShares())
+        if (base_a.metaClass.respondsTo(base_a, 'getCpuQuota')) {
+            has_changed.push(base_a.getCpuPeriod() != base_b.getCpuPeriod())
+            has_changed.push(base_a.getCpuQuota() != base_b.getCpuQuota())
+        }
         has_changed.push(base_a.getDockerCommandArray() != base_b.getDockerCommandArray())
         has_changed.push(base_a.getPortMappings() != base_b.getPortMappings())
         has_changed.push(base_a.getEnvironmentsString() != base_b.getEnvironmentsString())
@@ -429,6 +474,23 @@ def Boolean are_same_template_bases(DockerTemplateBase base_a, DockerTemplateBas
 }
 
 
+/**
+    Get idle minutes of a retention strategy
+
+    @param RetentionStrategy Retention strategy
+    @return Integer Idle minutes before agent removal
+*/
+def Integer get_idle_minutes(RetentionStrategy retention) {
+
+    // Core cloud retention strategy has no getter
+    if (retention instanceof CloudRetentionStrategy) {
+        return retention.@idleMinutes
+    }
+
+    return retention.getIdleMinutes()
+}
+
+
 /**
     Check if two docker cloud retention policies have same properties
 
@@ -443,7 +505,7 @@ def Boolean are_same_retention_policies(RetentionStrategy retention_a, Retention
             return false
         }
 
-        if (retention_a.getIdleMinutes() != retention_b.getIdleMinutes()) {
+        if (get_idle_minutes(retention_a) != get_idle_minutes(retention_b)) {
             return false
         }
 
@@ -483,7 +545,8 @@ def Boolean are_same_connectors(DockerComputerConnector connector_a,
             has_changed.push(connector_a.getSuffixStartSlaveCmd() != connector_b.getSuffixStartSlaveCmd())
             has_changed.push(connector_a.getLaunchTimeoutSeconds() != connector_b.getLaunchTimeoutSeconds())
         } else if (connectors_class == 'io.jenkins.docker.connector.DockerComputerJNLPConnector') {
-            has_changed.push(connector_a.getJnlpLauncher().equals(connector_b.getJnlpLauncher()))
+            has_changed.push(connector_a.getJnlpLauncher().tunnel != connector_b.getJnlpLauncher().tunnel)
+            has_changed.push(connector_a.getJnlpLauncher().vmargs != connector_b.getJnlpLauncher().vmargs)
             has_changed.push(connector_a.getUser() != connector_b.getUser())
         } else {
             throw new Exception('Docker connector class unmanaged')
@@ -556,10 +619,15 @@ def Boolean are_same_templates(List<DockerTemplate> templates_a, List<DockerTemp
 def Boolean is_same_cloud(DockerCloud cloud_a, DockerCloud cloud_b) {
 
     try {
-        docker_host_a = cloud_a.getDockerHost()
-        docker_host_b = cloud_a.getDockerHost()
+        def List<Boolean> has_changed = []
 
-        return docker_host_a.equals(docker_host_b)
+        has_changed.push(!cloud_a.getDockerHost().equals(cloud_b.getDockerHost()))
+        has_changed.push(cloud_a.getContainerCap() != cloud_b.getContainerCap())
+        has_changed.push(cloud_a.getDockerApi().getConnectTimeout() != cloud_b.getDockerApi().getConnectTimeout())
+        has_changed.push(cloud_a.getDockerApi().getReadTimeout() != cloud_b.getDockerApi().getReadTimeout())
+        has_changed.push(!are_same_templates(cloud_a.getTemplates(), cloud_b.getTemplates()))
+
+        return !has_changed.any()
     }
     catch(Exception e) {
         throw new Exception(
@@ -637,18 +705,22 @@ def Boolean manage_docker_cloud(Jenkins jenkins_instance, Map data) {
 /* SCRIPT */
 
 def Boolean has_changed = false
+def List<String> saved_files = []
 
 try {
     def Jenkins jenkins_instance = Jenkins.getInstance()
 
     // Get arguments data
-    def Map data = parse_data(args[0])
+    def Map data = parse_data(get_payload(args))
 
     // Manage new configuration
     has_changed = manage_docker_cloud(jenkins_instance, data)
 
-    // Save new configuration to disk
-    jenkins_instance.save()
+    // Save new configuration to disk, only if changed
+    if (has_changed) {
+        mark_changed(jenkins_instance)
+    }
+    saved_files = save_changed()
 }
 catch(Exception e) {
     throw new RuntimeException(e.getMessage())
@@ -661,6 +733,7 @@ result {
     output {
         changed has_changed
     }
+    saved saved_files
 }
 
 println result
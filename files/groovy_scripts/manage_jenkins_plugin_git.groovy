@@ -5,9 +5,13 @@ import jenkins.model.ProjectNamingStrategy
 import jenkins.model.ProjectNamingStrategy.PatternProjectNamingStrategy \
     as PatternProjectNaming
 import hudson.model.*
+import hudson.triggers.SCMTrigger
 import groovy.json.*
 
 
+{% include 'lib/change_tracker.groovy' %}
+
+
 /**
     Set the Git plugin global email address
 
@@ -89,12 +93,43 @@ def Boolean set_git_plugin_create_account(Descriptor desc, Boolean new_value) {
 }
 
 
+/**
+    Set the maximum number of concurrent SCM polling threads
+
+    @param SCMTrigger.DescriptorImpl SCM trigger descriptor
+    @param Integer New value, 0 for no limit, negative to keep current value
+    @return Boolean True if changed, else false
+*/
+def Boolean set_scm_polling_threads(SCMTrigger.DescriptorImpl desc,
+                                    Integer new_value) {
+
+    // Get current value, used to check if changed
+    def Integer cur_value = desc.getPollingThreadCount()
+    if ((new_value < 0) || (cur_value == new_value)) {
+        return false
+    }
+
+    try {
+        desc.setPollingThreadCount(new_value)
+        mark_changed(desc)
+    }
+    catch(Exception e) {
+        throw new Exception(
+            'An error occurs during SCM polling threads count change')
+    }
+
+    return true
+}
+
+
 /* SCRIPT */
 
 def List <Boolean> has_changed = []
+def List<String> saved_files = []
 def String new_email = ""
 def String new_full_name = ""
 def Boolean new_account_create = false
+def Integer new_polling_threads = -1
 
 try {
     def Jenkins jenkins_instance = Jenkins.getInstance()
@@ -105,14 +140,21 @@ try {
     new_full_name = args[0]
     new_email = args[1]
     new_account_create = args[2].toBoolean()
+    new_polling_threads = args[3].toInteger()
 
     // Manage configuration with user data
     has_changed.push(set_git_plugin_global_email(desc, new_email))
     has_changed.push(set_git_plugin_global_name(desc, new_full_name))
     has_changed.push(set_git_plugin_create_account(desc, new_account_create))
+    if (has_changed.any()) {
+        mark_changed(desc)
+    }
+    has_changed.push(set_scm_polling_threads(
+        jenkins_instance.getDescriptorByType(SCMTrigger.DescriptorImpl.class),
+        new_polling_threads))
 
-    // Save new configuration to disk
-    desc.save()
+    // Save new configuration to disk, only if changed
+    saved_files = save_changed()
 }
 catch(Exception e) {
     throw new RuntimeException(e.getMessage())
@@ -127,7 +169,9 @@ result {
         email new_email
         full_name new_full_name
         account_create new_account_create
+        polling_threads new_polling_threads
     }
+    saved saved_files
 }
 
 println result
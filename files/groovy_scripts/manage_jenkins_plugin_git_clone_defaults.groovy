@@ -0,0 +1,171 @@
+#!/usr/bin/env groovy
+
+import jenkins.model.*
+import hudson.EnvVars
+import hudson.plugins.git.GitTool
+import hudson.slaves.EnvironmentVariablesNodeProperty
+import hudson.slaves.NodeProperty
+import hudson.util.DescribableList
+import groovy.json.*
+
+
+{% include 'lib/change_tracker.groovy' %}
+
+
+/**
+    Convert Json string to Groovy Object
+
+    @param String arg Json string to parse
+    @return Map Groovy object used to get data
+*/
+def Map parse_data(String arg) {
+
+    try {
+        def JsonSlurper jsonSlurper = new JsonSlurper()
+        return jsonSlurper.parseText(arg)
+    }
+    catch(Exception e) {
+        throw new Exception("Parse data error, incoming data : ${arg}, "
+                            + "error message : ${e.getMessage()}")
+    }
+}
+
+
+/**
+    Get Json payload, read on standard input when argument is "-"
+
+    @param String[] Script arguments
+    @return String Json payload
+*/
+def String get_payload(String[] script_args) {
+
+    if (script_args[0] == '-') {
+        return stdin.getText('UTF-8')
+    }
+
+    return script_args[0]
+}
+
+
+/**
+    Manage a git tool installation, other installations are kept
+
+    @param GitTool.DescriptorImpl Git tool descriptor
+    @param String Installation name
+    @param String Git executable path
+    @return Boolean True if changed, else false
+*/
+def Boolean manage_git_tool(GitTool.DescriptorImpl desc,
+                            String name,
+                            String home) {
+
+    try {
+        def List<GitTool> tools = desc.getInstallations() as List
+        def GitTool current = tools.find { it.getName() == name }
+
+        if ((current != null) && (current.getHome() == home)) {
+            return false
+        }
+
+        tools.remove(current)
+        tools.add(new GitTool(name, home, []))
+        desc.setInstallations(tools as GitTool[])
+        mark_changed(desc)
+
+        return true
+    }
+    catch(Exception e) {
+        throw new Exception(
+            "Git tool management error, error message : ${e.getMessage()}")
+    }
+}
+
+
+/**
+    Manage global environment variables, other variables are kept
+
+    @param Jenkins Jenkins instance
+    @param Map Variables values by name, empty value to remove a variable
+    @return Boolean True if changed, else false
+*/
+def Boolean manage_global_environment(Jenkins jenkins_instance,
+                                      Map variables) {
+
+    try {
+        def DescribableList<NodeProperty<?>, ?> properties
+        properties = jenkins_instance.getGlobalNodeProperties()
+
+        def EnvironmentVariablesNodeProperty property = properties.get(
+            EnvironmentVariablesNodeProperty.class)
+        if (property == null) {
+            property = new EnvironmentVariablesNodeProperty()
+            properties.add(property)
+        }
+
+        def EnvVars env_vars = property.getEnvVars()
+        def Boolean has_changed = false
+
+        variables.each { String name, value ->
+            def String new_value = (value != null) ? value.toString() : ''
+
+            if (new_value == '') {
+                has_changed |= env_vars.containsKey(name)
+                env_vars.remove(name)
+            }
+            else if (env_vars.get(name) != new_value) {
+                env_vars.put(name, new_value)
+                has_changed = true
+            }
+        }
+
+        if (has_changed) {
+            mark_changed(jenkins_instance)
+        }
+
+        return has_changed
+    }
+    catch(Exception e) {
+        throw new Exception(
+            "Global environment error, error message : ${e.getMessage()}")
+    }
+}
+
+
+/* SCRIPT */
+
+def List<Boolean> has_changed = []
+def List<String> saved_files = []
+
+try {
+    def Jenkins jenkins_instance = Jenkins.getInstance()
+    def Map data = parse_data(get_payload(args))
+
+    has_changed.push(manage_git_tool(
+        jenkins_instance.getDescriptorByType(GitTool.DescriptorImpl.class),
+        data['tool_name'], data['tool_home']))
+
+    // Jobs read reference path from this variable, as git plugin has no
+    // global clone options. Clone option reference expands variables, depth
+    // and timeout do not, so they are not given
+    has_changed.push(manage_global_environment(jenkins_instance, [
+        GIT_REFERENCE_PATH: data['reference_path'],
+    ]))
+
+    // Save changed configurations to disk
+    saved_files = save_changed()
+}
+catch(Exception e) {
+    throw new RuntimeException(e.getMessage())
+}
+
+// Build json result
+result = new JsonBuilder()
+result {
+    changed has_changed.any()
+    output {
+        changed has_changed
+    }
+    saved saved_files
+}
+
+println result
@@ -7,6 +7,9 @@ import org.jenkinsci.plugins.github.config.GitHubServerConfig
 import org.jenkinsci.plugins.github.GitHubPlugin
 
 
+{% include 'lib/change_tracker.groovy' %}
+
+
 /**
     Convert Json string to Groovy Object
 
@@ -26,6 +29,22 @@ def Object parse_data(String arg) {
 }
 
 
+/**
+    Get Json payload, read on standard input when argument is "-"
+
+    @param String[] Script arguments
+    @return String Json payload
+*/
+def String get_payload(String[] script_args) {
+
+    if (script_args[0] == '-') {
+        return stdin.getText('UTF-8')
+    }
+
+    return script_args[0]
+}
+
+
 /**
     Get github config by url and credetials
 
@@ -191,9 +210,92 @@ def Boolean manage_github_config(Descriptor desc, Map data) {
 }
 
 
+/**
+    Manage url given to GitHub when registering hooks
+
+    @param Descriptor Github plugin descriptor
+    @param String Hook url, empty to use the one built from Jenkins url
+    @return Boolean True if hook url changed, else false
+*/
+def Boolean manage_github_hook_url(Descriptor desc, String hook_url) {
+
+    try {
+        if (!hook_url) {
+            if (!desc.isOverrideHookUrl()) {
+                return false
+            }
+            desc.setHookUrl(null)
+            return true
+        }
+
+        if (desc.isOverrideHookUrl()
+                && (desc.getHookUrl().toString() == hook_url)) {
+            return false
+        }
+
+        // Older plugin versions only accept an URL object
+        if (desc.metaClass.respondsTo(desc, 'setHookUrl', String)) {
+            desc.setHookUrl(hook_url)
+        }
+        else {
+            desc.setHookUrl(new URL(hook_url))
+        }
+
+        return true
+    }
+    catch(Exception e) {
+        throw new Exception(
+            'Manage github hook url error, error message : '
+            + e.getMessage())
+    }
+}
+
+
+/**
+    Manage GitHub API rate limit checking strategy, from GitHub branch source
+    plugin configuration
+
+    @param Jenkins Jenkins instance
+    @param String Strategy name, as ThrottleOnOver
+    @return Boolean True if strategy changed, else false
+*/
+def Boolean manage_github_rate_limit_checker(Jenkins jenkins_instance,
+                                             String name) {
+
+    try {
+        // Branch source plugin is optional, so its classes are not imported
+        def Class config_class = Class.forName(
+            'org.jenkinsci.plugins.github_branch_source.GitHubConfiguration',
+            true, jenkins_instance.getPluginManager().uberClassLoader)
+        def config = GlobalConfiguration.all().get(config_class)
+        def Enum current = config.getApiRateLimitChecker()
+
+        if (current.name() == name) {
+            return false
+        }
+
+        config.setApiRateLimitChecker(
+            Enum.valueOf(current.getDeclaringClass(), name))
+        mark_changed(config)
+
+        return true
+    }
+    catch(ClassNotFoundException e) {
+        throw new Exception(
+            'API rate limit checker needs github-branch-source plugin')
+    }
+    catch(Exception e) {
+        throw new Exception(
+            'Manage github API rate limit checker error, error message : '
+            + e.getMessage())
+    }
+}
+
+
 /* SCRIPT */
 
-def Boolean has_changed = false
+def List<Boolean> has_changed = []
+def List<String> saved_files = []
 
 try {
     def Jenkins jenkins_instance = Jenkins.getInstance()
@@ -201,14 +303,27 @@ try {
     desc = jenkins_instance.getDescriptor('github-plugin-configuration')
 
     // Get arguments data
-    def Object data = parse_data(args[0])
+    def Object data = parse_data(get_payload(args))
+
+    // Manage new configuration, global settings can be given alone
+    if (data['credentials_id'] != '') {
+        has_changed.push(manage_github_config(desc, data))
+    }
 
-    // Manage new configuration
-    has_changed = manage_github_config(desc, data)
+    // Hook url is global, not linked to a server
+    if (data['hook_url'] != null) {
+        has_changed.push(manage_github_hook_url(desc, data['hook_url']))
+    }
+    if (has_changed.any()) {
+        mark_changed(desc)
+    }
+    if (data['api_rate_limit_checker'] != null) {
+        has_changed.push(manage_github_rate_limit_checker(
+            jenkins_instance, data['api_rate_limit_checker']))
+    }
 
-    // Save new configuration to disk
-    desc.save()
-    jenkins_instance.save()
+    // Save new configuration to disk, only if changed
+    saved_files = save_changed()
 }
 catch(Exception e) {
     throw new RuntimeException(e.getMessage())
@@ -221,6 +336,7 @@ result {
     output {
         changed has_changed
     }
+    saved saved_files
 }
 
 println result
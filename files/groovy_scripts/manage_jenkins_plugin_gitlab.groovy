@@ -7,6 +7,9 @@ import com.dabsquared.gitlabjenkins.connection.GitLabConnection
 import com.dabsquared.gitlabjenkins.connection.GitLabConnectionConfig
 
 
+{% include 'lib/change_tracker.groovy' %}
+
+
 /**
     Convert Json string to Groovy Object
 
@@ -26,6 +29,22 @@ def Map parse_data(String arg) {
 }
 
 
+/**
+    Get Json payload, read on standard input when argument is "-"
+
+    @param String[] Script arguments
+    @return String Json payload
+*/
+def String get_payload(String[] script_args) {
+
+    if (script_args[0] == '-') {
+        return stdin.getText('UTF-8')
+    }
+
+    return script_args[0]
+}
+
+
 /**
     Check if two Gitlab configuration objects have the same properties
 
@@ -65,8 +84,6 @@ def Boolean is_same_connection(GitLabConnection old_connection, GitLabConnection
 */
 def Boolean manage_gitlab(Jenkins jenkins_instance, Map data) {
     try {
-        def desc = jenkins_instance.getDescriptor(
-            'com.dabsquared.gitlabjenkins.GitLabPushTrigger')
         // Manage new empty connections list
         def List<GitLabConnection> new_connections = new ArrayList<>()
 
@@ -108,9 +125,8 @@ def Boolean manage_gitlab(Jenkins jenkins_instance, Map data) {
             gitLabConfig.getConnections().add(connection)
         }
 
-        // Save new configuration to disk
-        gitLabConfig.save()
-        desc.save()
+        // Connections are the only changed configuration
+        mark_changed(gitLabConfig)
 
         return true
     }
@@ -121,23 +137,58 @@ def Boolean manage_gitlab(Jenkins jenkins_instance, Map data) {
 }
 
 
+/**
+    Manage authentication of GitLab hooks endpoint
+
+    @param Jenkins Jenkins instance
+    @param Boolean True to ask authentication on "/project" endpoint
+    @return Boolean True if configuration changed, else false
+*/
+def Boolean manage_gitlab_authenticated_endpoint(Jenkins jenkins_instance,
+                                                 Boolean enabled) {
+    try {
+        GitLabConnectionConfig gitLabConfig = (GitLabConnectionConfig) jenkins_instance.getDescriptor(GitLabConnectionConfig.class)
+
+        if (gitLabConfig.isUseAuthenticatedEndpoint() == enabled) {
+            return false
+        }
+
+        gitLabConfig.setUseAuthenticatedEndpoint(enabled)
+        mark_changed(gitLabConfig)
+
+        return true
+    }
+    catch(Exception e) {
+        throw new Exception(
+            'Gitlab endpoint management error, error message : ' + e.getMessage())
+    }
+}
+
+
 /* SCRIPT */
 
-def Boolean has_changed = false
+def List<Boolean> has_changed = []
+def List<String> saved_files = []
 
 try {
     def Jenkins jenkins_instance = Jenkins.getInstance()
 
     // Get arguments data
-    def Map data = parse_data(args[0])
+    def Map data = parse_data(get_payload(args))
 
-    // Manage new configuration
-    has_changed = manage_gitlab(jenkins_instance, data)
+    // Manage new configuration, global settings can be given alone
+    if (data['name'] != '') {
+        has_changed.push(manage_gitlab(jenkins_instance, data))
+    }
 
-    // Save new configuration to disk
-    if (has_changed) {
-        jenkins_instance.save()
+    // Hooks endpoint authentication is global, not linked to a connection
+    if (data['use_authenticated_endpoint'] != null) {
+        has_changed.push(manage_gitlab_authenticated_endpoint(
+            jenkins_instance, data['use_authenticated_endpoint']))
     }
+
+    // Save new configuration to disk, only if changed
+    saved_files = save_changed()
 }
 catch(Exception e) {
     throw new RuntimeException(e.getMessage())
@@ -150,6 +201,7 @@ result {
     output {
         changed has_changed
     }
+    saved saved_files
 }
 
 println result
@@ -5,6 +5,9 @@ import hudson.model.*
 import jenkins.model.*
 
 
+{% include 'lib/change_tracker.groovy' %}
+
+
 /**
     Convert Json string to Groovy Object
 
@@ -24,6 +27,22 @@ def Map parse_data(String arg) {
 }
 
 
+/**
+    Get Json payload, read on standard input when argument is "-"
+
+    @param String[] Script arguments
+    @return String Json payload
+*/
+def String get_payload(String[] script_args) {
+
+    if (script_args[0] == '-') {
+        return stdin.getText('UTF-8')
+    }
+
+    return script_args[0]
+}
+
+
 /**
     Manage hipchat server configuration
 
@@ -206,6 +225,7 @@ def Boolean manage_send_as(Descriptor desc, Map data) {
 /* SCRIPT */
 
 def List<Boolean> has_changed = []
+def List<String> saved_files = []
 
 try {
     def Jenkins jenkins_instance = Jenkins.getInstance()
@@ -213,7 +233,7 @@ try {
         'jenkins.plugins.hipchat.HipChatNotifier')
 
     // Get arguments data
-    def Map data = parse_data(args[0])
+    def Map data = parse_data(get_payload(args))
 
     // Manage new configuration
     has_changed.push(manage_server(desc, data))
@@ -223,9 +243,11 @@ try {
     has_changed.push(manage_room(desc, data))
     has_changed.push(manage_send_as(desc, data))
 
-    // Save new configuration to disk
-    desc.save()
-    jenkins_instance.save()
+    // Save new configuration to disk, only if changed
+    if (has_changed.any()) {
+        mark_changed(desc)
+    }
+    saved_files = save_changed()
 }
 catch(Exception e) {
     throw new RuntimeException(e.getMessage())
@@ -238,6 +260,7 @@ result {
     output {
         changed has_changed
     }
+    saved saved_files
 }
 
 println result
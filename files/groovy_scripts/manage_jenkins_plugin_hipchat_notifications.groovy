@@ -8,6 +8,9 @@ import jenkins.plugins.hipchat.model.NotificationConfig
 import jenkins.plugins.hipchat.model.NotificationType
 
 
+{% include 'lib/change_tracker.groovy' %}
+
+
 /**
     Convert Json string to Groovy Object
 
@@ -27,6 +30,22 @@ def Map parse_data(String arg) {
 }
 
 
+/**
+    Get Json payload, read on standard input when argument is "-"
+
+    @param String[] Script arguments
+    @return String Json payload
+*/
+def String get_payload(String[] script_args) {
+
+    if (script_args[0] == '-') {
+        return stdin.getText('UTF-8')
+    }
+
+    return script_args[0]
+}
+
+
 /**
     Create new hipchat notification configuration
 
@@ -282,6 +301,7 @@ def Boolean manage_notifications(Descriptor desc, Map data) {
 /* SCRIPT */
 
 def Boolean has_changed = false
+def List<String> saved_files = []
 
 try {
     def Jenkins jenkins_instance = Jenkins.getInstance()
@@ -289,14 +309,16 @@ try {
         'jenkins.plugins.hipchat.HipChatNotifier')
 
     // Get arguments data
-    def Map data = parse_data(args[0])
+    def Map data = parse_data(get_payload(args))
 
     // Manage new configuration
     has_changed = manage_notifications(desc, data)
 
-    // Save new configuration to disk
-    desc.save()
-    jenkins_instance.save()
+    // Save new configuration to disk, only if changed
+    if (has_changed) {
+        mark_changed(desc)
+    }
+    saved_files = save_changed()
 }
 catch(Exception e) {
     throw new RuntimeException(e.getMessage())
@@ -309,6 +331,7 @@ result {
     output {
         changed has_changed
     }
+    saved saved_files
 }
 
 println result
@@ -9,6 +9,9 @@ import hudson.util.Secret
 import groovy.json.*
 
 
+{% include 'lib/change_tracker.groovy' %}
+
+
 /**
     Convert Json string to Groovy Object
 
@@ -28,6 +31,22 @@ def Object parse_data(String arg) {
 }
 
 
+/**
+    Get Json payload, read on standard input when argument is "-"
+
+    @param String[] Script arguments
+    @return String Json payload
+*/
+def String get_payload(String[] script_args) {
+
+    if (script_args[0] == '-') {
+        return stdin.getText('UTF-8')
+    }
+
+    return script_args[0]
+}
+
+
 /**
     Check if one string is empty or null
 
@@ -273,6 +292,7 @@ def Boolean set_mailer_plugin_use_ssl(Descriptor desc, Boolean new_use_ssl) {
 /* SCRIPT */
 
 def List <Boolean> has_changed = []
+def List<String> saved_files = []
 def String new_charset = ""
 def String new_default_suffix = ""
 def String new_reply_to = ""
@@ -288,7 +308,7 @@ try {
     desc = jenkins_instance.getDescriptor('hudson.tasks.Mailer')
 
     // Get user data
-    data = parse_data(args[0])
+    data = parse_data(get_payload(args))
 
     // Get arguments data
     new_charset = data['charset']
@@ -311,8 +331,11 @@ try {
     has_changed.push(set_mailer_plugin_use_ssl(desc, new_use_ssl))
     has_changed.push(set_mailer_plugin_charset(desc, new_charset))
 
-    // Save new configuration to disk
-    desc.save()
+    // Save new configuration to disk, only if changed
+    if (has_changed.any()) {
+        mark_changed(desc)
+    }
+    saved_files = save_changed()
 }
 catch(Exception e) {
     throw new RuntimeException(e.getMessage())
@@ -332,6 +355,7 @@ result {
         smtp_user new_smtp_user
         use_ssl new_use_ssl
     }
+    saved saved_files
 }
 
 println result
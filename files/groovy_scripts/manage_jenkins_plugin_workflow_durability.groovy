@@ -0,0 +1,244 @@
+#!/usr/bin/env groovy
+
+import jenkins.model.*
+import hudson.BulkChange
+import hudson.model.ItemGroup
+import groovy.json.*
+import org.jenkinsci.plugins.workflow.flow.FlowDurabilityHint
+import org.jenkinsci.plugins.workflow.flow.GlobalDefaultFlowDurabilityLevel
+import org.jenkinsci.plugins.workflow.job.WorkflowJob
+import org.jenkinsci.plugins.workflow.job.properties.DurabilityHintJobProperty
+
+
+{% include 'lib/change_tracker.groovy' %}
+
+
+/**
+    Convert Json string to Groovy Object
+
+    @param String arg Json string to parse
+    @return Map Groovy object used to get data
+*/
+def Map parse_data(String arg) {
+
+    try {
+        def JsonSlurper jsonSlurper = new JsonSlurper()
+        return jsonSlurper.parseText(arg)
+    }
+    catch(Exception e) {
+        throw new Exception("Parse data error, incoming data : ${arg}, "
+                            + "error message : ${e.getMessage()}")
+    }
+}
+
+
+/**
+    Get Json payload, read on standard input when argument is "-"
+
+    @param String[] Script arguments
+    @return String Json payload
+*/
+def String get_payload(String[] script_args) {
+
+    if (script_args[0] == '-') {
+        return stdin.getText('UTF-8')
+    }
+
+    return script_args[0]
+}
+
+
+/**
+    Get durability hint from its name
+
+    @param String Hint name, as PERFORMANCE_OPTIMIZED
+    @return FlowDurabilityHint Durability hint, null if name is empty
+*/
+def FlowDurabilityHint get_hint(String name) {
+
+    if (!name) {
+        return null
+    }
+
+    try {
+        return FlowDurabilityHint.valueOf(name.toUpperCase())
+    }
+    catch(IllegalArgumentException e) {
+        throw new Exception("Unknown durability hint : ${name}, "
+                            + "should be one of ${FlowDurabilityHint.values()}")
+    }
+}
+
+
+/**
+    Manage global durability hint
+
+    @param GlobalDefaultFlowDurabilityLevel.DescriptorImpl Global descriptor
+    @param FlowDurabilityHint Wanted hint, null to keep current one
+    @return Map Hint before and after, null if not changed
+*/
+def Map manage_global_hint(GlobalDefaultFlowDurabilityLevel.DescriptorImpl desc,
+                           FlowDurabilityHint hint) {
+
+    try {
+        def FlowDurabilityHint current = desc.getDurabilityHint()
+
+        if ((hint == null) || (hint == current)) {
+            return null
+        }
+
+        desc.setDurabilityHint(hint)
+        mark_changed(desc)
+
+        return [before: current?.name(), after: hint.name()]
+    }
+    catch(Exception e) {
+        throw new Exception(
+            "Global durability hint error, error message : ${e.getMessage()}")
+    }
+}
+
+
+/**
+    Check if a job is managed by a multibranch project, its properties are
+    then rebuilt from branch sources on each indexing
+
+    @param WorkflowJob Pipeline job
+    @return Boolean True if job is a branch job
+*/
+def Boolean is_branch_job(WorkflowJob job) {
+
+    def ItemGroup parent = job.getParent()
+
+    return parent.metaClass.respondsTo(parent, 'getSCMSources') as Boolean
+}
+
+
+/**
+    Get durability hint to apply on a job, from the most specific folder
+
+    @param WorkflowJob Pipeline job
+    @param List Folders overrides, with "folder" full name, "hint" and "state"
+    @return Map Folder override, null if job is not in an overridden folder
+*/
+def Map get_job_override(WorkflowJob job, List folders) {
+
+    return folders.findAll {
+        job.getFullName().startsWith(it['folder'] + '/')
+    }.max { it['folder'].length() }
+}
+
+
+/**
+    Set durability hint of a pipeline job
+
+    @param WorkflowJob Pipeline job
+    @param FlowDurabilityHint Wanted hint, null to remove job hint
+    @return Map Hint before and after, null if not changed
+*/
+def Map manage_job_hint(WorkflowJob job, FlowDurabilityHint hint) {
+
+    try {
+        def DurabilityHintJobProperty property = job.getProperty(
+            DurabilityHintJobProperty.class)
+
+        if (property?.getHint() == hint) {
+            return null
+        }
+
+        // Job properties changes save the job, defer it to the script end
+        def BulkChange bulk_change = new BulkChange(job)
+        try {
+            if (property != null) {
+                job.removeProperty(DurabilityHintJobProperty.class)
+            }
+            if (hint != null) {
+                job.addProperty(new DurabilityHintJobProperty(hint))
+            }
+        }
+        finally {
+            bulk_change.abort()
+        }
+        mark_changed(job)
+
+        return [
+            name: job.getFullName(),
+            before: property?.getHint()?.name(),
+            after: hint?.name(),
+        ]
+    }
+    catch(Exception e) {
+        throw new Exception(
+            "Durability hint error on ${job.getFullName()}, "
+            + "error message : ${e.getMessage()}")
+    }
+}
+
+
+/* SCRIPT */
+
+def Map global_diff = null
+def List jobs_diff = []
+def List overrides = []
+def String global_hint = null
+def List<String> saved_files = []
+
+try {
+    def Jenkins jenkins_instance = Jenkins.getInstance()
+    def Map data = parse_data(get_payload(args))
+    def GlobalDefaultFlowDurabilityLevel.DescriptorImpl desc
+    desc = jenkins_instance.getDescriptorByType(
+        GlobalDefaultFlowDurabilityLevel.DescriptorImpl.class)
+
+    global_diff = manage_global_hint(desc, get_hint(data['hint']))
+    global_hint = GlobalDefaultFlowDurabilityLevel.getDefaultDurabilityHint().name()
+
+    jenkins_instance.getAllItems(WorkflowJob.class).each { WorkflowJob job ->
+
+        def Map override = get_job_override(job, data['folders'])
+        if ((override != null) && !is_branch_job(job)) {
+            // Absent folders get back the global hint
+            def FlowDurabilityHint hint = (override['state'] == 'absent') ?
+                null : get_hint(override['hint'])
+            def Map job_diff = manage_job_hint(job, hint)
+            if (job_diff != null) {
+                jobs_diff.add(job_diff)
+            }
+        }
+
+        // Report every job not running with the global hint
+        def DurabilityHintJobProperty property = job.getProperty(
+            DurabilityHintJobProperty.class)
+        if ((property != null) && (property.getHint().name() != global_hint)) {
+            overrides.add([
+                name: job.getFullName(),
+                hint: property.getHint().name(),
+                folder: override?.getAt('folder'),
+                branch: is_branch_job(job),
+            ])
+        }
+    }
+
+    // Save changed configurations to disk
+    saved_files = save_changed()
+}
+catch(Exception e) {
+    throw new RuntimeException(e.getMessage())
+}
+
+// Build json result
+result = new JsonBuilder()
+result {
+    changed ((global_diff != null) || (jobs_diff.size() > 0))
+    output {
+        hint global_hint
+        diff {
+            global global_diff
+            jobs jobs_diff
+        }
+        jobs_overriding overrides
+    }
+    saved saved_files
+}
+
+println result
@@ -6,11 +6,15 @@ import jenkins.scm.api.SCMSource
 import hudson.model.*
 import groovy.json.*
 import org.jenkinsci.plugins.workflow.libs.GlobalLibraries
+import org.jenkinsci.plugins.workflow.libs.LibraryCachingConfiguration
 import org.jenkinsci.plugins.workflow.libs.LibraryConfiguration
 import org.jenkinsci.plugins.workflow.libs.LibraryRetriever
 import org.jenkinsci.plugins.workflow.libs.SCMSourceRetriever
 
 
+{% include 'lib/change_tracker.groovy' %}
+
+
 /**
     Convert Json string to Groovy Object
 
@@ -30,6 +34,22 @@ def Object parse_data(String arg) {
 }
 
 
+/**
+    Get Json payload, read on standard input when argument is "-"
+
+    @param String[] Script arguments
+    @return String Json payload
+*/
+def String get_payload(String[] script_args) {
+
+    if (script_args[0] == '-') {
+        return stdin.getText('UTF-8')
+    }
+
+    return script_args[0]
+}
+
+
 /**
     Check if two scm have save properties
 
@@ -140,6 +160,89 @@ def LibraryRetriever manage_retriever(Map data) {
 }
 
 
+/**
+    Check if two library caching configurations have same properties
+
+    @param LibraryCachingConfiguration First caching configuration
+    @param LibraryCachingConfiguration Second caching configuration
+    @return Boolean True if caching configurations are same, else false
+*/
+def Boolean are_same_caching_configurations(LibraryCachingConfiguration caching_a,
+                                            LibraryCachingConfiguration caching_b) {
+
+    try {
+        if ((caching_a == null) || (caching_b == null)) {
+            return (caching_a == caching_b)
+        }
+
+        def List<Boolean> checks = []
+
+        checks.add(caching_a.getRefreshTimeMinutes() == caching_b.getRefreshTimeMinutes())
+        checks.add(caching_a.getExcludedVersionsStr() == caching_b.getExcludedVersionsStr())
+
+        return checks.every()
+    }
+    catch(e) {
+        throw new Exception(
+            "Caching configurations compare error, error message : ${e.getMessage()}")
+    }
+}
+
+
+/**
+    Manage library caching configuration
+
+    @param Map Needed configuration
+    @return LibraryCachingConfiguration Caching configuration, null if disabled
+*/
+def LibraryCachingConfiguration manage_caching(Map data) {
+
+    try {
+
+        if (!data.get('caching')) {
+            return null
+        }
+
+        return new LibraryCachingConfiguration(
+            data['caching'].get('refresh_time_minutes', 0) as Integer,
+            data['caching'].get('excluded_versions', []).join(' '))
+    }
+    catch(Exception e) {
+        throw new Exception(
+            "Caching management error, error message : ${e.getMessage()}")
+    }
+}
+
+
+/**
+    Clear cached versions of a shared library
+
+    @param String Library name
+    @return Boolean True when cache cleared
+*/
+def Boolean clear_library_cache(String name) {
+
+    try {
+        def Descriptor desc = Jenkins.getInstance().getDescriptorByType(
+            LibraryCachingConfiguration.DescriptorImpl.class)
+
+        // Recent plugin versions can also clear a cache in use
+        if (desc.metaClass.respondsTo(desc, 'doClearCache', String, boolean)) {
+            desc.doClearCache(name, false)
+        }
+        else {
+            desc.doClearCache(name)
+        }
+
+        return true
+    }
+    catch(e) {
+        throw new Exception(
+            "Library cache clear error, error message : ${e.getMessage()}")
+    }
+}
+
+
 /**
     Check if two shared libraries have save properties
 
@@ -157,6 +260,8 @@ def Boolean are_same_shared_libraries(LibraryConfiguration library_a, LibraryCon
         checks.add(library_a.isAllowVersionOverride() == library_b.isAllowVersionOverride())
         checks.add(library_a.getIncludeInChangesets() == library_b.getIncludeInChangesets())
         checks.add(are_same_retrievers(library_a.getRetriever(), library_b.getRetriever()))
+        checks.add(are_same_caching_configurations(
+            library_a.getCachingConfiguration(), library_b.getCachingConfiguration()))
 
         return checks.every()
     }
@@ -184,6 +289,7 @@ def LibraryConfiguration create_shared_library(Map data) {
         library.setImplicit(data.get('implicit', false))
         library.setAllowVersionOverride(data.get('allow_version_override', true))
         library.setIncludeInChangesets(data.get('include_in_changesets', true))
+        library.setCachingConfiguration(manage_caching(data))
 
         return library
     }
@@ -315,18 +421,27 @@ def Boolean manage_shared_library(Descriptor desc, Map data) {
 
 /* SCRIPT */
 def Boolean has_changed = false
+def List<String> saved_files = []
 try {
     def Jenkins jenkins_instance = Jenkins.getInstance()
     def Descriptor desc
     desc = jenkins_instance.getDescriptor(GlobalLibraries.class)
-    data = parse_data(args[0])
+    data = parse_data(get_payload(args))
 
     // Manage configuration with user data
     has_changed = manage_shared_library(desc, data)
 
-    // Save new configuration to disk
-    desc.save()
-    jenkins_instance.save()
+    // Save new configuration to disk, only if changed
+    if (has_changed) {
+        mark_changed(desc)
+    }
+
+    // Cache is not part of configuration, nothing to save
+    if (data['clear_cache'] && (data['state'] == 'present')) {
+        has_changed |= clear_library_cache(data['name'])
+    }
+
+    saved_files = save_changed()
 }
 catch(Exception e) {
     throw new RuntimeException(e.getMessage())
@@ -337,6 +452,7 @@ result = new JsonBuilder()
 result {
     changed has_changed
     output has_changed
+    saved saved_files
 }
 
 println result
@@ -0,0 +1,149 @@
+#!/usr/bin/env groovy
+
+import jenkins.model.*
+import hudson.BulkChange
+import hudson.model.DownloadService
+import hudson.model.UpdateCenter
+import hudson.model.UpdateSite
+import hudson.util.FormValidation
+import groovy.json.*
+
+
+{% include 'lib/change_tracker.groovy' %}
+
+
+/**
+    Convert Json string to Groovy Object
+
+    @param String arg Json string to parse
+    @return Map Groovy object used to get data
+*/
+def Map parse_data(String arg) {
+
+    try {
+        def JsonSlurper jsonSlurper = new JsonSlurper()
+        return jsonSlurper.parseText(arg)
+    }
+    catch(Exception e) {
+        throw new Exception("Parse data error, incoming data : ${arg}, "
+                            + "error message : ${e.getMessage()}")
+    }
+}
+
+
+/**
+    Get Json payload, read on standard input when argument is "-"
+
+    @param String[] Script arguments
+    @return String Json payload
+*/
+def String get_payload(String[] script_args) {
+
+    if (script_args[0] == '-') {
+        return stdin.getText('UTF-8')
+    }
+
+    return script_args[0]
+}
+
+
+/**
+    Point an update site to a new url, the site is replaced as its url can
+    not be changed
+
+    @param UpdateCenter Jenkins update center
+    @param String Update site id
+    @param String Update site url
+    @return Boolean True if changed, else false
+*/
+def Boolean manage_update_site(UpdateCenter jenkins_uc,
+                               String id,
+                               String url) {
+
+    try {
+        def UpdateSite current = jenkins_uc.getById(id)
+
+        if ((current != null) && (current.getUrl() == url)) {
+            return false
+        }
+
+        // Sites list saves the update center on each change, defer it
+        def BulkChange bulk_change = new BulkChange(jenkins_uc)
+        try {
+            if (current != null) {
+                jenkins_uc.getSites().remove(current)
+            }
+            jenkins_uc.getSites().add(new UpdateSite(id, url))
+        }
+        finally {
+            bulk_change.abort()
+        }
+        mark_changed(jenkins_uc)
+
+        return true
+    }
+    catch(Exception e) {
+        throw new Exception(
+            "Update site management error, error message : ${e.getMessage()}")
+    }
+}
+
+
+/**
+    Download update site data now, instead of waiting for next daily check
+
+    @param UpdateSite Update site
+*/
+def void refresh_update_site(UpdateSite site) {
+
+    def FormValidation result = site.updateDirectlyNow(
+        DownloadService.signatureCheck)
+
+    if (result.kind == FormValidation.Kind.ERROR) {
+        throw new Exception(
+            "Update site ${site.getId()} refresh error : ${result.getMessage()}")
+    }
+}
+
+
+/* SCRIPT */
+
+def Boolean has_changed = false
+def List<String> saved_files = []
+def Map site_report = [:]
+
+try {
+    def Jenkins jenkins_instance = Jenkins.getInstance()
+    def UpdateCenter jenkins_uc = jenkins_instance.getUpdateCenter()
+    def Map data = parse_data(get_payload(args))
+
+    has_changed = manage_update_site(jenkins_uc, data['id'], data['site_url'])
+
+    // Save new configuration to disk, only if changed
+    saved_files = save_changed()
+
+    def UpdateSite site = jenkins_uc.getById(data['id'])
+    if (has_changed || data['refresh']) {
+        refresh_update_site(site)
+    }
+
+    site_report = [
+        id: site.getId(),
+        url: site.getUrl(),
+        refreshed: (has_changed || data['refresh']),
+        plugins: site.getData()?.plugins?.size() ?: 0,
+    ]
+}
+catch(Exception e) {
+    throw new RuntimeException(e.getMessage())
+}
+
+// Build json result
+result = new JsonBuilder()
+result {
+    changed has_changed
+    output site_report
+    saved saved_files
+}
+
+println result
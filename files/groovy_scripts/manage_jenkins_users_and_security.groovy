@@ -12,6 +12,9 @@ import hudson.security.LDAPSecurityRealm.EnvironmentProperty
 import hudson.util.Secret
 
 
+{% include 'lib/change_tracker.groovy' %}
+
+
 /**
     Convert Json string to Groovy Object
 
@@ -31,6 +34,22 @@ def Object parse_data(String arg) {
 }
 
 
+/**
+    Get Json payload, read on standard input when argument is "-"
+
+    @param String[] Script arguments
+    @return String Json payload
+*/
+def String get_payload(String[] script_args) {
+
+    if (script_args[0] == '-') {
+        return stdin.getText('UTF-8')
+    }
+
+    return script_args[0]
+}
+
+
 /**
     Check if jenkins user account exists
 
@@ -47,6 +66,21 @@ def is_user_exists(String username) {
 }
 
 
+/**
+    Check if jenkins user has a password in Jenkins own users database
+
+    @param String Username to check
+    @return Boolean True if user has a password
+*/
+def is_user_password_set(String username) {
+
+    def Map context = [:]
+    def user = User.get(username, false, context)
+
+    return user?.getProperty(HudsonPrivateSecurityRealm.Details) != null
+}
+
+
 /**
     Check if jenkins user email need to be updated
 
@@ -165,7 +199,7 @@ def create_user_account(HudsonPrivateSecurityRealm realm, Map data) {
     set_user_keys(user, data.public_keys)
     set_user_full_name(user, data.full_name)
 
-    user.save()
+    mark_changed(user)
     return true
 }
 
@@ -197,7 +231,9 @@ def update_user_account(HudsonPrivateSecurityRealm realm, Map data) {
         changed = true
     }
 
-    user.save()
+    if (changed) {
+        mark_changed(user)
+    }
     return changed
 }
 
@@ -213,7 +249,9 @@ def manage_user_account(HudsonPrivateSecurityRealm realm, Map user) {
     def Boolean changed = false
 
     //if (is_user_exists(realm, user.username)) {
-    if (is_user_exists(user.username)) {
+    // Users rendered offline have no password yet, account creation sets it
+    if (is_user_exists(user.username)
+            && is_user_password_set(user.username)) {
         def user_changed = update_user_account(realm, user)
         changed = changed || user_changed
     }
@@ -631,13 +669,15 @@ def create_security_realm(Map realm_data) {
 def Boolean user_changed = false
 def Boolean auth_changed = false
 def Boolean realm_changed = false
+def Boolean crumb_changed = false
+def List<String> saved_files = []
 def data
 
 try {
     def Jenkins jenkins_instance = Jenkins.getInstance()
 
     // Get user data
-    data = parse_data(args[0])
+    data = parse_data(get_payload(args))
 
     // Manage security realm
     def current_realm = jenkins_instance.getSecurityRealm()
@@ -669,8 +709,11 @@ try {
                         data['crumb_issuer'],
                         data['crumb_exclude_client_ip'])
 
-    // Save new configuration to disk
-    jenkins_instance.save()
+    // Save new configuration to disk, only if changed
+    if (realm_changed || auth_changed || crumb_changed) {
+        mark_changed(jenkins_instance)
+    }
+    saved_files = save_changed()
 }
 catch(Exception e) {
     throw new RuntimeException(e.getMessage())
@@ -682,6 +725,7 @@ def has_changed = user_changed || realm_changed || auth_changed || crumb_changed
 result {
     changed has_changed
     output data
+    saved saved_files
 }
 
 println result
@@ -0,0 +1,218 @@
+#!/usr/bin/env groovy
+
+import jenkins.model.*
+import hudson.PluginManager
+import hudson.PluginWrapper
+import java.util.jar.JarFile
+import groovy.json.*
+
+
+/**
+    Convert Json string to Groovy Object
+
+    @param String arg Json string to parse
+    @return Map Groovy object used to get data
+*/
+def Map parse_data(String arg) {
+
+    try {
+        def JsonSlurper jsonSlurper = new JsonSlurper()
+        return jsonSlurper.parseText(arg)
+    }
+    catch(Exception e) {
+        throw new Exception("Parse data error, incoming data : ${arg}, "
+                            + "error message : ${e.getMessage()}")
+    }
+}
+
+
+/**
+    Get Json payload, read on standard input when argument is "-"
+
+    @param String[] Script arguments
+    @return String Json payload
+*/
+def String get_payload(String[] script_args) {
+
+    if (script_args[0] == '-') {
+        return stdin.getText('UTF-8')
+    }
+
+    return script_args[0]
+}
+
+
+/**
+    Get plugins detached from Jenkins core, needed by plugins built for older
+    core versions
+
+    @param PluginManager Jenkins plugin manager
+    @return Set Detached plugins names
+*/
+def Set get_detached_plugins(PluginManager jenkins_pm) {
+
+    // Detached plugins list moved from ClassicPluginStrategy in Jenkins 2.163
+    for (String class_name : ['jenkins.plugins.DetachedPluginsUtil',
+                              'hudson.ClassicPluginStrategy']) {
+        try {
+            def Class util_class = jenkins_pm.uberClassLoader.loadClass(
+                class_name)
+            return util_class.getDetachedPlugins().collect {
+                it.getShortName()
+            } as Set
+        }
+        catch(ClassNotFoundException | MissingMethodException e) {
+            continue
+        }
+    }
+
+    return [] as Set
+}
+
+
+/**
+    Get plugins needed by some plugins, with their installed dependencies,
+    optional ones included
+
+    @param PluginManager Jenkins plugin manager
+    @param Collection Plugins names
+    @return Set Plugins names
+*/
+def Set get_closure(PluginManager jenkins_pm, Collection names) {
+
+    def Set closure = [] as Set
+    def List queue = names as List
+
+    while (queue) {
+        def String name = queue.pop()
+        def PluginWrapper plugin = jenkins_pm.getPlugin(name)
+
+        if (plugin == null || !closure.add(name)) {
+            continue
+        }
+
+        (plugin.getDependencies() + plugin.getOptionalDependencies()).each {
+            queue.add(it.shortName)
+        }
+    }
+
+    return closure
+}
+
+
+/**
+    Estimate class loading cost of a plugin, from its exploded libraries
+
+    @param PluginManager Jenkins plugin manager
+    @param PluginWrapper Plugin
+    @return Map Archive size, libraries size and number of classes
+*/
+def Map get_plugin_cost(PluginManager jenkins_pm, PluginWrapper plugin) {
+
+    def Map cost = [archive_bytes: plugin.archive.length(),
+                    jar_bytes: 0,
+                    classes: 0]
+    def File lib_dir = new File(jenkins_pm.rootDir,
+                                "${plugin.getShortName()}/WEB-INF/lib")
+
+    lib_dir.listFiles()?.findAll { it.name.endsWith('.jar') }?.each { jar ->
+        cost['jar_bytes'] += jar.length()
+        def JarFile jar_file = new JarFile(jar)
+        try {
+            cost['classes'] += jar_file.entries().findAll {
+                it.name.endsWith('.class')
+            }.size()
+        }
+        finally {
+            jar_file.close()
+        }
+    }
+
+    return cost
+}
+
+
+/**
+    Disable or delete a plugin
+
+    @param PluginWrapper Plugin
+    @param String Wanted state, "disabled" or "absent"
+    @return Boolean True if plugin changed
+*/
+def Boolean prune_plugin(PluginWrapper plugin, String state) {
+
+    try {
+        if (state == 'absent') {
+            plugin.doDoUninstall()
+            return true
+        }
+
+        if (plugin.isEnabled()) {
+            plugin.disable()
+            return true
+        }
+
+        return false
+    }
+    catch(Exception e) {
+        throw new Exception(
+            "Plugin ${plugin.getShortName()} prune error, "
+            + "error message : ${e.getMessage()}")
+    }
+}
+
+
+/* SCRIPT */
+
+def Map changes = [extras: [], pruned: [], wanted: 0]
+
+try {
+    def Jenkins jenkins_instance = Jenkins.getInstance()
+    def PluginManager jenkins_pm = jenkins_instance.getPluginManager()
+    def Map data = parse_data(get_payload(args))
+
+    // Bundled and detached plugins are always kept
+    def Set roots = (data['plugins'] + data['keep']) as Set
+    roots.addAll(get_detached_plugins(jenkins_pm))
+    roots.addAll(jenkins_pm.getPlugins().findAll {
+        it.isBundled()
+    }.collect { it.getShortName() })
+
+    def Set wanted = get_closure(jenkins_pm, roots)
+    changes['wanted'] = wanted.size()
+
+    jenkins_pm.getPlugins().each { PluginWrapper plugin ->
+        if (wanted.contains(plugin.getShortName())) {
+            return
+        }
+
+        def Map extra = [name: plugin.getShortName(),
+                         version: plugin.getVersion(),
+                         active: plugin.isActive()]
+        extra.putAll(get_plugin_cost(jenkins_pm, plugin))
+        changes['extras'].add(extra)
+
+        if (data['state'] != 'report' && prune_plugin(plugin, data['state'])) {
+            changes['pruned'].add(plugin.getShortName())
+        }
+    }
+}
+catch(Exception e) {
+    throw new RuntimeException(e.getMessage())
+}
+
+// Build json result
+result = new JsonBuilder()
+result {
+    changed (changes['pruned'].size() > 0)
+    output {
+        wanted changes['wanted']
+        extras changes['extras']
+        pruned changes['pruned']
+        restart_required (changes['pruned'].size() > 0)
+    }
+    // Pruning only writes plugins files, no configuration is changed
+    saved []
+}
+
+println result
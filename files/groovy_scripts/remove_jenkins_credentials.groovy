@@ -6,6 +6,7 @@ import com.cloudbees.plugins.credentials.common.*
 import com.cloudbees.plugins.credentials.domains.*
 import com.cloudbees.plugins.credentials.CredentialsStore
 import groovy.json.*
+import hudson.model.Saveable
 
 
 /**
@@ -94,9 +95,29 @@ def Boolean remove_domain_credentials(CredentialsStore store,
 }
 
 
+/**
+    Get configuration file of a saveable object
+
+    @param Saveable Jenkins object saved to disk
+    @return String File path relative to Jenkins home, class name if unknown
+*/
+def String get_config_path(Saveable item) {
+
+    def String home = Jenkins.getInstance().getRootDir().getAbsolutePath()
+
+    try {
+        return item.getConfigFile().getFile().getAbsolutePath() - "${home}/"
+    }
+    catch(Exception e) {
+        return item.getClass().getName()
+    }
+}
+
+
 /* SCRIPT */
 
 def Boolean has_changed = false
+def List<String> saved_files = []
 
 try {
     def Jenkins jenkins_instance = Jenkins.getInstance()
@@ -108,8 +129,10 @@ try {
     //manage credentials
     has_changed = remove_domain_credentials(credentials_store, domain_name)
 
-    // Save new configuration to disk
-    jenkins_instance.save()
+    // Credentials store saves itself on changes, report its file
+    if (has_changed) {
+        saved_files.add(get_config_path(SystemCredentialsProvider.getInstance()))
+    }
 }
 catch(Exception e) {
     throw new RuntimeException(e.getMessage())
@@ -122,6 +145,7 @@ result {
     output {
         changed has_changed
     }
+    saved saved_files
 }
 
 println result
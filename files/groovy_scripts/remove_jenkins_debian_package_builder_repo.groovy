@@ -6,9 +6,13 @@ import jenkins.model.*
 import ru.yandex.jenkins.plugins.debuilder.DebianPackageRepo
 
 
+{% include 'lib/change_tracker.groovy' %}
+
+
 /* SCRIPT */
 
 def Boolean has_changed = false
+def List<String> saved_files = []
 
 try {
     def Jenkins jenkins_instance = Jenkins.getInstance()
@@ -23,9 +27,11 @@ try {
     desc.repos = []
     has_changed = (repositories.size() > 0)
 
-    // Save new configuration to disk
-    desc.save()
-    jenkins_instance.save()
+    // Save new configuration to disk, only if changed
+    if (has_changed) {
+        mark_changed(desc)
+    }
+    saved_files = save_changed()
 }
 catch(Exception e) {
     throw new RuntimeException(e.getMessage())
@@ -38,6 +44,7 @@ result {
     output {
         changed has_changed
     }
+    saved saved_files
 }
 
 println result
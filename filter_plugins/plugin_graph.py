@@ -0,0 +1,294 @@
+from ansible import errors
+from collections import deque
+import re
+
+
+#
+# Additionnal Jinja2 filters to work on plugins dependency graphs
+#
+# Graphs are computed on the controller, from data already gathered by role
+# modules. All filters are linear with the number of plugins and dependencies.
+#
+
+VERSION_TOKEN_REGEX = re.compile(r'\d+|[a-zA-Z]+')
+
+
+def _to_graph(arg):
+    """
+        Normalize a plugins graph to a dict of dependencies names
+        :param arg: Graph, dict of dependencies lists, dict of dicts with
+                    "dependencies" key, or list of dicts with "name" and
+                    "dependencies" keys
+        :type arg: dict or list
+        :return: Dependencies names, by plugin name
+        :rtype: dict
+    """
+
+    if type(arg) == list:
+        arg = dict((item['name'], item) for item in arg)
+
+    if type(arg) != dict:
+        raise errors.AnsibleFilterError(
+            'Invalid value type, should be dict or array')
+
+    graph = {}
+    for name, dependencies in arg.items():
+        if type(dependencies) == dict:
+            dependencies = dependencies.get('dependencies') or []
+        graph[name] = [dep['name'] if type(dep) == dict else dep
+                       for dep in dependencies]
+
+    return graph
+
+
+def _version_key(version):
+    """
+        Get a sortable key from a version string, "1.10" is newer than "1.9",
+        "1.2-beta-1" is older than "1.2"
+        :param version: Version
+        :type version: str
+        :return: Sortable key
+        :rtype: list
+    """
+
+    key = [(2, int(token)) if token.isdigit() else (0, token.lower())
+           for token in VERSION_TOKEN_REGEX.findall(str(version))]
+
+    # Release is newer than its qualifiers, and older than its next versions
+    key.append((1, ''))
+    return key
+
+
+def unique_ordered(arg):
+    """
+        Remove duplicates from an array, keeping first occurrences order
+        :param arg: Values
+        :type arg: list
+        :return: Values without duplicates
+        :rtype: list
+    """
+
+    if type(arg) != list:
+        raise errors.AnsibleFilterError('Invalid value type, should be array')
+
+    seen = set()
+    result = []
+
+    for value in arg:
+        if value not in seen:
+            seen.add(value)
+            result.append(value)
+
+    return result
+
+
+def plugins_toposort(arg):
+    """
+        Sort plugins, dependencies first
+        :param arg: Plugins graph
+        :type arg: dict or list
+        :return: Plugins names, each one after its dependencies
+        :rtype: list
+    """
+
+    graph = _to_graph(arg)
+
+    # Dependencies not described in graph are leaves
+    for dependencies in list(graph.values()):
+        for dep in dependencies:
+            graph.setdefault(dep, [])
+
+    pending = dict((name, len(set(deps))) for name, deps in graph.items())
+    dependents = dict((name, []) for name in graph)
+    for name, dependencies in graph.items():
+        for dep in set(dependencies):
+            dependents[dep].append(name)
+
+    ready = deque(sorted(name for name, count in pending.items()
+                         if count == 0))
+    result = []
+
+    while ready:
+        name = ready.popleft()
+        result.append(name)
+        for dependent in dependents[name]:
+            pending[dependent] -= 1
+            if pending[dependent] == 0:
+                ready.append(dependent)
+
+    if len(result) != len(graph):
+        raise errors.AnsibleFilterError(
+            'Plugins dependency cycle found : %s' % (
+                ' -> '.join(_find_cycle(graph, pending))))
+
+    return result
+
+
+def _find_cycle(graph, pending):
+    """
+        Find a dependency cycle, among plugins not sorted
+        :param graph: Dependencies names, by plugin name
+        :type graph: dict
+        :param pending: Remaining dependencies count, by plugin name
+        :type pending: dict
+        :return: Plugins names of the cycle, first one repeated at the end
+        :rtype: list
+    """
+
+    # Each remaining plugin has a remaining dependency, so walk them until
+    # a plugin is seen twice
+    name = sorted(name for name, count in pending.items() if count > 0)[0]
+    path = []
+    positions = {}
+
+    while name not in positions:
+        positions[name] = len(path)
+        path.append(name)
+        name = [dep for dep in graph[name] if pending[dep] > 0][0]
+
+    return path[positions[name]:] + [name]
+
+
+def plugins_max_versions(arg):
+    """
+        Merge plugins versions, keeping the newest version of each plugin
+        :param arg: Dicts of versions by plugin name
+        :type arg: list
+        :return: Newest versions, by plugin name
+        :rtype: dict
+    """
+
+    if type(arg) != list:
+        raise errors.AnsibleFilterError('Invalid value type, should be array')
+
+    result = {}
+    keys = {}
+
+    for versions in arg:
+        for name, version in versions.items():
+            key = _version_key(version)
+            if name not in keys or key > keys[name]:
+                keys[name] = key
+                result[name] = version
+
+    return result
+
+
+def plugins_closure(arg, names):
+    """
+        Get plugins with all their dependencies, dependencies first
+        :param arg: Plugins graph
+        :type arg: dict or list
+        :param names: Plugins names
+        :type names: list
+        :return: Plugins names
+        :rtype: list
+    """
+
+    graph = _to_graph(arg)
+    selected = _walk(graph, names)
+
+    return plugins_toposort(
+        dict((name, graph.get(name, [])) for name in selected))
+
+
+def plugins_reverse_closure(arg, names):
+    """
+        Get plugins depending directly or not on some plugins, with them
+        :param arg: Plugins graph
+        :type arg: dict or list
+        :param names: Plugins names
+        :type names: list
+        :return: Plugins names, dependencies first
+        :rtype: list
+    """
+
+    graph = _to_graph(arg)
+
+    dependents = {}
+    for name, dependencies in graph.items():
+        for dep in dependencies:
+            dependents.setdefault(dep, []).append(name)
+
+    selected = _walk(dependents, names)
+
+    return [name for name in plugins_toposort(graph) if name in selected]
+
+
+def _walk(edges, names):
+    """
+        Get all nodes reachable from some nodes
+        :param edges: Next nodes, by node
+        :type edges: dict
+        :param names: Start nodes
+        :type names: list
+        :return: Reachable nodes, with start nodes
+        :rtype: set
+    """
+
+    seen = set(names)
+    queue = deque(names)
+
+    while queue:
+        for next_name in edges.get(queue.popleft(), []):
+            if next_name not in seen:
+                seen.add(next_name)
+                queue.append(next_name)
+
+    return seen
+
+
+def plugins_diff(installed, desired):
+    """
+        Compare installed plugins with desired ones
+        :param installed: Installed versions by plugin name, or names
+        :type installed: dict or list
+        :param desired: Desired versions by plugin name, or names, a None or
+                        "latest" version matches any installed version
+        :type desired: dict or list
+        :return: Plugins to install, upgrade and remove, and unchanged ones
+        :rtype: dict
+    """
+
+    if type(installed) == list:
+        installed = dict((name, None) for name in installed)
+    if type(desired) == list:
+        desired = dict((name, None) for name in desired)
+
+    if type(installed) != dict or type(desired) != dict:
+        raise errors.AnsibleFilterError(
+            'Invalid value type, should be dict or array')
+
+    result = dict(install=[], upgrade=[], remove=[], unchanged=[])
+
+    for name in sorted(desired):
+        version = desired[name]
+        if name not in installed:
+            result['install'].append(name)
+        elif (version not in (None, 'latest')
+              and installed[name] is not None
+              and _version_key(version) > _version_key(installed[name])):
+            result['upgrade'].append(name)
+        else:
+            result['unchanged'].append(name)
+
+    result['remove'] = sorted(name for name in installed
+                              if name not in desired)
+
+    return result
+
+
+class FilterModule(object):
+    """ Filters to work on plugins dependency graphs """
+
+    filter_map = {
+        'unique_ordered': unique_ordered,
+        'plugins_toposort': plugins_toposort,
+        'plugins_max_versions': plugins_max_versions,
+        'plugins_closure': plugins_closure,
+        'plugins_reverse_closure': plugins_reverse_closure,
+        'plugins_diff': plugins_diff,
+    }
+
+    def filters(self):
+        return self.filter_map
@@ -0,0 +1,451 @@
+#!/usr/bin/python
+
+
+from ansible.module_utils.basic import *  # NOQA
+import base64
+import binascii
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import zipfile
+
+
+INDEX_FILE = '.index.json'
+UPDATE_CENTER_FILE = 'update-center.json'
+UPDATE_CENTER_ACTUAL_FILE = 'update-center.actual.json'
+DOWNLOAD_PATH = os.path.join('download', 'plugins')
+ARCHIVE_EXTENSIONS = ('.hpi', '.jpi')
+
+
+def parse_manifest(content):
+    """
+        Parse a jar manifest, long values are wrapped on several lines
+        :param content: Manifest content
+        :type content: str
+        :return: Manifest attributes
+        :rtype: dict
+    """
+
+    attributes = {}
+    name = None
+
+    for line in content.splitlines():
+        if line.startswith(' ') and name is not None:
+            attributes[name] += line[1:]
+        elif ':' in line:
+            name, value = line.split(':', 1)
+            attributes[name] = value.strip()
+
+    return attributes
+
+
+def parse_dependencies(value):
+    """
+        Parse plugin dependencies manifest attribute
+        :param value: Attribute value, as "name:version;resolution:=optional"
+        :type value: str
+        :return: Update center dependencies
+        :rtype: list
+    """
+
+    dependencies = []
+
+    for dependency in filter(None, value.split(',')):
+        spec, _, options = dependency.partition(';')
+        name, version = spec.split(':', 1)
+        dependencies.append(dict(
+            name=name,
+            version=version,
+            optional=('resolution:=optional' in options)))
+
+    return dependencies
+
+
+def parse_developers(value):
+    """
+        Parse plugin developers manifest attribute
+        :param value: Attribute value, as "name:id:email"
+        :type value: str
+        :return: Update center developers
+        :rtype: list
+    """
+
+    developers = []
+
+    for developer in filter(None, value.split(',')):
+        fields = (developer.split(':') + ['', '', ''])[:3]
+        developers.append(dict(
+            (key, field) for key, field
+            in zip(['name', 'developerId', 'email'], fields) if field))
+
+    return developers
+
+
+def version_key(version):
+    """
+        Get a sortable key of a plugin version
+        :param version: Plugin version, as "1.2.3"
+        :type version: str
+        :return: Version key, numbers are sorted before other parts
+        :rtype: list
+    """
+
+    return [(0, int(part)) if part.isdigit() else (1, part)
+            for part in re.split(r'[.-]', version)]
+
+
+def get_checksums(path):
+    """
+        Get archive checksums, base64 encoded as update center does
+        :param path: Archive path
+        :type path: str
+        :return: Checksums by algorithm
+        :rtype: dict
+    """
+
+    digests = dict(sha1=hashlib.sha1(), sha256=hashlib.sha256(),
+                   sha512=hashlib.sha512())
+
+    with open(path, 'rb') as archive:
+        for chunk in iter(lambda: archive.read(65536), b''):
+            for digest in digests.values():
+                digest.update(chunk)
+
+    return dict((name, base64.b64encode(digest.digest()).decode('ascii'))
+                for name, digest in digests.items())
+
+
+def index_archive(path):
+    """
+        Build update center entry of a plugin archive
+        :param path: Archive path
+        :type path: str
+        :return: Update center entry, without download url
+        :rtype: dict
+    """
+
+    with zipfile.ZipFile(path) as archive:
+        manifest = parse_manifest(
+            archive.read('META-INF/MANIFEST.MF').decode('utf-8'))
+
+    name = manifest.get('Short-Name', manifest.get('Extension-Name'))
+    if not name or 'Plugin-Version' not in manifest:
+        raise ValueError('%s is not a Jenkins plugin archive' % path)
+
+    entry = dict(
+        name=name,
+        version=manifest['Plugin-Version'],
+        title=manifest.get('Long-Name', name),
+        wiki=manifest.get('Url', ''),
+        requiredCore=manifest.get('Jenkins-Version',
+                                  manifest.get('Hudson-Version', '1.0')),
+        dependencies=parse_dependencies(
+            manifest.get('Plugin-Dependencies', '')),
+        developers=parse_developers(manifest.get('Plugin-Developers', '')),
+        excerpt=manifest.get('Specification-Title', ''),
+        labels=[])
+
+    if 'Group-Id' in manifest:
+        entry['gav'] = '%s:%s:%s' % (manifest['Group-Id'], name,
+                                     entry['version'])
+    if 'Compatible-Since-Version' in manifest:
+        entry['compatibleSinceVersion'] = manifest['Compatible-Since-Version']
+    if 'Minimum-Java-Version' in manifest:
+        entry['minimumJavaVersion'] = manifest['Minimum-Java-Version']
+
+    entry.update(get_checksums(path))
+    return entry
+
+
+def update_index(module, index):
+    """
+        Index plugins archives, only new or changed archives are read
+        :param module: Ansible module
+        :type module: AnsibleModule
+        :param index: Previous index, by archive file name
+        :type index: dict
+        :return: New index, and names of indexed archives
+        :rtype: tuple
+    """
+
+    plugins_path = module.params['plugins_path']
+    new_index = {}
+    indexed = []
+
+    for file_name in sorted(os.listdir(plugins_path)):
+        path = os.path.join(plugins_path, file_name)
+        if not file_name.endswith(ARCHIVE_EXTENSIONS) \
+                or not os.path.isfile(path):
+            continue
+
+        stat = os.stat(path)
+        previous = index.get(file_name, {})
+        if previous.get('size') == stat.st_size \
+                and previous.get('mtime') == stat.st_mtime:
+            new_index[file_name] = previous
+            continue
+
+        try:
+            entry = index_archive(path)
+        except (ValueError, KeyError, zipfile.BadZipfile) as e:
+            module.fail_json(msg='Plugin archive error : %s - %s' % (
+                file_name, e))
+
+        new_index[file_name] = dict(size=stat.st_size, mtime=stat.st_mtime,
+                                    entry=entry)
+        indexed.append(file_name)
+
+    return new_index, indexed
+
+
+def get_plugins(module, index):
+    """
+        Get update center plugins, the last version of each one is kept
+        :param module: Ansible module
+        :type module: AnsibleModule
+        :param index: Plugins index, by archive file name
+        :type index: dict
+        :return: Plugins entries and their archive, by plugin name
+        :rtype: dict
+    """
+
+    plugins = {}
+
+    for file_name, item in index.items():
+        entry = dict(item['entry'])
+        current = plugins.get(entry['name'])
+        if current is not None and version_key(current[0]['version']) \
+                >= version_key(entry['version']):
+            continue
+
+        entry['url'] = '%s/%s/%s/%s/%s.hpi' % (
+            module.params['site_url'].rstrip('/'),
+            DOWNLOAD_PATH.replace(os.sep, '/'),
+            entry['name'], entry['version'], entry['name'])
+        plugins[entry['name']] = (entry, file_name)
+
+    return plugins
+
+
+def publish_archives(module, plugins):
+    """
+        Link plugins archives in site download folder, remove old ones
+        :param module: Ansible module
+        :type module: AnsibleModule
+        :param plugins: Plugins entries and their archive, by plugin name
+        :type plugins: dict
+        :return: True if download folder changed
+        :rtype: bool
+    """
+
+    download_path = os.path.join(module.params['site_path'], DOWNLOAD_PATH)
+    changed = False
+
+    wanted = set()
+    for name, (entry, file_name) in plugins.items():
+        folder = os.path.join(download_path, name, entry['version'])
+        dest = os.path.join(folder, '%s.hpi' % name)
+        src = os.path.join(module.params['plugins_path'], file_name)
+        wanted.add(folder)
+
+        # Archives are hard linked, or copied with their modification time
+        if os.path.isfile(dest) and (
+                os.path.samefile(src, dest)
+                or os.stat(src).st_mtime == os.stat(dest).st_mtime):
+            continue
+
+        if not os.path.isdir(folder):
+            os.makedirs(folder)
+        if os.path.isfile(dest):
+            os.remove(dest)
+        try:
+            os.link(src, dest)
+        except OSError:
+            shutil.copy2(src, dest)
+        changed = True
+
+    if not os.path.isdir(download_path):
+        return changed
+
+    for name in os.listdir(download_path):
+        for version in os.listdir(os.path.join(download_path, name)):
+            folder = os.path.join(download_path, name, version)
+            if folder not in wanted:
+                shutil.rmtree(folder)
+                changed = True
+        if not os.listdir(os.path.join(download_path, name)):
+            os.rmdir(os.path.join(download_path, name))
+
+    return changed
+
+
+def openssl(module, args, data=None):
+    """
+        Run an openssl command, its output is written in a temporary file
+        :param module: Ansible module
+        :type module: AnsibleModule
+        :param args: openssl arguments
+        :type args: list
+        :param data: Command standard input
+        :type data: str
+        :return: Command output
+        :rtype: bytes
+    """
+
+    fd, out_path = tempfile.mkstemp()
+    os.close(fd)
+
+    try:
+        rc, stdout, stderr = module.run_command(
+            ['openssl'] + args + ['-out', out_path],
+            data=data, binary_data=True)
+        if rc != 0:
+            module.fail_json(msg='openssl error : %s' % stderr)
+
+        with open(out_path, 'rb') as out_file:
+            return out_file.read()
+    finally:
+        os.remove(out_path)
+
+
+def sign(module, update_center):
+    """
+        Sign update center content, as Jenkins checks it
+        :param module: Ansible module
+        :type module: AnsibleModule
+        :param update_center: Update center content, without signature
+        :type update_center: dict
+        :return: Update center signature
+        :rtype: dict
+    """
+
+    # Jenkins checks signature of the canonical form of the content
+    canonical = json.dumps(update_center, sort_keys=True,
+                           separators=(',', ':'), ensure_ascii=False)
+    key = module.params['signing_key']
+
+    certificate = openssl(module, [
+        'x509', '-in', module.params['signing_certificate'],
+        '-outform', 'DER'])
+    signature = openssl(module, ['dgst', '-sha1', '-sign', key],
+                        canonical)
+    signature512 = openssl(module, ['dgst', '-sha512', '-sign', key],
+                           canonical)
+    canonical_bytes = canonical.encode('utf-8')
+
+    return dict(
+        certificates=[base64.b64encode(certificate).decode('ascii')],
+        correct_digest=base64.b64encode(
+            hashlib.sha1(canonical_bytes).digest()).decode('ascii'),
+        correct_digest512=hashlib.sha512(canonical_bytes).hexdigest(),
+        correct_signature=base64.b64encode(signature).decode('ascii'),
+        correct_signature512=binascii.hexlify(signature512).decode('ascii'))
+
+
+def write_if_changed(path, content):
+    """
+        Write a file, only if its content changed
+        :param path: File path
+        :type path: str
+        :param content: File content
+        :type content: str
+        :return: True if file written
+        :rtype: bool
+    """
+
+    if os.path.isfile(path):
+        with open(path) as current:
+            if current.read() == content:
+                return False
+
+    with open('%s.part' % path, 'w') as new_file:
+        new_file.write(content)
+    os.rename('%s.part' % path, path)
+
+    return True
+
+
+def main():
+
+    module = AnsibleModule(
+        argument_spec=dict(
+            plugins_path=dict(
+                type='str',
+                required=True),
+            site_path=dict(
+                type='str',
+                required=True),
+            site_url=dict(
+                type='str',
+                required=True),
+            id=dict(
+                type='str',
+                required=False,
+                default='default'),
+            signing_key=dict(
+                type='str',
+                required=False,
+                default=''),
+            signing_certificate=dict(
+                type='str',
+                required=False,
+                default='')
+        )
+    )
+
+    if bool(module.params['signing_key']) \
+            != bool(module.params['signing_certificate']):
+        module.fail_json(
+            msg='signing_key and signing_certificate are needed to sign')
+
+    if not os.path.isdir(module.params['plugins_path']):
+        module.fail_json(msg='Plugins folder not found : %s' % (
+            module.params['plugins_path']))
+
+    site_path = module.params['site_path']
+    if not os.path.isdir(site_path):
+        os.makedirs(site_path)
+
+    index_path = os.path.join(site_path, INDEX_FILE)
+    index = {}
+    if os.path.isfile(index_path):
+        with open(index_path) as index_file:
+            index = json.load(index_file)
+
+    index, indexed = update_index(module, index)
+    plugins = get_plugins(module, index)
+    changed = publish_archives(module, plugins)
+
+    update_center = dict(
+        id=module.params['id'],
+        updateCenterVersion='1',
+        plugins=dict((name, entry) for name, (entry, _) in plugins.items()),
+        warnings=[],
+        deprecations={})
+
+    if module.params['signing_key']:
+        update_center['signature'] = sign(module, update_center)
+
+    content = json.dumps(update_center, sort_keys=True, indent=2)
+    changed |= write_if_changed(
+        os.path.join(site_path, UPDATE_CENTER_ACTUAL_FILE), content)
+    changed |= write_if_changed(
+        os.path.join(site_path, UPDATE_CENTER_FILE),
+        'updateCenter.post(\n%s\n);' % content)
+    write_if_changed(index_path, json.dumps(index, sort_keys=True))
+
+    module.exit_json(
+        changed=changed,
+        output=dict(
+            plugins=len(plugins),
+            indexed=indexed,
+            signed=bool(module.params['signing_key']),
+            url='%s/%s' % (module.params['site_url'].rstrip('/'),
+                           UPDATE_CENTER_FILE)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/python
+
+
+from ansible.module_utils.basic import *  # NOQA
+import json
+from os.path import basename
+
+
+def main():
+
+    module = AnsibleModule(
+        argument_spec=dict(
+            timeout=dict(
+                type='int',
+                required=False,
+                default=1800),
+            poll_interval=dict(
+                type='int',
+                required=False,
+                default=10),
+            queued_max_duration=dict(
+                type='int',
+                required=False,
+                default=0),
+            wait_pipelines=dict(
+                type='bool',
+                required=False,
+                default=False),
+            on_timeout=dict(
+                type='str',
+                required=False,
+                default='restart',
+                choices=['restart', 'abort']),
+            restart=dict(
+                type='str',
+                required=False,
+                default='',
+                choices=['', 'safe']),
+            use_ssh_key=dict(
+                type='bool',
+                required=False,
+                default=True),
+            deployment_ssh_key=dict(
+                type='str',
+                required=False,
+                default='/var/lib/jenkins/.ssh/id_rsa'),
+            cli_path=dict(
+                type='str',
+                required=False,
+                default='/var/lib/jenkins/jenkins-cli.jar'),
+            groovy_scripts_path=dict(
+                type='str',
+                required=False,
+                default='/var/lib/jenkins/groovy_scripts'),
+            url=dict(
+                type='str',
+                required=False,
+                default='http://localhost:8080')
+        )
+    )
+
+    script = "%s/drain_jenkins_builds.groovy" % (
+        module.params['groovy_scripts_path'])
+
+    if module.params['use_ssh_key'] is False:
+        rc, stdout, stderr = module.run_command(
+            ['java', '-jar', module.params['cli_path'], '-remoting',
+             '-s', module.params['url'], '-noKeyAuth',
+             'groovy', script, '-'],
+            data=json.dumps(module.params))
+    else:
+        rc, stdout, stderr = module.run_command(
+            ['java', '-jar', module.params['cli_path'], '-remoting',
+             '-s', module.params['url'],
+             '-i', module.params['deployment_ssh_key'],
+             'groovy', script, '-'],
+            data=json.dumps(module.params))
+
+    if (rc != 0):
+        module.fail_json(msg=stderr)
+
+    json_stdout = json.loads(stdout)
+    if json_stdout['output']['aborted']:
+        module.fail_json(
+            msg='Running builds not drained after %d seconds, restart '
+                'aborted' % module.params['timeout'],
+            output=json_stdout['output'])
+
+    module.exit_json(changed=bool(json_stdout['changed']),
+                     output=json_stdout['output'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/python
+
+
+from ansible.module_utils.basic import *  # NOQA
+import json
+from os.path import basename
+
+
+def main():
+
+    module = AnsibleModule(
+        argument_spec=dict(
+            clouds=dict(
+                type='list',
+                required=False,
+                default=[]),
+            use_ssh_key=dict(
+                type='bool',
+                required=False,
+                default=True),
+            deployment_ssh_key=dict(
+                type='str',
+                required=False,
+                default='/var/lib/jenkins/.ssh/id_rsa'),
+            cli_path=dict(
+                type='str',
+                required=False,
+                default='/var/lib/jenkins/jenkins-cli.jar'),
+            groovy_scripts_path=dict(
+                type='str',
+                required=False,
+                default='/var/lib/jenkins/groovy_scripts'),
+            url=dict(
+                type='str',
+                required=False,
+                default='http://localhost:8080')
+        )
+    )
+
+    script = "%s/get_jenkins_docker_provisioning_report.groovy" % (
+        module.params['groovy_scripts_path'])
+
+    if module.params['use_ssh_key'] is False:
+        rc, stdout, stderr = module.run_command(
+            ['java', '-jar', module.params['cli_path'], '-remoting',
+             '-s', module.params['url'], '-noKeyAuth',
+             'groovy', script, '-'],
+            data=json.dumps(module.params))
+    else:
+        rc, stdout, stderr = module.run_command(
+            ['java', '-jar', module.params['cli_path'], '-remoting',
+             '-s', module.params['url'],
+             '-i', module.params['deployment_ssh_key'],
+             'groovy', script, '-'],
+            data=json.dumps(module.params))
+
+    if (rc != 0):
+        module.fail_json(msg=stderr)
+
+    json_stdout = json.loads(stdout)
+    module.exit_json(changed=bool(json_stdout['changed']),
+                     output=json_stdout['output'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,255 @@
+#!/usr/bin/python
+
+
+from ansible.module_utils.basic import *  # NOQA
+import json
+import math
+import multiprocessing
+import os
+from os.path import basename
+
+
+def percentile(values, rank):
+    """
+        Get a percentile, with nearest rank method
+        :param values: Samples
+        :type values: list
+        :param rank: Percentile rank, between 0 and 100
+        :type rank: int
+        :return: Percentile value, 0 without samples
+        :rtype: float
+    """
+
+    if not values:
+        return 0.0
+
+    ordered = sorted(values)
+    index = int(math.ceil(rank / 100.0 * len(ordered))) - 1
+    return float(ordered[max(index, 0)])
+
+
+def get_demand(load):
+    """
+        Get executors demand samples, busy executors plus queued items
+        :param load: Load statistics histories
+        :type load: dict
+        :return: Demand samples
+        :rtype: list
+    """
+
+    return [busy + queue for busy, queue in zip(load['busy'], load['queue'])]
+
+
+def get_utilization(load, rank):
+    """
+        Get executors utilization percentiles
+        :param load: Load statistics histories
+        :type load: dict
+        :param rank: Percentile rank used for recommendation
+        :type rank: int
+        :return: Utilization percentiles, between 0 and 1
+        :rtype: dict
+    """
+
+    samples = [busy / total for busy, total in zip(load['busy'], load['total'])
+               if total > 0]
+
+    return dict((key, round(percentile(samples, value), 3))
+                for key, value in [('p50', 50), ('p90', 90),
+                                   ('p%d' % rank, rank), ('max', 100)])
+
+
+def get_host_capacity(params, heap_max_bytes):
+    """
+        Get executors count the controller host can run
+        :param params: Module parameters
+        :type params: dict
+        :param heap_max_bytes: Jenkins JVM maximum heap
+        :type heap_max_bytes: int
+        :return: Capacity by cpu and by memory
+        :rtype: dict
+    """
+
+    memory_mb = (os.sysconf('SC_PAGE_SIZE')
+                 * os.sysconf('SC_PHYS_PAGES')) // (1024 * 1024)
+    cpus = multiprocessing.cpu_count()
+
+    # Jenkins heap is not available for builds
+    free_memory_mb = (memory_mb - heap_max_bytes // (1024 * 1024)
+                      - params['reserved_memory'])
+    free_cpus = cpus - params['reserved_cpu']
+
+    return dict(
+        cpus=cpus,
+        memory_mb=memory_mb,
+        cpu=max(int(free_cpus // params['cpu_per_executor']), 0),
+        memory=max(int(free_memory_mb // params['memory_per_executor']), 0))
+
+
+def recommend_controller(params, load):
+    """
+        Recommend controller executors count
+        :param params: Module parameters
+        :type params: dict
+        :param load: Controller load statistics histories
+        :type load: dict
+        :return: Recommendation, with figures used to compute it
+        :rtype: dict
+    """
+
+    rank = params['percentile']
+    demand = percentile(get_demand(load), rank)
+    needed = int(math.ceil(demand * params['headroom']))
+    host = get_host_capacity(params, load['heap_max_bytes'])
+
+    recommended = min(needed, host['cpu'], host['memory'])
+    if params['max_executors'] is not None:
+        recommended = min(recommended, params['max_executors'])
+    recommended = max(recommended, params['min_executors'])
+
+    reason = ('p%d demand is %.2f executors (busy and queued), '
+              'with %.2f headroom %d are needed, host can run %d by cpu '
+              'and %d by memory' % (rank, demand, params['headroom'], needed,
+                                    host['cpu'], host['memory']))
+
+    return dict(
+        current=load['executors'],
+        recommended=recommended,
+        demand=round(demand, 2),
+        utilization=get_utilization(load, rank),
+        host=host,
+        reason=reason)
+
+
+def recommend_label(params, load):
+    """
+        Recommend executors capacity for a label
+        :param params: Module parameters
+        :type params: dict
+        :param load: Label load statistics histories
+        :type load: dict
+        :return: Recommendation, with figures used to compute it
+        :rtype: dict
+    """
+
+    rank = params['percentile']
+    demand = percentile(get_demand(load), rank)
+    current = int(load['total'][-1]) if load['total'] else 0
+    recommended = int(math.ceil(demand * params['headroom']))
+
+    return dict(
+        nodes=load['nodes'],
+        current=current,
+        recommended=recommended,
+        delta=recommended - current,
+        demand=round(demand, 2),
+        queue=dict(p50=percentile(load['queue'], 50),
+                   max=percentile(load['queue'], 100)),
+        utilization=get_utilization(load, rank))
+
+
+def main():
+
+    module = AnsibleModule(
+        argument_spec=dict(
+            time_scale=dict(
+                type='str',
+                required=False,
+                default='hour',
+                choices=['sec10', 'min', 'hour']),
+            percentile=dict(
+                type='int',
+                required=False,
+                default=95),
+            headroom=dict(
+                type='float',
+                required=False,
+                default=1.25),
+            min_executors=dict(
+                type='int',
+                required=False,
+                default=0),
+            max_executors=dict(
+                type='int',
+                required=False,
+                default=None),
+            cpu_per_executor=dict(
+                type='float',
+                required=False,
+                default=1.0),
+            memory_per_executor=dict(
+                type='int',
+                required=False,
+                default=1024),
+            reserved_cpu=dict(
+                type='float',
+                required=False,
+                default=1.0),
+            reserved_memory=dict(
+                type='int',
+                required=False,
+                default=1024),
+            use_ssh_key=dict(
+                type='bool',
+                required=False,
+                default=True),
+            deployment_ssh_key=dict(
+                type='str',
+                required=False,
+                default='/var/lib/jenkins/.ssh/id_rsa'),
+            cli_path=dict(
+                type='str',
+                required=False,
+                default='/var/lib/jenkins/jenkins-cli.jar'),
+            groovy_scripts_path=dict(
+                type='str',
+                required=False,
+                default='/var/lib/jenkins/groovy_scripts'),
+            url=dict(
+                type='str',
+                required=False,
+                default='http://localhost:8080')
+        )
+    )
+
+    if not 0 < module.params['percentile'] <= 100:
+        module.fail_json(msg='percentile should be between 1 and 100')
+
+    script = "%s/get_jenkins_load_statistics.groovy" % (
+        module.params['groovy_scripts_path'])
+
+    if module.params['use_ssh_key'] is False:
+        rc, stdout, stderr = module.run_command(
+            ['java', '-jar', module.params['cli_path'], '-remoting',
+             '-s', module.params['url'], '-noKeyAuth',
+             'groovy', script, '-'],
+            data=json.dumps(module.params))
+    else:
+        rc, stdout, stderr = module.run_command(
+            ['java', '-jar', module.params['cli_path'], '-remoting',
+             '-s', module.params['url'],
+             '-i', module.params['deployment_ssh_key'],
+             'groovy', script, '-'],
+            data=json.dumps(module.params))
+
+    if (rc != 0):
+        module.fail_json(msg=stderr)
+
+    statistics = json.loads(stdout)['output']
+
+    module.exit_json(
+        changed=False,
+        output=dict(
+            controller=recommend_controller(module.params,
+                                            statistics['controller']),
+            overall=dict(
+                demand=round(percentile(get_demand(statistics['overall']),
+                                        module.params['percentile']), 2),
+                utilization=get_utilization(statistics['overall'],
+                                            module.params['percentile'])),
+            labels=dict((name, recommend_label(module.params, load))
+                        for name, load in statistics['labels'].items())))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/python
+
+
+from ansible.module_utils.basic import *  # NOQA
+import json
+import os
+import tempfile
+from os.path import basename
+
+
+def to_prometheus(metrics):
+    """
+        Render metrics in Prometheus text format
+        :param metrics: Metrics values, by metric name
+        :type metrics: dict
+        :return: Prometheus text format metrics
+        :rtype: str
+    """
+
+    lines = []
+    for name in sorted(metrics):
+        if metrics[name] is None:
+            continue
+        lines.append('# TYPE jenkins_%s gauge' % name)
+        lines.append('jenkins_%s %s' % (name, metrics[name]))
+
+    return '\n'.join(lines) + '\n'
+
+
+def write_textfile(path, content):
+    """
+        Write a textfile atomically, node_exporter never reads a partial file
+        :param path: Textfile path
+        :type path: str
+        :param content: Textfile content
+        :type content: str
+    """
+
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path),
+                                    prefix='.%s.' % basename(path))
+    try:
+        with os.fdopen(fd, 'w') as tmp_file:
+            tmp_file.write(content)
+        os.chmod(tmp_path, 0o644)
+        os.rename(tmp_path, path)
+    except Exception:
+        os.remove(tmp_path)
+        raise
+
+
+def main():
+
+    module = AnsibleModule(
+        argument_spec=dict(
+            textfile_path=dict(
+                type='str',
+                required=False,
+                default=None),
+            use_ssh_key=dict(
+                type='bool',
+                required=False,
+                default=True),
+            deployment_ssh_key=dict(
+                type='str',
+                required=False,
+                default='/var/lib/jenkins/.ssh/id_rsa'),
+            cli_path=dict(
+                type='str',
+                required=False,
+                default='/var/lib/jenkins/jenkins-cli.jar'),
+            groovy_scripts_path=dict(
+                type='str',
+                required=False,
+                default='/var/lib/jenkins/groovy_scripts'),
+            url=dict(
+                type='str',
+                required=False,
+                default='http://localhost:8080')
+        )
+    )
+
+    script = "%s/get_jenkins_metrics.groovy" % (
+        module.params['groovy_scripts_path'])
+    payload = dict(module.params, format='json')
+
+    if module.params['use_ssh_key'] is False:
+        rc, stdout, stderr = module.run_command(
+            ['java', '-jar', module.params['cli_path'], '-remoting',
+             '-s', module.params['url'], '-noKeyAuth',
+             'groovy', script, '-'],
+            data=json.dumps(payload))
+    else:
+        rc, stdout, stderr = module.run_command(
+            ['java', '-jar', module.params['cli_path'], '-remoting',
+             '-s', module.params['url'],
+             '-i', module.params['deployment_ssh_key'],
+             'groovy', script, '-'],
+            data=json.dumps(payload))
+
+    if (rc != 0):
+        module.fail_json(msg=stderr)
+
+    json_stdout = json.loads(stdout)
+
+    if module.params['textfile_path']:
+        write_textfile(module.params['textfile_path'],
+                       to_prometheus(json_stdout['output']))
+
+    module.exit_json(changed=bool(json_stdout['changed']),
+                     output=json_stdout['output'])
+
+
+if __name__ == '__main__':
+    main()
@@ -2,6 +2,7 @@
 
 
 from ansible.module_utils.basic import *  # NOQA
+import json
 from os.path import basename
 
 
@@ -41,17 +42,19 @@ def main():
 
     if module.params['use_ssh_key'] is False:
         rc, stdout, stderr = module.run_command(
-            "java -jar %s -remoting -s '%s' -noKeyAuth groovy %s" %
-            (jenkins_cli_path, jenkins_url, script))
+            ['java', '-jar', jenkins_cli_path, '-remoting',
+             '-s', jenkins_url, '-noKeyAuth',
+             'groovy', script])
     else:
         rc, stdout, stderr = module.run_command(
-            "java -jar %s -remoting -s '%s' -i '%s' groovy %s" %
-            (jenkins_cli_path, jenkins_url, deployment_ssh_key, script))
+            ['java', '-jar', jenkins_cli_path, '-remoting',
+             '-s', jenkins_url, '-i', deployment_ssh_key,
+             'groovy', script])
 
     if (rc != 0):
         module.fail_json(msg=stderr)
 
-    print stdout
+    module.exit_json(changed=False, **json.loads(stdout))
 
 
 if __name__ == '__main__':
@@ -0,0 +1,265 @@
+#!/usr/bin/python
+
+
+from ansible.module_utils.basic import *  # NOQA
+from datetime import datetime
+import json
+import os
+import re
+
+
+START_MARKER = b'Started initialization'
+
+MILESTONES = [
+    'Started initialization',
+    'Listed all plugins',
+    'Prepared all plugins',
+    'Started all plugins',
+    'Augmented all extensions',
+    'System config loaded',
+    'System config adapted',
+    'Loaded all jobs',
+    'Configuration for all jobs updated',
+    'Completed initialization',
+]
+
+# "2018-06-01 10:00:00.123+0000 [id=28] INFO ..." (Jenkins 2.100 and newer)
+TIMESTAMP_REGEX = re.compile(
+    r'^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})(?:\.(\d{3}))?')
+# "Jun 01, 2018 10:00:00 AM jenkins.InitReactorRunner$1 onAttained"
+LEGACY_TIMESTAMP_REGEX = re.compile(
+    r'^(\w{3} \d{1,2}, \d{4} \d{1,2}:\d{2}:\d{2} [AP]M) ')
+# Logged with jenkins.model.Jenkins.logStartupPerformance system property
+TASK_REGEX = re.compile(r'Took (\d+)ms for (.+?)(?: by \S+)?\s*$')
+
+
+def find_last_start(log_file, block_size=65536):
+    """
+        Find last Jenkins start in log, reading file backward by blocks
+        :param log_file: Log file, opened in binary mode
+        :type log_file: file
+        :param block_size: Size of blocks read
+        :type block_size: int
+        :return: Offset of the last start marker, None if not found
+        :rtype: int
+    """
+
+    log_file.seek(0, os.SEEK_END)
+    position = log_file.tell()
+    overlap = b''
+
+    while position > 0:
+        read_size = min(block_size, position)
+        position -= read_size
+        log_file.seek(position)
+        block = log_file.read(read_size) + overlap
+
+        index = block.rfind(START_MARKER)
+        if index != -1:
+            return position + index
+
+        # Marker can be split between two blocks
+        overlap = block[:len(START_MARKER) - 1]
+
+    return None
+
+
+def parse_timestamp(line):
+    """
+        Get log line timestamp
+        :param line: Log line
+        :type line: str
+        :return: Timestamp, None if line has no timestamp
+        :rtype: datetime
+    """
+
+    match = TIMESTAMP_REGEX.match(line)
+    if match:
+        timestamp = datetime.strptime(match.group(1), '%Y-%m-%d %H:%M:%S')
+        return timestamp.replace(
+            microsecond=int(match.group(2) or 0) * 1000)
+
+    match = LEGACY_TIMESTAMP_REGEX.match(line)
+    if match:
+        return datetime.strptime(match.group(1), '%b %d, %Y %I:%M:%S %p')
+
+    return None
+
+
+def parse_start(log_file, offset):
+    """
+        Parse log from a start marker, streaming lines
+        :param log_file: Log file, opened in binary mode
+        :type log_file: file
+        :param offset: Start marker offset
+        :type offset: int
+        :return: Milestones timestamps and startup tasks durations
+        :rtype: tuple
+    """
+
+    milestones = {}
+    tasks = []
+    timestamp = None
+
+    # Legacy format writes timestamp on the line before the message
+    log_file.seek(max(offset - 1024, 0))
+    if offset > 1024:
+        log_file.readline()
+
+    for raw_line in log_file:
+        line = raw_line.decode('utf-8', 'replace')
+        timestamp = parse_timestamp(line) or timestamp
+
+        if timestamp is None:
+            continue
+
+        # Lines read before the start marker only give its timestamp
+        if 'Started initialization' not in milestones:
+            if START_MARKER.decode('ascii') in line:
+                milestones['Started initialization'] = timestamp
+            continue
+
+        for milestone in MILESTONES:
+            if milestone in line and milestone not in milestones:
+                milestones[milestone] = timestamp
+                break
+
+        match = TASK_REGEX.search(line)
+        if match:
+            tasks.append(dict(task=match.group(2),
+                              duration=int(match.group(1)) / 1000.0))
+
+        if 'Completed initialization' in milestones:
+            break
+
+    return milestones, tasks
+
+
+def build_profile(milestones, tasks, top_tasks):
+    """
+        Build startup profile from milestones timestamps
+        :param milestones: Milestones timestamps, by milestone name
+        :type milestones: dict
+        :param tasks: Startup tasks durations
+        :type tasks: list
+        :param top_tasks: Number of slowest tasks kept
+        :type top_tasks: int
+        :return: Startup profile
+        :rtype: dict
+    """
+
+    started = milestones['Started initialization']
+    reached = [name for name in MILESTONES if name in milestones]
+
+    phases = []
+    for previous, current in zip(reached, reached[1:]):
+        phases.append(dict(
+            name=current,
+            duration=(milestones[current]
+                      - milestones[previous]).total_seconds()))
+
+    return dict(
+        started_at=started.isoformat(),
+        completed='Completed initialization' in milestones,
+        total=(milestones[reached[-1]] - started).total_seconds(),
+        milestones=dict(
+            (name, (milestones[name] - started).total_seconds())
+            for name in reached),
+        phases=phases,
+        slowest_tasks=sorted(tasks, key=lambda task: task['duration'],
+                             reverse=True)[:top_tasks])
+
+
+def compare_profiles(current, previous, top_tasks):
+    """
+        Compare a startup profile with the previous one
+        :param current: Current startup profile
+        :type current: dict
+        :param previous: Previous startup profile
+        :type previous: dict
+        :param top_tasks: Number of regressed tasks kept
+        :type top_tasks: int
+        :return: Durations deltas, positive when slower
+        :rtype: dict
+    """
+
+    previous_phases = dict((phase['name'], phase['duration'])
+                           for phase in previous['phases'])
+    previous_tasks = dict((task['task'], task['duration'])
+                          for task in previous['slowest_tasks'])
+
+    tasks = [dict(task=task['task'],
+                  delta=task['duration'] - previous_tasks[task['task']])
+             for task in current['slowest_tasks']
+             if task['task'] in previous_tasks]
+
+    return dict(
+        previous_started_at=previous['started_at'],
+        total=current['total'] - previous['total'],
+        phases=dict((phase['name'],
+                     phase['duration'] - previous_phases[phase['name']])
+                    for phase in current['phases']
+                    if phase['name'] in previous_phases),
+        regressed_tasks=sorted(
+            [task for task in tasks if task['delta'] > 0],
+            key=lambda task: task['delta'], reverse=True)[:top_tasks])
+
+
+def main():
+
+    module = AnsibleModule(
+        argument_spec=dict(
+            log_path=dict(
+                type='str',
+                required=False,
+                default='/var/log/jenkins/jenkins.log'),
+            state_path=dict(
+                type='str',
+                required=False,
+                default='/var/lib/jenkins/ansible_startup_profile.json'),
+            top_tasks=dict(
+                type='int',
+                required=False,
+                default=20)
+        )
+    )
+
+    if not os.path.isfile(module.params['log_path']):
+        module.fail_json(msg='Jenkins log not found : %s' % (
+            module.params['log_path']))
+
+    with open(module.params['log_path'], 'rb') as log_file:
+        offset = find_last_start(log_file)
+        if offset is None:
+            module.fail_json(msg='No Jenkins start found in log')
+        milestones, tasks = parse_start(log_file, offset)
+
+    profile = build_profile(milestones, tasks, module.params['top_tasks'])
+
+    # State keeps the last two profiles, so each start is compared with the
+    # one before it, whatever the number of role runs between them
+    state = dict(latest=None, previous=None)
+    if os.path.isfile(module.params['state_path']):
+        with open(module.params['state_path']) as state_file:
+            state = json.load(state_file)
+
+    changed = False
+    latest = state['latest']
+    if (profile['completed'] and (latest is None
+                                  or latest['started_at']
+                                  != profile['started_at'])):
+        state = dict(latest=profile, previous=latest)
+        with open(module.params['state_path'], 'w') as state_file:
+            json.dump(state, state_file)
+        changed = True
+
+    if state['previous'] is not None and profile['completed']:
+        profile['comparison'] = compare_profiles(
+            profile, state['previous'], module.params['top_tasks'])
+
+    module.exit_json(changed=changed,
+                     ansible_facts=dict(jenkins_startup_profile=profile))
+
+
+if __name__ == '__main__':
+    main()
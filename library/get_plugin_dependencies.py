@@ -41,15 +41,15 @@ def main():
 
     if module.params['use_ssh_key'] is False:
         rc, stdout, stderr = module.run_command(
-            "java -jar %s -remoting -s '%s' -noKeyAuth groovy %s %s" %
-            (module.params['cli_path'], module.params['url'],
-             script, module.params['name']))
+            ['java', '-jar', module.params['cli_path'], '-remoting',
+             '-s', module.params['url'], '-noKeyAuth',
+             'groovy', script, module.params['name']])
     else:
         rc, stdout, stderr = module.run_command(
-            "java -jar %s -remoting -s '%s' -i '%s' groovy %s %s" %
-            (module.params['cli_path'], module.params['url'],
-             module.params['deployment_ssh_key'], script,
-             module.params['name']))
+            ['java', '-jar', module.params['cli_path'], '-remoting',
+             '-s', module.params['url'],
+             '-i', module.params['deployment_ssh_key'],
+             'groovy', script, module.params['name']])
 
     if (rc != 0):
         module.fail_json(msg=stderr)
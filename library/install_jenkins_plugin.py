@@ -34,6 +34,10 @@ def main():
                 required=False,
                 default='present',
                 choices=['present', 'latest']),
+            dynamic_load=dict(
+                type='bool',
+                required=False,
+                default=True),
             url=dict(
                 type='str',
                 required=False,
@@ -46,21 +50,24 @@ def main():
 
     if module.params['use_ssh_key'] is False:
         rc, stdout, stderr = module.run_command(
-            "java -jar %s -remoting -s '%s' -noKeyAuth groovy %s %s %s" %
-            (module.params['cli_path'], module.params['url'],
-             script, module.params['name'], module.params['state']))
+            ['java', '-jar', module.params['cli_path'], '-remoting',
+             '-s', module.params['url'], '-noKeyAuth',
+             'groovy', script, module.params['name'],
+             module.params['state'], str(module.params['dynamic_load'])])
     else:
         rc, stdout, stderr = module.run_command(
-            "java -jar %s -remoting -s '%s' -i '%s' groovy %s %s %s" %
-            (module.params['cli_path'], module.params['url'],
-             module.params['deployment_ssh_key'], script,
-             module.params['name'], module.params['state']))
+            ['java', '-jar', module.params['cli_path'], '-remoting',
+             '-s', module.params['url'],
+             '-i', module.params['deployment_ssh_key'],
+             'groovy', script, module.params['name'],
+             module.params['state'], str(module.params['dynamic_load'])])
 
     if (rc != 0):
         module.fail_json(msg=stderr)
 
     json_stdout = json.loads(stdout)
-    module.exit_json(changed=bool(json_stdout), output=json_stdout)
+    module.exit_json(changed=bool(json_stdout['installed']),
+                     output=json_stdout)
 
 
 if __name__ == '__main__':
@@ -42,18 +42,19 @@ def main():
         module.params['groovy_scripts_path'])
 
     rc, stdout, stderr = module.run_command(
-        "java -jar %s -remoting -s '%s' -i '%s' groovy %s '%s' '%s' '%s'" %
-        (module.params['cli_path'], module.params['url'],
-         module.params['deployment_ssh_key'], script,
-         module.params['full_name'], module.params['email'],
-         module.params['jenkins_url']))
+        ['java', '-jar', module.params['cli_path'], '-remoting',
+         '-s', module.params['url'],
+         '-i', module.params['deployment_ssh_key'],
+         'groovy', script, module.params['full_name'],
+         module.params['email'], module.params['jenkins_url']])
 
     if (rc != 0):
         module.fail_json(msg=stderr)
 
     json_stdout = json.loads(stdout)
     module.exit_json(changed=bool(json_stdout['changed']),
-                     output=json_stdout['output'])
+                     output=json_stdout['output'],
+                     saved=json_stdout['saved'])
 
 
 if __name__ == '__main__':
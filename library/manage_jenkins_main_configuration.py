@@ -31,6 +31,10 @@ module_args = dict(
     slave_agent_port=dict(
         type='int',
         required=True),
+    build_discarder=dict(
+        type='dict',
+        required=False,
+        default={}),
     deployment_ssh_key=dict(
         type='str',
         required=False,
@@ -58,17 +62,19 @@ def main():
         module.params['groovy_scripts_path'])
 
     rc, stdout, stderr = module.run_command(
-        "java -jar %s -remoting -s '%s' -i '%s' groovy %s '%s'" %
-        (module.params['cli_path'], module.params['url'],
-         module.params['deployment_ssh_key'], script,
-         json.dumps(module.params)))
+        ['java', '-jar', module.params['cli_path'], '-remoting',
+         '-s', module.params['url'],
+         '-i', module.params['deployment_ssh_key'],
+         'groovy', script, '-'],
+        data=json.dumps(module.params))
 
     if (rc != 0):
         module.fail_json(msg=stderr)
 
     json_stdout = json.loads(stdout)
     module.exit_json(changed=bool(json_stdout['changed']),
-                     output=json_stdout['output'])
+                     output=json_stdout['output'],
+                     saved=json_stdout['saved'])
 
 
 if __name__ == '__main__':
@@ -12,13 +12,16 @@ def main():
         argument_spec=dict(
             name=dict(
                 type='str',
-                required=True),
+                required=False,
+                default=''),
             api_token=dict(
                 type='str',
-                required=True),
+                required=False,
+                default=''),
             host_url=dict(
                 type='str',
-                required=True),
+                required=False,
+                default=''),
             ignore_cert_error=dict(
                 type='bool',
                 required=False,
@@ -31,6 +34,9 @@ def main():
                 type='int',
                 required=False,
                 default=10),
+            use_authenticated_endpoint=dict(
+                type='bool',
+                required=False),
             deployment_ssh_key=dict(
                 type='str',
                 required=False,
@@ -54,17 +60,19 @@ def main():
         module.params['groovy_scripts_path'])
 
     rc, stdout, stderr = module.run_command(
-        "java -jar %s -remoting -s '%s' -i '%s' groovy %s '%s'" %
-        (module.params['cli_path'], module.params['url'],
-         module.params['deployment_ssh_key'], script,
-         json.dumps(module.params)))
+        ['java', '-jar', module.params['cli_path'], '-remoting',
+         '-s', module.params['url'],
+         '-i', module.params['deployment_ssh_key'],
+         'groovy', script, '-'],
+        data=json.dumps(module.params))
 
     if (rc != 0):
         module.fail_json(msg=stderr)
 
     json_stdout = json.loads(stdout)
     module.exit_json(changed=bool(json_stdout['changed']),
-                     output=json_stdout['output'])
+                     output=json_stdout['output'],
+                     saved=json_stdout['saved'])
 
 
 if __name__ == '__main__':
@@ -56,22 +56,25 @@ def main():
 
     if (module.params['use_private_key']):
         rc, stdout, stderr = module.run_command(
-            "java -jar %s -remoting -s '%s' -i '%s' groovy %s '%s'" %
-            (module.params['cli_path'], module.params['url'],
-             module.params['deployment_ssh_key'], script,
-             json.dumps(module.params)))
+            ['java', '-jar', module.params['cli_path'], '-remoting',
+             '-s', module.params['url'],
+             '-i', module.params['deployment_ssh_key'],
+             'groovy', script, '-'],
+            data=json.dumps(module.params))
     else:
         rc, stdout, stderr = module.run_command(
-            "java -jar %s -remoting -s '%s' -noKeyAuth groovy %s '%s'" %
-            (module.params['cli_path'], module.params['url'], script,
-             json.dumps(module.params)))
+            ['java', '-jar', module.params['cli_path'], '-remoting',
+             '-s', module.params['url'], '-noKeyAuth',
+             'groovy', script, '-'],
+            data=json.dumps(module.params))
 
     if (rc != 0):
         module.fail_json(msg=stderr)
 
     json_stdout = json.loads(stdout)
     module.exit_json(changed=bool(json_stdout['changed']),
-                     output=json_stdout['output'])
+                     output=json_stdout['output'],
+                     saved=json_stdout['saved'])
 
 
 if __name__ == '__main__':
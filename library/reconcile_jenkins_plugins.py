@@ -0,0 +1,121 @@
+#!/usr/bin/python
+
+
+from ansible.module_utils.basic import *  # NOQA
+import json
+import os
+from os.path import basename
+
+
+def get_startup_durations(profile_path):
+    """
+        Get startup tasks durations, from the last startup profile taken by
+        get_jenkins_startup_profile module
+        :param profile_path: Startup profile state file
+        :type profile_path: str
+        :return: Startup tasks durations, by task name
+        :rtype: dict
+    """
+
+    if not profile_path or not os.path.isfile(profile_path):
+        return {}
+
+    with open(profile_path) as profile_file:
+        latest = json.load(profile_file).get('latest') or {}
+
+    return dict((task['task'], task['duration'])
+                for task in latest.get('slowest_tasks', []))
+
+
+def add_startup_cost(extras, durations):
+    """
+        Add to each extra plugin the startup time of its logged tasks, as
+        "Loading plugin foo v1.0 (foo)" or "Initializing plugin foo"
+        :param extras: Extra plugins
+        :type extras: list
+        :param durations: Startup tasks durations, by task name
+        :type durations: dict
+    """
+
+    for extra in extras:
+        extra['startup_seconds'] = sum(
+            duration for task, duration in durations.items()
+            if task.endswith(' plugin %s' % extra['name'])
+            or task.endswith('(%s)' % extra['name']))
+
+
+def main():
+
+    module = AnsibleModule(
+        argument_spec=dict(
+            plugins=dict(
+                type='list',
+                required=True),
+            keep=dict(
+                type='list',
+                required=False,
+                default=[]),
+            state=dict(
+                type='str',
+                required=False,
+                default='report',
+                choices=['report', 'disabled', 'absent']),
+            startup_profile_path=dict(
+                type='str',
+                required=False,
+                default='/var/lib/jenkins/ansible_startup_profile.json'),
+            use_ssh_key=dict(
+                type='bool',
+                required=False,
+                default=True),
+            deployment_ssh_key=dict(
+                type='str',
+                required=False,
+                default='/var/lib/jenkins/.ssh/id_rsa'),
+            cli_path=dict(
+                type='str',
+                required=False,
+                default='/var/lib/jenkins/jenkins-cli.jar'),
+            groovy_scripts_path=dict(
+                type='str',
+                required=False,
+                default='/var/lib/jenkins/groovy_scripts'),
+            url=dict(
+                type='str',
+                required=False,
+                default='http://localhost:8080')
+        )
+    )
+
+    script = "%s/reconcile_jenkins_plugins.groovy" % (
+        module.params['groovy_scripts_path'])
+
+    if module.params['use_ssh_key'] is False:
+        rc, stdout, stderr = module.run_command(
+            ['java', '-jar', module.params['cli_path'], '-remoting',
+             '-s', module.params['url'], '-noKeyAuth',
+             'groovy', script, '-'],
+            data=json.dumps(module.params))
+    else:
+        rc, stdout, stderr = module.run_command(
+            ['java', '-jar', module.params['cli_path'], '-remoting',
+             '-s', module.params['url'],
+             '-i', module.params['deployment_ssh_key'],
+             'groovy', script, '-'],
+            data=json.dumps(module.params))
+
+    if (rc != 0):
+        module.fail_json(msg=stderr)
+
+    json_stdout = json.loads(stdout)
+    add_startup_cost(json_stdout['output']['extras'],
+                     get_startup_durations(
+                         module.params['startup_profile_path']))
+
+    module.exit_json(changed=bool(json_stdout['changed']),
+                     output=json_stdout['output'],
+                     saved=json_stdout['saved'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,262 @@
+#!/usr/bin/python
+
+
+from ansible.module_utils.basic import *  # NOQA
+import datetime
+import os
+import shutil
+
+
+# Configuration files kept in snapshots, as rsync filter rules
+SNAPSHOT_RULES = [
+    '+ /*.xml',
+    '+ /*.key',
+    '+ /plugins/',
+    '+ /plugins/*.jpi',
+    '+ /plugins/*.hpi',
+    '+ /plugins/*.jpl',
+    '+ /plugins/*.pinned',
+    '+ /plugins/*.disabled',
+    '+ /secrets/***',
+    '+ /users/***',
+    '+ /nodes/***',
+    '- /jobs/**/workspace/',
+]
+
+BUILDS_RULES = [
+    '+ /jobs/**/builds/***',
+]
+
+# Jobs created after a snapshot are not removed when it is restored
+RESTORE_RULES = [
+    'P /jobs/***',
+]
+
+# Build state changes with every build, it does not make a new snapshot
+VOLATILE_RULES = [
+    '- /queue.xml',
+    '- /jobs/**/builds/',
+    '- /jobs/**/indexing/',
+    '- /jobs/**/nextBuildNumber',
+]
+
+JOBS_RULES = [
+    '- /jobs/**/builds/',
+    '+ /jobs/',
+    '+ /jobs/**/',
+    '+ /jobs/**/*.xml',
+    '+ /jobs/**/nextBuildNumber',
+]
+
+
+def get_filter_args(params):
+    """
+        Get rsync filter arguments
+        :param params: Module parameters
+        :type params: dict
+        :return: rsync arguments
+        :rtype: list
+    """
+
+    rules = ['+ %s' % include for include in params['extra_includes']]
+    rules += SNAPSHOT_RULES
+    if params['include_builds']:
+        rules += BUILDS_RULES
+    rules += JOBS_RULES
+    rules.append('- *')
+
+    args = ['--prune-empty-dirs']
+    for rule in rules:
+        args += ['--filter', rule]
+
+    return args
+
+
+def get_snapshots(snapshots_path):
+    """
+        Get complete snapshots names, oldest first
+        :param snapshots_path: Snapshots folder
+        :type snapshots_path: str
+        :return: Snapshots names
+        :rtype: list
+    """
+
+    if not os.path.isdir(snapshots_path):
+        return []
+
+    return sorted(name for name in os.listdir(snapshots_path)
+                  if not name.startswith('.')
+                  and os.path.isdir(os.path.join(snapshots_path, name)))
+
+
+def has_changes(module, source, dest, filter_args):
+    """
+        Check if files differ between two folders, for snapshot files only
+        :param module: Ansible module
+        :type module: AnsibleModule
+        :param source: Source folder
+        :type source: str
+        :param dest: Destination folder
+        :type dest: str
+        :param filter_args: rsync filter arguments
+        :type filter_args: list
+        :return: True if a file would be copied or deleted
+        :rtype: bool
+    """
+
+    rc, stdout, stderr = module.run_command(
+        ['rsync', '-a', '--dry-run', '--itemize-changes', '--delete']
+        + filter_args + ['%s/' % source, '%s/' % dest])
+
+    if rc != 0:
+        module.fail_json(msg=stderr)
+
+    # Folders only modification times changes are not significant
+    return any(line and not line.startswith('.d')
+               for line in stdout.splitlines())
+
+
+def take_snapshot(module):
+    """
+        Take an incremental snapshot, unchanged files are hardlinked to the
+        last snapshot ones
+        :param module: Ansible module
+        :type module: AnsibleModule
+        :return: Snapshot name, and True if a new snapshot has been taken
+        :rtype: tuple
+    """
+
+    home_path = module.params['home_path']
+    snapshots_path = module.params['snapshots_path']
+    snapshots = get_snapshots(snapshots_path)
+
+    filter_args = get_filter_args(module.params)
+
+    # Nothing changed since last snapshot, except build state
+    check_args = []
+    for rule in VOLATILE_RULES:
+        check_args += ['--filter', rule]
+
+    if snapshots and not has_changes(
+            module, home_path, os.path.join(snapshots_path, snapshots[-1]),
+            check_args + filter_args):
+        return snapshots[-1], False
+
+    if not os.path.isdir(snapshots_path):
+        os.makedirs(snapshots_path, 0o700)
+
+    # Snapshots can be taken back to back, by configuration and install stages
+    name = datetime.datetime.now().strftime('%Y%m%d%H%M%S%f')
+    partial = os.path.join(snapshots_path, '.%s.partial' % name)
+
+    args = ['rsync', '-a', '--delete'] + filter_args
+    if snapshots:
+        args.append('--link-dest=%s' % os.path.join(snapshots_path,
+                                                    snapshots[-1]))
+
+    rc, stdout, stderr = module.run_command(
+        args + ['%s/' % home_path, '%s/' % partial])
+    if rc != 0:
+        shutil.rmtree(partial, ignore_errors=True)
+        module.fail_json(msg=stderr)
+
+    os.rename(partial, os.path.join(snapshots_path, name))
+
+    # Remove oldest snapshots
+    for old_name in get_snapshots(snapshots_path)[:-module.params['keep']]:
+        shutil.rmtree(os.path.join(snapshots_path, old_name))
+
+    return name, True
+
+
+def restore_snapshot(module):
+    """
+        Restore snapshot files in Jenkins home, files not in snapshot but
+        matching snapshot rules are removed, except jobs ones
+        :param module: Ansible module
+        :type module: AnsibleModule
+        :return: Restored snapshot name, and True if files changed
+        :rtype: tuple
+    """
+
+    snapshots = get_snapshots(module.params['snapshots_path'])
+    name = module.params['snapshot']
+
+    if name == 'latest' and snapshots:
+        name = snapshots[-1]
+
+    if name not in snapshots:
+        module.fail_json(msg='Snapshot not found : %s' % name)
+
+    source = os.path.join(module.params['snapshots_path'], name)
+    filter_args = []
+    for rule in RESTORE_RULES:
+        filter_args += ['--filter', rule]
+    filter_args += get_filter_args(module.params)
+
+    if not has_changes(module, source, module.params['home_path'],
+                       filter_args):
+        return name, False
+
+    rc, stdout, stderr = module.run_command(
+        ['rsync', '-a', '--delete'] + filter_args
+        + ['%s/' % source, '%s/' % module.params['home_path']])
+    if rc != 0:
+        module.fail_json(msg=stderr)
+
+    return name, True
+
+
+def main():
+
+    module = AnsibleModule(
+        argument_spec=dict(
+            home_path=dict(
+                type='str',
+                required=False,
+                default='/var/lib/jenkins'),
+            snapshots_path=dict(
+                type='str',
+                required=False,
+                default='/var/lib/jenkins_snapshots'),
+            keep=dict(
+                type='int',
+                required=False,
+                default=5),
+            include_builds=dict(
+                type='bool',
+                required=False,
+                default=False),
+            extra_includes=dict(
+                type='list',
+                required=False,
+                default=[]),
+            snapshot=dict(
+                type='str',
+                required=False,
+                default='latest'),
+            state=dict(
+                type='str',
+                required=False,
+                default='present',
+                choices=['present', 'restored'])
+        )
+    )
+
+    if module.params['keep'] < 1:
+        module.fail_json(msg='keep should be greater than 0')
+
+    if module.params['state'] == 'restored':
+        name, changed = restore_snapshot(module)
+    else:
+        name, changed = take_snapshot(module)
+
+    module.exit_json(
+        changed=changed,
+        output=dict(
+            snapshot=name,
+            path=os.path.join(module.params['snapshots_path'], name)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,287 @@
+#!/usr/bin/python
+
+
+from ansible.module_utils.basic import *  # NOQA
+from ansible.module_utils.urls import *  # NOQA
+import base64
+import datetime
+import hashlib
+import json
+import os
+import shutil
+
+
+MANIFEST_FILE = 'manifest.json'
+RESTORED_FILE = 'restored'
+
+
+def get_archive_path(plugins_path, name):
+    """
+        Get current plugin archive path
+        :param plugins_path: Jenkins plugins folder
+        :type plugins_path: str
+        :param name: Plugin name
+        :type name: str
+        :return: Archive path, None if plugin not installed
+        :rtype: str
+    """
+
+    for extension in ['jpi', 'hpi']:
+        path = os.path.join(plugins_path, '%s.%s' % (name, extension))
+        if os.path.isfile(path):
+            return path
+
+    return None
+
+
+def link_or_copy(src, dest):
+    """
+        Hard link a file, or copy it if link is not possible
+        :param src: Source file
+        :type src: str
+        :param dest: Destination file
+        :type dest: str
+    """
+
+    try:
+        os.link(src, dest)
+    except OSError:
+        shutil.copy2(src, dest)
+
+
+def is_valid_archive(path, entry):
+    """
+        Check a plugin archive with update center checksum
+        :param path: Archive path
+        :type path: str
+        :param entry: Upgrade plan entry
+        :type entry: dict
+        :return: True if archive checksum is the expected one
+        :rtype: bool
+    """
+
+    if entry.get('sha256'):
+        digest, expected = hashlib.sha256(), entry['sha256']
+    elif entry.get('sha1'):
+        digest, expected = hashlib.sha1(), entry['sha1']
+    else:
+        return True
+
+    with open(path, 'rb') as archive:
+        for chunk in iter(lambda: archive.read(65536), b''):
+            digest.update(chunk)
+
+    # Update center checksums are base64 encoded
+    return base64.b64encode(digest.digest()).decode('ascii') == expected
+
+
+def download_plugin(module, entry):
+    """
+        Download a plugin archive in staging folder, if not already staged
+        :param module: Ansible module
+        :type module: AnsibleModule
+        :param entry: Upgrade plan entry
+        :type entry: dict
+        :return: Staged archive path
+        :rtype: str
+    """
+
+    # Named by version, an archive staged by another plan is not reused when
+    # it has no checksum to check
+    staged = os.path.join(module.params['staging_path'], '%s-%s.jpi' % (
+        entry['name'], entry.get('to_version') or 'latest'))
+
+    if os.path.isfile(staged) and is_valid_archive(staged, entry):
+        return staged
+
+    response, info = fetch_url(module, entry['url'],
+                               timeout=module.params['timeout'])
+    if info['status'] != 200:
+        module.fail_json(msg='Plugin download error : %s - %s' % (
+            entry['url'], info.get('msg')))
+
+    partial = '%s.part' % staged
+    with open(partial, 'wb') as archive:
+        for chunk in iter(lambda: response.read(65536), b''):
+            archive.write(chunk)
+
+    if not is_valid_archive(partial, entry):
+        os.remove(partial)
+        module.fail_json(msg='Plugin checksum error : %s' % entry['url'])
+
+    os.rename(partial, staged)
+    return staged
+
+
+def get_backups(backup_path):
+    """
+        Get backup folders, oldest first
+        :param backup_path: Backups root folder
+        :type backup_path: str
+        :return: Backup folders paths
+        :rtype: list
+    """
+
+    if not os.path.isdir(backup_path):
+        return []
+
+    return [os.path.join(backup_path, name)
+            for name in sorted(os.listdir(backup_path))
+            if os.path.isfile(
+                os.path.join(backup_path, name, MANIFEST_FILE))]
+
+
+def apply_plan(module):
+    """
+        Stage all plugins of the plan, then swap them with installed ones
+        :param module: Ansible module
+        :type module: AnsibleModule
+        :return: Backup folder path
+        :rtype: str
+    """
+
+    plan = module.params['plan']
+    plugins_path = module.params['plugins_path']
+
+    for path in [module.params['staging_path'], module.params['backup_path']]:
+        if not os.path.isdir(path):
+            os.makedirs(path)
+
+    # Download everything before touching plugins folder
+    staged = dict((entry['name'], download_plugin(module, entry))
+                  for entry in plan)
+
+    # Keep current archives, to allow a rollback
+    backup = os.path.join(module.params['backup_path'],
+                          datetime.datetime.now().strftime('%Y%m%d%H%M%S%f'))
+    os.makedirs(backup)
+    manifest = []
+
+    for entry in plan:
+        current = get_archive_path(plugins_path, entry['name'])
+        if current is not None:
+            link_or_copy(current,
+                         os.path.join(backup, os.path.basename(current)))
+        manifest.append(dict(
+            name=entry['name'],
+            previous=os.path.basename(current) if current else None,
+            previous_version=entry.get('from_version'),
+            version=entry.get('to_version')))
+
+    with open(os.path.join(backup, MANIFEST_FILE), 'w') as manifest_file:
+        json.dump(manifest, manifest_file)
+
+    # Staging and plugins folders are in Jenkins home, so rename is atomic
+    for entry in plan:
+        current = get_archive_path(plugins_path, entry['name'])
+        target = os.path.join(plugins_path, '%s.jpi' % entry['name'])
+        if current is not None and current != target:
+            os.remove(current)
+        os.rename(staged[entry['name']], target)
+
+    # Remove oldest backups
+    backups = get_backups(module.params['backup_path'])
+    for old_backup in backups[:-module.params['keep_backups']]:
+        shutil.rmtree(old_backup)
+
+    return backup
+
+
+def rollback(module):
+    """
+        Restore plugins archives saved by the last upgrade, only once
+        :param module: Ansible module
+        :type module: AnsibleModule
+        :return: Restored backup manifest, None if nothing to restore
+        :rtype: list
+    """
+
+    plugins_path = module.params['plugins_path']
+    backups = get_backups(module.params['backup_path'])
+
+    if not backups:
+        return None
+
+    # Backup is kept and marked, so next runs do not restore older ones
+    backup = backups[-1]
+    if os.path.isfile(os.path.join(backup, RESTORED_FILE)):
+        return None
+
+    with open(os.path.join(backup, MANIFEST_FILE)) as manifest_file:
+        manifest = json.load(manifest_file)
+
+    for item in manifest:
+        current = get_archive_path(plugins_path, item['name'])
+        if current is not None:
+            os.remove(current)
+
+        # Plugin was not installed before upgrade, remove its exploded folder
+        if item['previous'] is None:
+            shutil.rmtree(os.path.join(plugins_path, item['name']),
+                          ignore_errors=True)
+            continue
+
+        link_or_copy(os.path.join(backup, item['previous']),
+                     os.path.join(plugins_path, item['previous']))
+
+    open(os.path.join(backup, RESTORED_FILE), 'w').close()
+    return manifest
+
+
+def main():
+
+    module = AnsibleModule(
+        argument_spec=dict(
+            plan=dict(
+                type='list',
+                required=False,
+                default=[]),
+            plugins_path=dict(
+                type='str',
+                required=False,
+                default='/var/lib/jenkins/plugins'),
+            staging_path=dict(
+                type='str',
+                required=False,
+                default='/var/lib/jenkins/plugins_staging'),
+            backup_path=dict(
+                type='str',
+                required=False,
+                default='/var/lib/jenkins/plugins_backup'),
+            keep_backups=dict(
+                type='int',
+                required=False,
+                default=3),
+            timeout=dict(
+                type='int',
+                required=False,
+                default=60),
+            state=dict(
+                type='str',
+                required=False,
+                default='present',
+                choices=['present', 'rollback'])
+        )
+    )
+
+    if module.params['keep_backups'] < 1:
+        module.fail_json(msg='keep_backups should be greater than 0')
+
+    if module.params['state'] == 'rollback':
+        manifest = rollback(module)
+        module.exit_json(changed=(manifest is not None),
+                         output=dict(restored=manifest or []))
+
+    if not module.params['plan']:
+        module.exit_json(changed=False, output=dict(upgraded=[]))
+
+    backup = apply_plan(module)
+    module.exit_json(
+        changed=True,
+        output=dict(
+            upgraded=[entry['name'] for entry in module.params['plan']],
+            backup=backup))
+
+
+if __name__ == '__main__':
+    main()
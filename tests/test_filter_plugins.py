@@ -1,7 +1,107 @@
 """
-Fake test for plugins filters
+Tests for plugins filters
 """
 
+import pytest
+from ansible import errors
+
+from filter_plugins.merge_array_list import merge_array_list
+from filter_plugins.plugin_graph import (
+    plugins_closure, plugins_diff, plugins_max_versions,
+    plugins_reverse_closure, plugins_toposort, unique_ordered)
+
+
+GRAPH = {
+    'workflow-aggregator': ['workflow-job', 'workflow-cps'],
+    'workflow-job': ['workflow-api'],
+    'workflow-cps': ['workflow-api', 'scm-api'],
+    'workflow-api': ['scm-api'],
+    'git': ['scm-api', 'credentials'],
+    'scm-api': [],
+    'credentials': [],
+}
+
 
 def test_fake():
     assert True
+
+
+def test_merge_array_list():
+    assert merge_array_list([['a', 'b'], ['c'], []]) == ['a', 'b', 'c']
+
+
+def test_unique_ordered():
+    assert unique_ordered(['b', 'a', 'b', 'c', 'a']) == ['b', 'a', 'c']
+
+
+def test_unique_ordered_invalid_type():
+    with pytest.raises(errors.AnsibleFilterError):
+        unique_ordered('abc')
+
+
+def test_plugins_toposort_dependencies_first():
+    result = plugins_toposort(GRAPH)
+
+    assert sorted(result) == sorted(GRAPH)
+    for name, dependencies in GRAPH.items():
+        for dep in dependencies:
+            assert result.index(dep) < result.index(name)
+
+
+def test_plugins_toposort_accepts_plans_and_unknown_dependencies():
+    plan = [
+        {'name': 'git', 'dependencies': ['git-client']},
+        {'name': 'git-client', 'dependencies': [{'name': 'ssh-credentials'}]},
+    ]
+
+    assert plugins_toposort(plan) == ['ssh-credentials', 'git-client', 'git']
+
+
+def test_plugins_toposort_cycle():
+    with pytest.raises(errors.AnsibleFilterError) as error:
+        plugins_toposort({'a': ['b'], 'b': ['c'], 'c': ['a'], 'd': []})
+
+    assert 'a -> b -> c -> a' in str(error.value)
+
+
+def test_plugins_max_versions():
+    result = plugins_max_versions([
+        {'git': '3.9.1', 'scm-api': '2.2.7'},
+        {'git': '3.10.0', 'scm-api': '2.2.7-beta-1'},
+        {'credentials': '2.1'},
+    ])
+
+    assert result == {'git': '3.10.0', 'scm-api': '2.2.7',
+                      'credentials': '2.1'}
+
+
+def test_plugins_closure():
+    result = plugins_closure(GRAPH, ['workflow-job'])
+
+    assert result == ['scm-api', 'workflow-api', 'workflow-job']
+
+
+def test_plugins_reverse_closure():
+    result = plugins_reverse_closure(GRAPH, ['workflow-api'])
+
+    assert sorted(result) == ['workflow-aggregator', 'workflow-api',
+                              'workflow-cps', 'workflow-job']
+    assert result[0] == 'workflow-api'
+
+
+def test_plugins_diff():
+    result = plugins_diff(
+        {'git': '3.9.1', 'mailer': '1.21', 'hipchat': '2.2.0'},
+        {'git': '3.10.0', 'mailer': 'latest', 'matrix-auth': None})
+
+    assert result == {
+        'install': ['matrix-auth'],
+        'upgrade': ['git'],
+        'remove': ['hipchat'],
+        'unchanged': ['mailer'],
+    }
+
+
+def test_plugins_diff_invalid_type():
+    with pytest.raises(errors.AnsibleFilterError):
+        plugins_diff('git', ['git'])
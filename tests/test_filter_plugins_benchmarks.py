@@ -0,0 +1,67 @@
+"""
+Micro-benchmarks for plugins graph filters
+
+Timings depend on the host load, so they are only checked when asked, with a
+generous time limit:
+
+    JENKINS_ROLE_BENCHMARKS=1 python -m pytest tests
+
+Or reported with details:
+
+    python -m tests.test_filter_plugins_benchmarks
+"""
+
+import os
+import timeit
+
+import pytest
+
+from filter_plugins.plugin_graph import (
+    plugins_closure, plugins_reverse_closure, plugins_toposort,
+    unique_ordered)
+
+
+# Seconds allowed for one run on a 5000 plugins graph
+MAX_DURATION = 1.0
+
+
+def build_graph(size, fan_out=5):
+    """
+        Build a layered acyclic graph, each plugin depends on previous ones
+    """
+
+    return dict(('plugin-%d' % index,
+                 ['plugin-%d' % (index - step - 1)
+                  for step in range(min(fan_out, index))])
+                for index in range(size))
+
+
+BENCHMARKS = [
+    ('unique_ordered',
+     lambda graph: unique_ordered(list(graph) * 5)),
+    ('plugins_toposort',
+     lambda graph: plugins_toposort(graph)),
+    ('plugins_closure',
+     lambda graph: plugins_closure(graph, ['plugin-%d' % (len(graph) - 1)])),
+    ('plugins_reverse_closure',
+     lambda graph: plugins_reverse_closure(graph, ['plugin-0'])),
+]
+
+
+def run(benchmark, size):
+    graph = build_graph(size)
+    return min(timeit.repeat(lambda: benchmark(graph), number=1, repeat=3))
+
+
+@pytest.mark.skipif(not os.environ.get('JENKINS_ROLE_BENCHMARKS'),
+                    reason='benchmarks are run on demand')
+def test_benchmarks():
+    for name, benchmark in BENCHMARKS:
+        assert run(benchmark, 5000) < MAX_DURATION, name
+
+
+if __name__ == '__main__':
+    for name, benchmark in BENCHMARKS:
+        durations = ['%d: %.4fs' % (size, run(benchmark, size))
+                     for size in (1000, 5000, 20000)]
+        print('%-25s %s' % (name, ', '.join(durations)))